@@ -0,0 +1,188 @@
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import compute_pmm, bending_directions, section_origin, section_heights
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+class AdaptiveSampler:
+    """
+    Interaction curves sampled only where they bend.
+
+    Each curve starts from the neutral-axis depths where the P-M relation
+    has kinks (a rebar crossing zero strain or reaching yield, the stress
+    block edge passing a vertex of the outline) and then bisects every
+    interval whose midpoint lies further than `tol` from the chord between
+    its end points, until every interval of the returned curve passes.
+    Distances are measured in (P, Mx, My) scaled by the largest axial force
+    and moment of the curve, so `tol` is relative.
+
+    Points are evaluated with compute_pmm, i.e. the same model and values as
+    StrainCompatibility at the same neutral-axis position.
+    """
+    def __init__(self, section_data, tol=1e-3, angle_tol=1e-2, strain_max=config.STRAIN_COMPRESSION_MAX,
+                 n_initial=9, max_levels=20):
+        """
+        Args:
+            section_data: SectionData object
+            tol: Relative chord error tolerance along each curve
+            angle_tol: Relative error tolerance between neighbouring angles
+            strain_max: Concrete strain at the extreme compression fiber
+            n_initial: Evenly spaced depths added to the kink depths
+            max_levels: Maximum number of bisection passes
+        """
+        self.section_data = section_data
+        self.tol = tol
+        self.angle_tol = angle_tol
+        self.strain_max = strain_max
+        self.n_initial = n_initial
+        self.max_levels = max_levels
+        self.force_factor = conversion_factor(INTERNAL_FORCE_UNIT, section_data.force_unit)
+        self.moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, section_data.moment_unit)
+
+    def breakpoints(self, angle):
+        """
+        Neutral-axis depths (length_unit) where the P-M curve has kinks.
+        """
+        section_data = self.section_data
+        arrays = section_data.arrays
+        scale = section_data.length_scale
+        origin = np.asarray(section_origin(section_data)) * scale
+        vertex_proj, bar_proj = arrays.project(bending_directions([angle]), origin)
+        top = vertex_proj[0].max()
+        bar_dist = (top - bar_proj[0]) / scale
+        below_top = bar_dist > 0
+        bar_dist = bar_dist[below_top]
+        ratio = arrays.rebar_fy[below_top] / arrays.Es / self.strain_max  # yield strain / strain_max
+        depths = [bar_dist, bar_dist / (1 + ratio)]
+        yields_in_compression = ratio < 1
+        depths.append(bar_dist[yields_in_compression] / (1 - ratio[yields_in_compression]))
+        vertex_dist = (top - vertex_proj[0]) / scale
+        depths.append(vertex_dist[vertex_dist > 0] / beta1_MPa(arrays.fc))
+        return np.unique(np.concatenate(depths))
+
+    def _evaluate(self, angles, depths):
+        P, Mx, My = compute_pmm(self.section_data, angles, depths, self.strain_max)
+        return np.stack([P * self.force_factor, Mx * self.moment_factor, My * self.moment_factor], axis=-1)
+
+    def curve(self, angle):
+        """
+        Adaptively sampled P-M curve for one bending angle.
+
+        Returns:
+            Dictionary with 'angle', sorted 'depth' array, 'P', 'Mx', 'My'
+            (force_unit / moment_unit), 'M' (moment about the neutral axis
+            direction) and the number of section 'evaluations'
+        """
+        kinks = self.breakpoints(angle)
+        if len(kinks) == 0:
+            kinks = section_heights(self.section_data, [angle])
+        c_min, c_max = 0.25 * kinks.min(), 1.02 * kinks.max()
+        depths = np.unique(np.concatenate([kinks, np.linspace(c_min, c_max, self.n_initial)]))
+        depths = depths[(depths >= c_min) & (depths <= c_max)]
+        points = self._evaluate([angle], depths)[0]
+        evaluations = len(depths)
+
+        scale = np.array([np.abs(points[:, 0]).max(), *[np.hypot(points[:, 1], points[:, 2]).max()] * 2])
+        scale[scale == 0] = 1.0
+        # Intervals still to check, as index pairs into depths
+        check = np.arange(len(depths) - 1)
+        for _ in range(self.max_levels):
+            if len(check) == 0:
+                break
+            lo_depth, hi_depth = depths[check], depths[check + 1]
+            mid_depth = (lo_depth + hi_depth) / 2
+            mid = self._evaluate([angle], mid_depth)[0]
+            evaluations += len(mid_depth)
+            error = _chord_error(points[check] / scale, points[check + 1] / scale, mid / scale)
+
+            # Split failed intervals at their midpoint and re-check both halves; passed
+            # intervals are kept whole, so every final chord was checked itself
+            failed = error > self.tol
+            depths = np.concatenate([depths, mid_depth[failed]])
+            points = np.concatenate([points, mid[failed]])
+            order = np.argsort(depths, kind='stable')
+            depths, points = depths[order], points[order]
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            mid_index = rank[len(order) - failed.sum():]
+            check = np.sort(np.concatenate([mid_index - 1, mid_index]))
+
+        d = bending_directions([angle])[0]
+        return {'angle': float(angle), 'depth': depths,
+                'P': points[:, 0], 'Mx': points[:, 1], 'My': points[:, 2],
+                'M': d[0] * points[:, 2] + d[1] * points[:, 1],
+                'evaluations': evaluations}
+
+    def angles(self, initial_angles=8, angle_tol=None, n_probe=16, max_levels=6):
+        """
+        Bending angles refined where the curves of neighbouring angles do not
+        interpolate the curve in between within `angle_tol`.
+
+        The check measures how far the points of the midpoint angle lie from
+        the chords between its neighbours' points, taken at the same depth
+        fractions of the section height.
+
+        Returns:
+            Tuple (angles, evaluations)
+        """
+        angle_tol = self.angle_tol if angle_tol is None else angle_tol
+        fractions = np.linspace(0.02, 1.5, n_probe)
+
+        def probe(angles):
+            depths = section_heights(self.section_data, angles)[:, None] * fractions
+            return self._evaluate(angles, depths)
+
+        angles = np.linspace(0, 360, initial_angles, endpoint=False)
+        points = probe(angles)
+        evaluations = points.shape[0] * points.shape[1]
+        scale = np.array([np.abs(points[..., 0]).max(), *[np.hypot(points[..., 1], points[..., 2]).max()] * 2])
+        scale[scale == 0] = 1.0
+        check = np.arange(len(angles))  # interval i spans angles[i] .. angles[i + 1] (wrapping)
+        for _ in range(max_levels):
+            if len(check) == 0:
+                break
+            nxt = (check + 1) % len(angles)
+            span = (angles[nxt] - angles[check]) % 360
+            mid_angles = angles[check] + span / 2
+            mid = probe(mid_angles)
+            evaluations += mid.shape[0] * mid.shape[1]
+            n_mid, n_fractions = mid.shape[:2]
+            error = _chord_error((points[check] / scale).reshape(-1, 3),
+                                 (points[nxt] / scale).reshape(-1, 3),
+                                 (mid / scale).reshape(-1, 3)).reshape(n_mid, n_fractions).max(axis=1)
+            failed = error > angle_tol
+            angles = np.concatenate([angles, mid_angles[failed] % 360])
+            points = np.concatenate([points, mid[failed]])
+            order = np.argsort(angles, kind='stable')
+            angles, points = angles[order], points[order]
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            mid_index = rank[len(order) - failed.sum():]
+            check = np.sort(np.concatenate([(mid_index - 1) % len(angles), mid_index]))
+        return angles, evaluations
+
+    def surface(self, angles=None, angle_tol=None):
+        """
+        Adaptive curves for all angles (refined with angles() if not given).
+
+        Returns:
+            Dictionary with 'angles', list of 'curves' (see curve()) and the
+            total number of section 'evaluations'
+        """
+        evaluations = 0
+        if angles is None:
+            angles, evaluations = self.angles(angle_tol=angle_tol)
+        curves = [self.curve(angle) for angle in angles]
+        evaluations += sum(curve['evaluations'] for curve in curves)
+        return {'angles': np.asarray(angles, dtype=float), 'curves': curves, 'evaluations': evaluations}
+
+
+def _chord_error(start, end, mid):
+    # Distance of mid from the segment start-end (all (n, k) arrays)
+    chord = end - start
+    length2 = (chord**2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.where(length2 > 0, ((mid - start) * chord).sum(axis=1) / length2, 0.0), 0, 1)
+    return np.sqrt(((start + t[:, None] * chord - mid)**2).sum(axis=1))
@@ -0,0 +1,283 @@
+"""
+Run the interaction analysis of many sections in a process pool.
+
+Sections are given either as a directory with one sub-directory per section
+(each holding rebarCoordinate.csv and sectionCoordinate.csv, like
+coordinateData/) or as a manifest CSV with columns SectionID, RebarFile,
+SectionFile and optionally fc (paths relative to the manifest). Every
+section writes its own result file, the parent process only collects the
+status records, so output never interleaves and a failing section becomes an
+error record instead of stopping the run. A section that kills its worker
+process (memory limit, crash) breaks the pool; the sections that were in
+flight are then re-run one per process, so only the culprit is recorded as
+failed, and the rest of the run continues in a new pool.
+"""
+
+import csv
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import time
+import traceback
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from RCSectionDesigner import config
+
+REBAR_FILENAME = os.path.basename(config.REBAR_COORDINATE_FILE)
+SECTION_FILENAME = os.path.basename(config.SECTION_COORDINATE_FILE)
+
+
+def safe_filename(name):
+    """
+    File name stem for a section name: characters other than letters,
+    digits, '-', '_' and '.' are replaced, and a short hash of the original
+    name keeps distinct names apart.
+    """
+    name = str(name)
+    stem = re.sub(r'[^\w.-]', '_', name).lstrip('.') or '_'
+    if stem != name:
+        stem += '-' + hashlib.sha1(name.encode()).hexdigest()[:8]
+    return stem
+
+
+def discover_sections(path, fc=None):
+    """
+    List the section jobs of a directory or manifest CSV.
+
+    Args:
+        path: Directory of section sub-directories, manifest CSV file, or bulk table
+        fc: Concrete strength (MPa) for sections without their own fc
+
+    Returns:
+        List of job dictionaries (name, rebar_filepath, section_filepath, fc),
+        for a bulk table (name, arrays) with the section's SectionData.from_arrays
+        arguments, or (name, error) for sections that failed validation
+    """
+    from RCSectionDesigner.BulkLoader import SectionLoader, is_bulk_table
+
+    jobs = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            folder = os.path.join(path, name)
+            if os.path.isfile(os.path.join(folder, REBAR_FILENAME)):
+                jobs.append({'name': name,
+                             'rebar_filepath': os.path.join(folder, REBAR_FILENAME),
+                             'section_filepath': os.path.join(folder, SECTION_FILENAME),
+                             'fc': fc})
+    elif is_bulk_table(path):
+        loader = SectionLoader(path, fc=fc, strict=False)
+        for name in loader.section_ids:
+            if name in loader.errors:
+                jobs.append({'name': name, 'error': "; ".join(loader.errors[name])})
+            else:
+                jobs.append({'name': name, 'arrays': loader.arrays(name)})
+    else:
+        base = os.path.dirname(os.path.abspath(path))
+        with open(path, newline='') as file:
+            for row in csv.DictReader(file):
+                if not row.get('SectionID'):
+                    continue
+                jobs.append({'name': row['SectionID'],
+                             'rebar_filepath': os.path.join(base, row['RebarFile']),
+                             'section_filepath': os.path.join(base, row['SectionFile']),
+                             'fc': float(row['fc']) if row.get('fc') else fc})
+    return jobs
+
+
+def _limit_memory(max_memory_mb):
+    # Pool initializer: cap the address space of each worker (Unix only)
+    if max_memory_mb:
+        try:
+            import resource
+            limit = int(max_memory_mb * 1024**2)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as error:
+            warnings.warn(f"Could not limit worker memory to {max_memory_mb} MB, the worker runs without "
+                          f"a cap ({type(error).__name__}: {error})", RuntimeWarning)
+
+
+def analyse_section(job, output_dir, angle_step=10.0, n_points=config.ANALYSIS_POINTS):
+    """
+    Analyse one section and write its surface to output_dir/<name>.npz.
+
+    Never raises: errors are returned as a record with status 'error'.
+
+    Returns:
+        Dictionary with name, status, output path or error message, seconds
+    """
+    start = time.perf_counter()
+    record = {'name': job['name'], 'status': 'ok', 'output': '', 'error': '', 'points': 0}
+    try:
+        from RCSectionDesigner.SectionData import SectionData
+        from RCSectionDesigner.InteractionSurface import InteractionSurface, default_depths
+
+        if job.get('error'):
+            raise ValueError(job['error'])
+        if 'arrays' in job:
+            section = SectionData.from_arrays(**job['arrays'])
+        elif job.get('fc') is None:
+            raise ValueError("No concrete strength (fc) given for this section")
+        else:
+            section = SectionData(job['fc'], rebar_filepath=job['rebar_filepath'],
+                                  section_filepath=job['section_filepath'])
+        angles = np.arange(0, 360, angle_step)
+        surface = InteractionSurface(section, angles, default_depths(section, angles, n_points))
+
+        output = os.path.join(output_dir, f"{safe_filename(job['name'])}.npz")
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=f"{safe_filename(job['name'])}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file, angles=surface.angles, depths=surface.depths,
+                         P=surface.P, Mx=surface.Mx, My=surface.My,
+                         force_unit=str(surface.force_unit.units), moment_unit=str(surface.moment_unit.units))
+            os.replace(tmp_path, output)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        record['output'] = output
+        record['points'] = surface.P.size
+    except Exception as error:
+        record['status'] = 'error'
+        record['error'] = f"{type(error).__name__}: {error}"
+        record['traceback'] = traceback.format_exc()
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+
+def run_batch(jobs, output_dir=None, max_workers=None, max_memory_mb=None,
+              max_tasks_per_child=50, angle_step=10.0, n_points=config.ANALYSIS_POINTS,
+              progress=print, results_file=None):
+    """
+    Analyse all jobs in a process pool and write a summary CSV.
+
+    Args:
+        jobs: Job dictionaries from discover_sections (names must be unique)
+        output_dir: Result directory (default: config.RESULTS_DIR/batch)
+        max_workers: Worker process cap (default: CPU count, at most len(jobs))
+        max_memory_mb: Optional address-space limit per worker (Unix)
+        max_tasks_per_child: Sections per worker before it is replaced (bounds leaks, Python 3.11+)
+        progress: Callable receiving one progress line per finished section, or None
+        results_file: Optional CSV/Parquet file collecting every surface as it
+            finishes (see ResultWriter; relative paths go to output_dir)
+
+    Returns:
+        List of result records in job order
+    """
+    if output_dir is None:
+        output_dir = os.path.join(config.RESULTS_DIR, 'batch')
+    os.makedirs(output_dir, exist_ok=True)
+    if not jobs:
+        return []
+    duplicates = sorted(name for name, n in Counter(str(job['name']) for job in jobs).items() if n > 1)
+    if duplicates:
+        raise ValueError(f"Batch runner: duplicate section name(s) {duplicates}, "
+                         f"their results would overwrite each other")
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+
+    pool_options = {}
+    if sys.version_info >= (3, 11):
+        pool_options['max_tasks_per_child'] = max_tasks_per_child
+
+    writer = None
+    if results_file is not None:
+        from RCSectionDesigner.ResultWriter import ResultWriter
+        writer = ResultWriter(os.path.abspath(os.path.join(output_dir, results_file)))
+
+    records = [None] * len(jobs)
+    try:
+        _collect(jobs, records, output_dir, max_workers, max_memory_mb, pool_options,
+                 angle_step, n_points, progress, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    write_summary(os.path.join(output_dir, 'batch_summary.csv'), records)
+    return records
+
+
+def _remove_partial_output(output_dir, name):
+    # Temporary result files of a section whose worker was killed mid-write
+    prefix = f"{safe_filename(name)}."
+    for filename in os.listdir(output_dir):
+        if filename.startswith(prefix) and filename.endswith('.tmp') and '.' not in filename[len(prefix):-4]:
+            os.unlink(os.path.join(output_dir, filename))
+
+
+def _crash_record(job, error):
+    return {'name': job['name'], 'status': 'error', 'output': '', 'points': 0,
+            'error': f"{type(error).__name__}: {error}", 'seconds': 0.0}
+
+
+def _collect(jobs, records, output_dir, max_workers, max_memory_mb, pool_options,
+             angle_step, n_points, progress, writer):
+    # Fill records as sections finish; surfaces are streamed to the writer one by one
+    from RCSectionDesigner.ResultWriter import surface_columns
+
+    done = 0
+
+    def finish(i, record):
+        nonlocal done
+        done += 1
+        records[i] = record
+        if writer is not None and record['status'] == 'ok':
+            with np.load(record['output']) as data:
+                writer.write(record['name'], surface_columns(data['angles'], data['depths'], data['P'],
+                                                             data['Mx'], data['My']),
+                             force_unit=str(data['force_unit']), moment_unit=str(data['moment_unit']))
+        if progress is not None:
+            detail = record['error'] if record['status'] == 'error' else f"{record['seconds']:.2f} s"
+            progress(f"[{done}/{len(jobs)}] {record['name']}: {record['status']} ({detail})")
+
+    def pool(workers):
+        return ProcessPoolExecutor(max_workers=workers, initializer=_limit_memory,
+                                   initargs=(max_memory_mb,), **pool_options)
+
+    queue = list(range(len(jobs)))[::-1]
+    while queue:
+        # Only max_workers jobs are in flight, so a broken pool has few suspects
+        suspects = []
+        with pool(max_workers) as executor:
+            running = {}
+            while queue or running:
+                while queue and len(running) < max_workers:
+                    i = queue.pop()
+                    running[executor.submit(analyse_section, jobs[i], output_dir, angle_step, n_points)] = i
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    try:
+                        record = future.result()
+                    except BrokenProcessPool:
+                        suspects.append(i)
+                        continue
+                    except Exception as error:
+                        record = _crash_record(jobs[i], error)
+                    finish(i, record)
+                if suspects:
+                    suspects += running.values()
+                    break
+        # Re-run the jobs of a broken pool one per process to find the one that died;
+        # the pool has shut down, so leftovers of its killed workers can go first
+        for i in sorted(suspects):
+            _remove_partial_output(output_dir, jobs[i]['name'])
+            try:
+                with pool(1) as executor:
+                    record = executor.submit(analyse_section, jobs[i], output_dir, angle_step, n_points).result()
+            except Exception as error:  # worker process died (e.g. memory limit)
+                record = _crash_record(jobs[i], error)
+            finish(i, record)
+
+
+def write_summary(filepath, records):
+    fields = ['name', 'status', 'points', 'seconds', 'output', 'error']
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
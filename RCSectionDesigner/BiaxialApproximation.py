@@ -0,0 +1,234 @@
+"""
+Approximate biaxial capacity from the two uniaxial P-M curves (Bresler).
+
+Only the uniaxial curves, 0/180 degrees (compression at +y/-y, moment Mx)
+and 90/270 degrees (compression at +x/-x, moment My; 0 and 90 alone for
+symmetric sections), and the pure axial capacities are computed, then any
+number of demands (Pu, Mux, Muy) is rated with array operations:
+
+    reciprocal load:  1 / Pn = 1 / Pnx + 1 / Pny - 1 / P0
+                      (Pnx, Pny at the demand's eccentricities ey = Mux / Pu,
+                      ex = Muy / Pu). Where Pn < 0.1 f'c Ag the ratio is
+                      blended linearly in Pn into that of the linear moment
+                      interaction Mux / Mnx + Muy / Mny = 1, which alone
+                      applies to Pn <= 0 (tension), so the ratio is
+                      continuous in the demand.
+    load contour:     (Mux / Mnx)^a + (Muy / Mny)^a = 1,  a = log(0.5) / log(beta)
+                      (Mnx, Mny the uniaxial capacities at the same P)
+
+Ratios are taken along the ray from zero load through the demand, like
+CapacityChecker, so both can be compared directly (compare()).
+"""
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import compute_pmm, default_depths
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+METHODS = ('reciprocal', 'contour')
+
+
+class BiaxialApproximation:
+    """
+    Bresler reciprocal-load / load-contour capacity of a section.
+
+    By default the 180 and 270 degree curves are computed as well and used
+    for negative moments; with both_signs=False only the 0 and 90 degree
+    curves are computed and |Mux|, |Muy| are rated against them, which is
+    only safe for sections with the same capacity for both signs.
+    """
+    def __init__(self, section_data, method='reciprocal', beta=0.65, n_points=100,
+                 strain_max=config.STRAIN_COMPRESSION_MAX, both_signs=True):
+        """
+        Args:
+            section_data: SectionData object
+            method: 'reciprocal' (Bresler reciprocal load) or 'contour' (load contour)
+            beta: Load contour parameter, Mnx / Mnox where the contour crosses
+                Mx / Mnox = My / Mnoy (0.5 < beta < 1; 0.65 is the usual
+                conservative value)
+            n_points: Neutral-axis depths per uniaxial curve
+            strain_max: Concrete strain at the extreme compression fiber
+            both_signs: Compute the curves for negative moments (False: symmetric section)
+        """
+        if method not in METHODS:
+            raise ValueError(f"Biaxial approximation: unknown method {method!r} (one of {METHODS})")
+        if not 0.5 < beta < 1:
+            raise ValueError("Biaxial approximation: beta must lie between 0.5 and 1")
+        self.section_data = section_data
+        self.method = method
+        self.beta = beta
+        self.alpha = np.log(0.5) / np.log(beta)
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+
+        arrays = section_data.arrays
+        steel = arrays.rebar_fy @ arrays.rebar_area
+        gross_area = section_data.polygon.area * section_data.length_scale**2
+        # Same material model as compute_pmm: full fc over the block, bars at +-fy
+        self.P0 = (arrays.fc * gross_area + steel) * force_factor
+        self.T0 = -steel * force_factor
+        self.P_low = 0.1 * arrays.fc * gross_area * force_factor
+
+        angles = [0.0, 90.0, 180.0, 270.0] if both_signs else [0.0, 90.0]
+        P, Mx, My = compute_pmm(section_data, angles, default_depths(section_data, angles, n_points), strain_max)
+        M = np.stack([Mx[0], My[1]] + ([-Mx[2], -My[3]] if both_signs else []))
+        P = P[[0, 1, 2, 3] if both_signs else [0, 1]]
+        # Curves (P, M) by increasing P, closed by the pure tension and compression points
+        self.curves = {}
+        for angle, P_a, M_a in zip(angles, P * force_factor, M * moment_factor):
+            order = np.argsort(P_a)
+            self.curves[angle] = (np.concatenate([[self.T0], P_a[order], [self.P0]]),
+                                  np.concatenate([[0.0], np.maximum(M_a[order], 0.0), [0.0]]))
+        self.M_max = {angle: curve[1].max() for angle, curve in self.curves.items()}
+
+    def _curve_angles(self, Mux, Muy):
+        # Curve used for each demand: 0/90 degrees, or 180/270 for negative moments
+        if 180.0 in self.curves:
+            return np.where(Mux < 0, 180.0, 0.0), np.where(Muy < 0, 270.0, 90.0)
+        return np.zeros_like(Mux), np.full_like(Muy, 90.0)
+
+    def uniaxial_capacity(self, P, angle=0.0):
+        """
+        Moment capacity (moment_unit) of one uniaxial curve at axial loads P
+        (0 outside the axial capacity range).
+        """
+        return self._capacity(angle, np.asarray(P, dtype=float))
+
+    def _capacity(self, angle, P):
+        P_curve, M_curve = self.curves[float(angle)]
+        return np.interp(P, P_curve, M_curve, left=0.0, right=0.0)
+
+    def _select(self, function, angles, *args):
+        # Evaluate a per-curve function with each demand's own curve
+        result = np.zeros(np.shape(angles))
+        for angle in np.unique(angles):
+            rows = angles == angle
+            result[rows] = function(angle, *(arg[rows] for arg in args))
+        return result
+
+    def _axial_at_slope(self, angle, k):
+        # Axial capacity on the curve where P / M equals k (compression side; k = 0 at P = 0)
+        P_curve, M_curve = self.curves[float(angle)]
+        compressed = P_curve > 0
+        P = np.concatenate([[0.0], P_curve[compressed]])
+        M = np.concatenate([[self._capacity(angle, 0.0)], M_curve[compressed]])
+        with np.errstate(divide='ignore'):
+            slope = np.maximum.accumulate(P / M)
+        # P0 (M = 0) sits at an infinite slope, keep it last with a finite one
+        finite = np.isfinite(slope)
+        slope[~finite] = slope[finite].max() * 1e6
+        return np.interp(k, slope, P)
+
+    def _contour_value(self, P, Mx, My, angle_x, angle_y, alpha):
+        # Load contour measure at loads (P, Mx, My); > 1 outside the contour
+        Mnx = self._select(self._capacity, angle_x, P)
+        Mny = self._select(self._capacity, angle_y, P)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx = np.where(Mx == 0, 0.0, np.abs(Mx) / Mnx)
+            ty = np.where(My == 0, 0.0, np.abs(My) / Mny)
+        value = (tx**alpha + ty**alpha)**(1 / alpha)
+        return np.where((P > self.P0) | (P < self.T0), np.inf, value)
+
+    def _contour_ratios(self, Pu, Mux, Muy, angle_x, angle_y, alpha, iterations=60):
+        # Scale s of the demand that reaches the contour, by bisection; ratio = 1 / s
+        with np.errstate(divide='ignore', invalid='ignore'):
+            axial = np.where(Pu > 0, self.P0 / Pu, np.where(Pu < 0, self.T0 / Pu, np.inf))
+            M_max_x = self._select(lambda angle, _: self.M_max[float(angle)], angle_x, angle_x)
+            M_max_y = self._select(lambda angle, _: self.M_max[float(angle)], angle_y, angle_y)
+            bending = ((np.abs(Mux) / M_max_x)**alpha + (np.abs(Muy) / M_max_y)**alpha)**(-1 / alpha)
+        lo = np.zeros_like(Pu)
+        hi = np.minimum(axial, bending)
+        zero = ~np.isfinite(hi)
+        hi[zero] = 1.0
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            outside = self._contour_value(mid * Pu, mid * Mux, mid * Muy, angle_x, angle_y, alpha) > 1
+            lo = np.where(outside, lo, mid)
+            hi = np.where(outside, mid, hi)
+        with np.errstate(divide='ignore'):
+            ratio = 1 / ((lo + hi) / 2)
+        ratio[zero] = 0.0
+        return ratio
+
+    def ratios(self, Pu, Mux, Muy, method=None):
+        """
+        Approximate demand/capacity ratio of every load combination.
+
+        Args:
+            Pu: Axial demands in force_unit (compression positive)
+            Mux, Muy: Moment demands in moment_unit (as in InteractionSurface)
+            method: Override of the method given at construction
+
+        Returns:
+            Array of ratios (> 1 means the demand exceeds the approximate capacity)
+        """
+        method = self.method if method is None else method
+        if method not in METHODS:
+            raise ValueError(f"Biaxial approximation: unknown method {method!r} (one of {METHODS})")
+        Pu, Mux, Muy = (np.ravel(np.asarray(value, dtype=float)) for value in (Pu, Mux, Muy))
+        angle_x, angle_y = self._curve_angles(Mux, Muy)
+        if method == 'contour':
+            return self._contour_ratios(Pu, Mux, Muy, angle_x, angle_y, self.alpha)
+
+        # Reciprocal load where its capacity Pn >= 0.1 f'c Ag, linear moment interaction
+        # at Pn <= 0 and a linear blend in between, so the ratio has no step
+        ratio = self._contour_ratios(Pu, Mux, Muy, angle_x, angle_y, 1.0)
+        compressed = Pu > 0
+        if compressed.any():
+            P = Pu[compressed]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                Pnx = self._select(self._axial_at_slope, angle_x[compressed], P / np.abs(Mux[compressed]))
+                Pny = self._select(self._axial_at_slope, angle_y[compressed], P / np.abs(Muy[compressed]))
+                reciprocal = P * np.maximum(1 / Pnx + 1 / Pny - 1 / self.P0, 0.0)
+                Pn = P / reciprocal
+            weight = np.clip(np.nan_to_num(Pn, nan=np.inf) / self.P_low, 0.0, 1.0)
+            blended = weight > 0
+            ratio[np.flatnonzero(compressed)[blended]] = (weight[blended] * reciprocal[blended]
+                                                         + (1 - weight[blended]) * ratio[compressed][blended])
+        return ratio
+
+    def check(self, Pu, Mux, Muy, limit=1.0):
+        """
+        Approximate ratios and pass/fail flags (same keys as CapacityChecker.check).
+        """
+        ratio = self.ratios(Pu, Mux, Muy)
+        return {'ratio': ratio,
+                'passed': ratio <= limit,
+                'governing': int(np.argmax(ratio)) if len(ratio) else None}
+
+    def compare(self, Pu, Mux, Muy, sample=None, seed=None, angles=None, depths=None, cache=None):
+        """
+        Error of the approximation against the exact interaction surface.
+
+        Args:
+            Pu, Mux, Muy: Demands as in ratios()
+            sample: Number of randomly chosen demands to compare (default: all)
+            seed: Seed of the sample selection
+            angles, depths, cache: InteractionSurface arguments of the exact surface
+
+        Returns:
+            Dictionary with the compared 'index', 'approximate' and 'exact'
+            ratios, their 'error' (approximate - exact), 'max_error',
+            'mean_abs_error', the fraction of 'unconservative' demands
+            (approximate ratio below the exact one by more than 1e-6) and
+            'max_unconservative' (largest exact - approximate)
+        """
+        from RCSectionDesigner.CapacityCheck import CapacityChecker
+        from RCSectionDesigner.InteractionSurface import InteractionSurface
+
+        Pu, Mux, Muy = (np.ravel(np.asarray(value, dtype=float)) for value in (Pu, Mux, Muy))
+        index = np.arange(len(Pu))
+        if sample is not None and sample < len(Pu):
+            index = np.sort(np.random.default_rng(seed).choice(len(Pu), sample, replace=False))
+        approximate = self.ratios(Pu[index], Mux[index], Muy[index])
+        surface = InteractionSurface(self.section_data, angles, depths, cache=cache)
+        exact = CapacityChecker(surface).ratios(Pu[index], Mux[index], Muy[index])
+        error = approximate - exact
+        return {'index': index, 'approximate': approximate, 'exact': exact, 'error': error,
+                'max_error': float(np.abs(error).max()) if len(error) else 0.0,
+                'mean_abs_error': float(np.abs(error).mean()) if len(error) else 0.0,
+                'unconservative': float((error < -1e-6).mean()) if len(error) else 0.0,
+                'max_unconservative': float(max(-error.min(), 0.0)) if len(error) else 0.0}
@@ -0,0 +1,255 @@
+"""
+Load the sections of a whole building from one long-form table.
+
+Every row is an outline vertex or a rebar of one section:
+
+    SectionID, Kind,    X,    Y, Size, Grade, Diameter, fc
+    C1,        Outline, -200, -300, , , ,    30
+    C1,        Outline,  200, -300, , , ,
+    ...
+    C1,        Rebar,   -140, -240, DB20, SD40, 20,
+    ...
+
+Outline vertices are listed in order (the ring is closed automatically, a
+repeated first vertex is dropped), Diameter defaults to the catalog diameter
+of the size and fc may be given on any row of the section. Instead of the
+Kind column, outlines and rebars may also come from two files. The table is
+read once (CSV, or Parquet with pandas' optional pyarrow/fastparquet engine),
+all sections are validated together with array operations, and the
+SectionData objects are only built while iterating.
+"""
+
+import os
+
+import numpy as np
+
+from RCSectionDesigner.MaterialCatalog import load_catalog
+from RCSectionDesigner.SectionData import SectionData
+from RCSectionDesigner.units import conversion_factor, ureg, INTERNAL_LENGTH_UNIT
+
+OUTLINE = 'outline'
+REBAR = 'rebar'
+
+
+def read_table(filepath):
+    """
+    Read a CSV or Parquet (.parquet/.pq) file into a DataFrame.
+    """
+    import pandas as pd
+
+    if os.path.splitext(filepath)[1].lower() in ('.parquet', '.pq'):
+        try:
+            return pd.read_parquet(filepath)
+        except ImportError as error:
+            raise ImportError(f"Reading {filepath} needs pyarrow or fastparquet: {error}") from error
+    return pd.read_csv(filepath)
+
+
+def is_bulk_table(filepath):
+    """
+    True for Parquet files and CSV files with a Kind column.
+    """
+    if os.path.splitext(filepath)[1].lower() in ('.parquet', '.pq'):
+        return True
+    with open(filepath, newline='') as file:
+        header = file.readline()
+    return 'Kind' in [name.strip() for name in header.split(',')]
+
+
+def _group_starts(ids):
+    # Start index of every run of equal ids in a sorted array
+    change = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    return np.concatenate([[0], change])
+
+
+class SectionLoader:
+    """
+    Sections of a long-form table, validated in bulk and built lazily.
+
+    Sections that fail validation are listed in `errors` and skipped while
+    iterating (strict=False) or make the constructor raise (strict=True).
+    """
+    def __init__(self, filepath, rebar_filepath=None, fc=None, material_catalog=None,
+                 length_unit="mm", force_unit="kN", moment_unit="kN*m", strict=True):
+        """
+        Args:
+            filepath: Long-form CSV/Parquet file with Kind column, or outline
+                file (SectionID, X, Y) when rebar_filepath is given
+            rebar_filepath: Optional rebar file (SectionID, X, Y, Size, Grade, ...)
+            fc: Concrete strength (MPa) for sections without their own fc
+            material_catalog: MaterialCatalog (default: the shared catalog)
+            strict: Raise ValueError listing every invalid section
+        """
+        import pandas as pd
+
+        self.material_catalog = load_catalog() if material_catalog is None else material_catalog
+        self.units = (length_unit, force_unit, moment_unit)
+        table = read_table(filepath)
+        if rebar_filepath is not None:
+            table = pd.concat([table.assign(Kind=OUTLINE), read_table(rebar_filepath).assign(Kind=REBAR)],
+                              ignore_index=True)
+        missing = {'SectionID', 'Kind', 'X', 'Y'} - set(table.columns)
+        if missing:
+            raise ValueError(f"Bulk section table: missing column(s) {sorted(missing)}")
+        # Blank lines, same as dropna() on a CSV without optional columns
+        table = table.dropna(how='all')
+
+        ids = table['SectionID'].astype(str).to_numpy()
+        kind = table['Kind'].astype(str).str.strip().str.lower().to_numpy()
+        # Stable sort keeps the vertex order within each section
+        order = np.lexsort((kind != OUTLINE, ids))
+        self._ids, self._kind = ids[order], kind[order]
+        self._x = pd.to_numeric(table['X'], errors='coerce').to_numpy(dtype=float)[order]
+        self._y = pd.to_numeric(table['Y'], errors='coerce').to_numpy(dtype=float)[order]
+        self._size = self._column(table, 'Size', order)
+        self._grade = self._column(table, 'Grade', order)
+        diameter = pd.to_numeric(table['Diameter'], errors='coerce') if 'Diameter' in table else None
+        self._diameter = (np.full(len(order), np.nan) if diameter is None
+                          else diameter.to_numpy(dtype=float)[order])
+        section_fc = (pd.to_numeric(table['fc'], errors='coerce').to_numpy(dtype=float)[order]
+                      if 'fc' in table else np.full(len(order), np.nan))
+
+        starts = _group_starts(self._ids) if len(order) else np.zeros(0, dtype=int)
+        self.section_ids = list(self._ids[starts])
+        ends = np.append(starts[1:], len(order))
+        self._slices = {name: (i, start, end)
+                        for i, (name, start, end) in enumerate(zip(self.section_ids, starts, ends))}
+        # Section number of every row; first fc given per section, else the default
+        group = np.repeat(np.arange(len(starts)), ends - starts)
+        first = np.full(len(starts), np.nan)
+        given = np.flatnonzero(~np.isnan(section_fc))[::-1]
+        first[group[given]] = section_fc[given]
+        self._fc = np.where(np.isnan(first), np.nan if fc is None else fc, first)
+
+        self.errors = self._validate(group, starts)
+        if strict and self.errors:
+            lines = [f"{name}: {'; '.join(messages)}" for name, messages in self.errors.items()]
+            raise ValueError("Bulk section table: invalid section(s)\n" + "\n".join(lines))
+
+    @staticmethod
+    def _column(table, name, order):
+        if name not in table:
+            return np.full(len(order), '', dtype=object)
+        return table[name].fillna('').astype(str).str.strip().to_numpy(dtype=object)[order]
+
+    def _validate(self, group, starts):
+        # All checks run over every row/section at once; returns {SectionID: [messages]}
+        import shapely
+
+        n = len(starts)
+        errors = {}
+
+        def flag(mask, message):
+            for name in np.asarray(self.section_ids, dtype=object)[mask]:
+                errors.setdefault(name, []).append(message)
+
+        outline = self._kind == OUTLINE
+        rebar = self._kind == REBAR
+        flag(np.bincount(group[~(outline | rebar)], minlength=n) > 0, "unknown Kind (expected Outline or Rebar)")
+        finite = np.isfinite(self._x) & np.isfinite(self._y)
+        flag(np.bincount(group[~finite], minlength=n) > 0, "missing or non-numeric coordinates")
+        flag(np.isnan(self._fc), "no concrete strength (fc) given")
+        flag(self._fc <= 0, "concrete strength (fc) must be positive")
+
+        # Outline rings: drop a repeated closing vertex, then build all polygons at once
+        vertex = outline & finite
+        last = np.zeros(len(vertex), dtype=bool)
+        last[np.flatnonzero(vertex)[np.append(group[vertex][1:] != group[vertex][:-1], True)]] = True
+        first_index = np.full(n, -1)
+        first_index[group[vertex][::-1]] = np.flatnonzero(vertex)[::-1]
+        closing = last & (first_index[group] != np.arange(len(vertex)))
+        closing &= (self._x == self._x[first_index[group]]) & (self._y == self._y[first_index[group]])
+        self._vertex = vertex & ~closing
+        counts = np.bincount(group[self._vertex], minlength=n)
+        flag(counts < 3, "outline needs at least 3 vertices")
+        polygons = np.full(n, None, dtype=object)
+        ok = counts >= 3
+        if ok.any():
+            rows = self._vertex & ok[group]
+            rings = shapely.linearrings(np.column_stack([self._x[rows], self._y[rows]]),
+                                        indices=np.searchsorted(np.flatnonzero(ok), group[rows]))
+            polygons[ok] = shapely.polygons(rings)
+        valid = ok.copy()
+        valid[ok] = shapely.is_valid(polygons[ok]) & (shapely.area(polygons[ok]) > 0)
+        flag(ok & ~valid, "outline is not a valid simple polygon")
+
+        # Catalog names and bar fit, one vectorized pass over all rebars
+        flag(np.bincount(group[rebar], minlength=n) == 0, "no rebars")
+        bars = np.flatnonzero(rebar & finite)
+        catalog = self.material_catalog
+        known_size = np.isin(self._size[bars], list(catalog.sizes))
+        known_grade = np.isin(self._grade[bars], list(catalog.grades))
+        flag(np.bincount(group[bars[~known_size]], minlength=n) > 0, "unknown bar size")
+        flag(np.bincount(group[bars[~known_grade]], minlength=n) > 0, "unknown rebar grade")
+        catalog_diameter = np.array([catalog.sizes[size]['diameter'] if known else np.nan
+                                     for size, known in zip(self._size[bars], known_size)])
+        self._diameter[bars] = np.where(np.isnan(self._diameter[bars]), catalog_diameter, self._diameter[bars])
+        flag(np.bincount(group[bars[self._diameter[bars] <= 0]], minlength=n) > 0, "bar diameter must be positive")
+        checked = bars[valid[group[bars]]]
+        if len(checked):
+            geometry = polygons[group[checked]]
+            x, y = self._x[checked], self._y[checked]
+            # The bar circle must lie inside: center inside and clear of the outline by the radius
+            # (coordinates in length_unit, diameters in mm like the catalog)
+            clear = shapely.distance(shapely.boundary(geometry), shapely.points(x, y))
+            length_scale = conversion_factor(ureg(self.units[0]), INTERNAL_LENGTH_UNIT)
+            radius = np.nan_to_num(self._diameter[checked]) / 2 / length_scale
+            inside = shapely.contains_xy(geometry, x, y) & (clear >= radius)
+            flag(np.bincount(group[checked[~inside]], minlength=n) > 0, "rebar outside the concrete")
+        return errors
+
+    @property
+    def valid_ids(self):
+        return [name for name in self.section_ids if name not in self.errors]
+
+    def __len__(self):
+        return len(self.valid_ids)
+
+    def arrays(self, section_id):
+        """
+        Plain-array description of one section (picklable, e.g. for worker
+        processes).
+
+        Returns:
+            Keyword arguments of SectionData.from_arrays
+        """
+        if section_id not in self._slices:
+            raise ValueError(f"Bulk section table: unknown section {section_id!r}")
+        if section_id in self.errors:
+            raise ValueError(f"Bulk section table: section {section_id!r} is invalid: "
+                             + "; ".join(self.errors[section_id]))
+        i, start, end = self._slices[section_id]
+        rows = np.arange(start, end)
+        vertices = rows[self._vertex[rows]]
+        bars = rows[self._kind[rows] == REBAR]
+        length_unit, force_unit, moment_unit = self.units
+        return {'con_matprop': float(self._fc[i]),
+                'outline': np.column_stack([self._x[vertices], self._y[vertices]]),
+                'rebar_xy': np.column_stack([self._x[bars], self._y[bars]]),
+                'sizes': list(self._size[bars]), 'grades': list(self._grade[bars]),
+                'diameters': self._diameter[bars],
+                'length_unit': length_unit, 'force_unit': force_unit, 'moment_unit': moment_unit}
+
+    def section(self, section_id):
+        """
+        Build the SectionData object of one section.
+        """
+        return SectionData.from_arrays(**self.arrays(section_id), material_catalog=self.material_catalog)
+
+    def __iter__(self):
+        """
+        Yield (SectionID, SectionData) of every valid section, in SectionID order.
+        """
+        for section_id in self.valid_ids:
+            yield section_id, self.section(section_id)
+
+
+def load_sections(filepath, rebar_filepath=None, fc=None, **kwargs):
+    """
+    Lazily yield (SectionID, SectionData) of every section in a bulk table.
+
+    Args:
+        filepath, rebar_filepath, fc: See SectionLoader
+        **kwargs: Further SectionLoader arguments (material_catalog, units, strict)
+    """
+    yield from SectionLoader(filepath, rebar_filepath, fc, **kwargs)
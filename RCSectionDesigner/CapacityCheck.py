@@ -0,0 +1,164 @@
+"""
+Demand/capacity ratios of load combinations against an interaction surface.
+
+The capacity of a demand (Pu, Mux, Muy) is where the ray from zero load
+through the demand leaves the surface; the ratio is |demand| / |capacity|.
+The surface is represented by the convex hull of its points, with each facet
+written as m . x <= 1 (scaled by the facet offset). The ratio of any demand q
+is then the gauge function max_i(m_i . q), and the maximizing facet is
+found by a greedy walk over facet neighbours started from a precomputed
+direction table, so a combination costs a few dot products instead of a
+pass over all facets.
+"""
+
+import csv
+
+import numpy as np
+
+from RCSectionDesigner.InteractionSurface import InteractionSurface
+
+
+class CapacityChecker:
+    """
+    Triangulated index over an interaction surface for bulk D/C checks.
+    """
+    def __init__(self, surface, n_azimuth=36, n_elevation=18):
+        """
+        Args:
+            surface: InteractionSurface (P in force_unit, Mx/My in moment_unit)
+            n_azimuth, n_elevation: Resolution of the direction lookup table
+        """
+        from scipy.spatial import ConvexHull
+
+        self.surface = surface
+        self.force_unit = surface.force_unit
+        self.moment_unit = surface.moment_unit
+        points = surface.points()
+        # Work in axes scaled to similar magnitudes; ray ratios are unaffected
+        self.scale = np.abs(points).max(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        hull = ConvexHull(points / self.scale)
+        normals = hull.equations[:, :3]
+        offsets = hull.equations[:, 3]  # n . x + offset <= 0 inside
+        if np.any(offsets >= 0):
+            raise ValueError("Interaction surface does not enclose zero load, cannot compute D/C ratios")
+        coefficients = normals / -offsets[:, None]
+        # Coplanar triangles share one plane; merge them so the walk never stalls
+        # on a plateau, and connect planes whose triangles are adjacent
+        planes, plane_of_facet = np.unique(np.round(coefficients, 12), axis=0, return_inverse=True)
+        plane_of_facet = plane_of_facet.ravel()
+        pairs = np.unique(np.column_stack([np.repeat(plane_of_facet, 3),
+                                           plane_of_facet[hull.neighbors.ravel()]]), axis=0)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        degree = np.bincount(pairs[:, 0], minlength=len(planes))
+        neighbors = np.repeat(np.arange(len(planes))[:, None], max(degree.max(), 1), axis=1)
+        slot = np.arange(len(pairs)) - np.repeat(np.cumsum(degree) - degree, degree)
+        neighbors[pairs[:, 0], slot] = pairs[:, 1]
+        self.facet_coefficients = planes
+        self.neighbors = neighbors  # padded with the plane's own index
+        self.n_azimuth = n_azimuth
+        self.n_elevation = n_elevation
+        self.start_facet = self._build_direction_table()
+
+    def _direction_bins(self, q):
+        azimuth = np.arctan2(q[:, 2], q[:, 1])
+        elevation = np.arctan2(q[:, 0], np.hypot(q[:, 1], q[:, 2]))
+        i = ((azimuth + np.pi) / (2 * np.pi) * self.n_azimuth).astype(int) % self.n_azimuth
+        j = np.clip(((elevation + np.pi / 2) / np.pi * self.n_elevation).astype(int), 0, self.n_elevation - 1)
+        return i * self.n_elevation + j
+
+    def _build_direction_table(self):
+        # Best facet for the center direction of every (azimuth, elevation) bin
+        azimuth = (np.arange(self.n_azimuth) + 0.5) / self.n_azimuth * 2 * np.pi - np.pi
+        elevation = (np.arange(self.n_elevation) + 0.5) / self.n_elevation * np.pi - np.pi / 2
+        az, el = np.meshgrid(azimuth, elevation, indexing='ij')
+        directions = np.column_stack([np.sin(el).ravel(),
+                                      (np.cos(el) * np.cos(az)).ravel(),
+                                      (np.cos(el) * np.sin(az)).ravel()])
+        return np.argmax(directions @ self.facet_coefficients.T, axis=1)
+
+    def ratios(self, Pu, Mux, Muy, return_iterations=False):
+        """
+        Demand/capacity ratio of every load combination.
+
+        Args:
+            Pu: Axial demands in force_unit (compression positive)
+            Mux, Muy: Moment demands in moment_unit, same convention as
+                InteractionSurface (Mx = sum(F * (y - y0)), My = sum(F * (x - x0)))
+            return_iterations: Also return the number of neighbour-walk steps
+
+        Returns:
+            Array of ratios (> 1 means the demand is outside the surface)
+        """
+        q = np.column_stack([np.ravel(Pu), np.ravel(Mux), np.ravel(Muy)]).astype(float) / self.scale
+        facet = self.start_facet[self._direction_bins(q)]
+        value = np.einsum('ij,ij->i', self.facet_coefficients[facet], q)
+        iterations = 0
+        active = np.arange(len(q))
+        while len(active):
+            iterations += 1
+            candidates = self.neighbors[facet[active]]  # (n_active, max_degree)
+            values = np.einsum('ikj,ij->ik', self.facet_coefficients[candidates], q[active])
+            best = np.argmax(values, axis=1)
+            best_value = values[np.arange(len(active)), best]
+            improved = best_value > value[active] * (1 + 1e-12) + 1e-15
+            moved = active[improved]
+            facet[moved] = candidates[improved, best[improved]]
+            value[moved] = best_value[improved]
+            active = moved
+        value = np.maximum(value, 0.0)
+        if return_iterations:
+            return value, iterations
+        return value
+
+    def check(self, Pu, Mux, Muy, limit=1.0):
+        """
+        Ratios and pass/fail flags of many load combinations.
+
+        Returns:
+            Dictionary with 'ratio' array, 'passed' boolean array and the
+            'governing' index of the highest ratio
+        """
+        ratio = self.ratios(Pu, Mux, Muy)
+        return {'ratio': ratio,
+                'passed': ratio <= limit,
+                'governing': int(np.argmax(ratio)) if len(ratio) else None}
+
+
+def check_section(section_data, Pu, Mux, Muy, angles=None, depths=None, cache=None):
+    """
+    Build the interaction surface of a section once and check all combinations.
+
+    Returns:
+        Dictionary as returned by CapacityChecker.check
+    """
+    surface = InteractionSurface(section_data, angles, depths, cache=cache)
+    return CapacityChecker(surface).check(Pu, Mux, Muy)
+
+
+def read_load_combinations(filepath):
+    """
+    Read load combinations from a CSV file with columns Pu, Mux, Muy
+    (and optionally a Combination name column).
+
+    Returns:
+        Tuple (names, Pu, Mux, Muy)
+    """
+    with open(filepath, newline='') as file:
+        rows = [row for row in csv.DictReader(file) if row.get('Pu') not in (None, '')]
+    names = [row.get('Combination') or str(i) for i, row in enumerate(rows)]
+    Pu = np.array([float(row['Pu']) for row in rows])
+    Mux = np.array([float(row['Mux']) for row in rows])
+    Muy = np.array([float(row['Muy']) for row in rows])
+    return names, Pu, Mux, Muy
+
+
+def write_check_results(filepath, names, Pu, Mux, Muy, result):
+    """
+    Write per-combination ratios to a CSV file.
+    """
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Combination', 'Pu', 'Mux', 'Muy', 'Ratio', 'Passed'])
+        for row in zip(names, Pu, Mux, Muy, result['ratio'], result['passed']):
+            writer.writerow([row[0], *(repr(float(value)) for value in row[1:5]), bool(row[5])])
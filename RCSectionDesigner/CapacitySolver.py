@@ -0,0 +1,106 @@
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import compute_pmm, bending_directions, section_heights
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+class CapacitySolver:
+    """
+    Nominal moment capacity at a given axial load and bending angle.
+
+    Axial force grows monotonically with the neutral-axis depth c, so the
+    depth in equilibrium with Pu is found with Brent's method on P(c) - Pu,
+    bracketed around a warm-start guess (e.g. the depth found for the
+    neighbouring angle) instead of sweeping the full depth range.
+    """
+    def __init__(self, section_data, strain_max=config.STRAIN_COMPRESSION_MAX, xtol=1e-6):
+        """
+        Args:
+            section_data: SectionData object
+            strain_max: Concrete strain at the extreme compression fiber
+            xtol: Absolute tolerance on the neutral-axis depth (length_unit)
+        """
+        self.section_data = section_data
+        self.strain_max = strain_max
+        self.xtol = xtol
+        self.force_factor = conversion_factor(INTERNAL_FORCE_UNIT, section_data.force_unit)
+        self.moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, section_data.moment_unit)
+
+    def evaluate(self, angle, depth):
+        """
+        (P, Mx, My) in the section's force_unit / moment_unit for one case.
+        """
+        P, Mx, My = compute_pmm(self.section_data, [angle], [depth], self.strain_max)
+        return (float(P[0, 0]) * self.force_factor,
+                float(Mx[0, 0]) * self.moment_factor,
+                float(My[0, 0]) * self.moment_factor)
+
+    def _bracket(self, residual, angle, depth_guess):
+        height = section_heights(self.section_data, [angle])[0]
+        if depth_guess is None:
+            lo, hi = 0.1 * height, height
+        else:
+            lo, hi = depth_guess / 1.5, depth_guess * 1.5
+        f_lo, f_hi = residual(lo), residual(hi)
+        while f_lo > 0:
+            if lo < height * 1e-6:
+                raise ValueError("Axial load is below the pure tension capacity of the section")
+            hi, f_hi = lo, f_lo
+            lo = lo / 4
+            f_lo = residual(lo)
+        while f_hi < 0:
+            if hi > height * 1e4:
+                raise ValueError("Axial load exceeds the pure compression capacity of the section")
+            lo, f_lo = hi, f_hi
+            hi = hi * 4
+            f_hi = residual(hi)
+        return lo, hi
+
+    def solve(self, Pu, angle, depth_guess=None):
+        """
+        Find the neutral-axis depth where P = Pu and the corresponding moments.
+
+        Args:
+            Pu: Axial load in force_unit (compression positive)
+            angle: Bending angle in degrees (as in rotate_section)
+            depth_guess: Optional warm-start depth (length_unit)
+
+        Returns:
+            Dictionary with 'depth', 'P', 'Mx', 'My', 'M' (moment about the
+            neutral axis direction), 'iterations' (Brent iterations) and
+            'evaluations' (section evaluations including bracketing)
+        """
+        from scipy.optimize import brentq
+
+        evaluations = 0
+
+        def residual(depth):
+            nonlocal evaluations
+            evaluations += 1
+            return self.evaluate(angle, depth)[0] - Pu
+
+        lo, hi = self._bracket(residual, angle, depth_guess)
+        depth, info = brentq(residual, lo, hi, xtol=self.xtol, full_output=True)
+        P, Mx, My = self.evaluate(angle, depth)
+        d = bending_directions([angle])[0]
+        return {'depth': depth, 'P': P, 'Mx': Mx, 'My': My,
+                'M': float(d[0] * My + d[1] * Mx),
+                'iterations': info.iterations,
+                'evaluations': evaluations + 1}
+
+    def solve_angles(self, Pu, angles):
+        """
+        Capacities at Pu for a sequence of angles, each warm-started from the
+        depth found for the previous angle.
+
+        Returns:
+            Dictionary of arrays with the same keys as solve()
+        """
+        results = []
+        depth_guess = None
+        for angle in angles:
+            result = self.solve(Pu, angle, depth_guess)
+            depth_guess = result['depth']
+            results.append(result)
+        return {key: np.array([result[key] for result in results]) for key in results[0]} if results else {}
@@ -0,0 +1,261 @@
+"""
+Fiber discretization of a section for nonlinear material laws.
+
+The concrete outline is cut once into grid cells of a given mesh size
+(cells are clipped to the polygon, so edges and holes are exact) and stored
+as fiber centroid/area arrays; the rebars are fibers of their own. A plane
+strain state (eps0, kx, ky), with
+
+    strain = eps0 + kx * (y - y0) + ky * (x - x0)
+
+(compression positive, (x0, y0) the bounding box center as in
+InteractionSurface) is mapped to fiber strains and back to the resultants
+(P, Mx, My) by products with the fixed (n_fibers, 3) matrix [1, y - y0, x - x0],
+so any number of strain states is evaluated without touching the geometry.
+"""
+
+import weakref
+
+import numpy as np
+
+from RCSectionDesigner.InteractionSurface import section_origin
+
+
+class HognestadConcrete:
+    """
+    Hognestad parabola up to eps0, linear descent to 0.85 * fc at eps_cu,
+    no stress beyond eps_cu or in tension.
+    """
+    def __init__(self, fc, eps0=0.002, eps_cu=0.0038):
+        """
+        Args:
+            fc: Peak compressive stress (MPa)
+            eps0: Strain at peak stress
+            eps_cu: Ultimate (crushing) strain
+        """
+        self.fc = float(fc)
+        self.eps0 = eps0
+        self.eps_cu = eps_cu
+
+    def stress(self, strain):
+        x = strain / self.eps0
+        descent = 1 - 0.15 * (strain - self.eps0) / (self.eps_cu - self.eps0)
+        return self.fc * np.select([strain <= 0, strain <= self.eps0, strain <= self.eps_cu],
+                                   [0.0, 2 * x - x**2, descent], 0.0)
+
+    def tangent(self, strain):
+        return np.select([strain < 0, strain <= self.eps0, strain <= self.eps_cu],
+                         [0.0, 2 * self.fc / self.eps0 * (1 - strain / self.eps0),
+                          -0.15 * self.fc / (self.eps_cu - self.eps0)], 0.0)
+
+
+class ManderConcrete:
+    """
+    Mander et al. (1988) curve, sigma = fcc * x * r / (r - 1 + x^r) with
+    x = strain / eps_cc, no stress beyond eps_cu or in tension.
+
+    With fcc = fc (default) this is the unconfined curve; a confined peak
+    fcc > fc shifts the peak strain to eps_c0 * (1 + 5 * (fcc / fc - 1)).
+    """
+    def __init__(self, fc, fcc=None, eps_c0=0.002, eps_cu=0.005, Ec=None):
+        """
+        Args:
+            fc: Unconfined compressive strength (MPa)
+            fcc: Confined compressive strength (MPa, default: fc)
+            eps_c0: Strain at the unconfined peak
+            eps_cu: Ultimate strain
+            Ec: Initial modulus (MPa, default: 5000 * sqrt(fc))
+        """
+        self.fc = float(fc)
+        self.fcc = self.fc if fcc is None else float(fcc)
+        self.eps_cc = eps_c0 * (1 + 5 * (self.fcc / self.fc - 1))
+        self.eps_cu = eps_cu
+        Ec = 5000 * np.sqrt(self.fc) if Ec is None else Ec
+        E_sec = self.fcc / self.eps_cc
+        if Ec <= E_sec:
+            raise ValueError("Mander concrete: initial modulus must exceed the secant modulus at the peak")
+        self.r = Ec / (Ec - E_sec)
+
+    def _active(self, strain):
+        return (strain >= 0) & (strain <= self.eps_cu)
+
+    def stress(self, strain):
+        x = np.where(self._active(strain), strain / self.eps_cc, 0.0)
+        r = self.r
+        return np.where(self._active(strain), self.fcc * x * r / (r - 1 + x**r), 0.0)
+
+    def tangent(self, strain):
+        x = np.where(self._active(strain), strain / self.eps_cc, 0.0)
+        r = self.r
+        slope = self.fcc / self.eps_cc * r * (r - 1) * (1 - x**r) / (r - 1 + x**r)**2
+        return np.where(self._active(strain), slope, 0.0)
+
+
+class BilinearSteel:
+    """
+    Elastic up to fy, linear hardening to fu at eps_su, constant fu beyond,
+    the same in tension and compression. fy and fu may be per-bar arrays.
+    """
+    def __init__(self, fy, fu, Es=200000.0, eps_su=0.1):
+        """
+        Args:
+            fy, fu: Yield and tensile strength (MPa), scalars or per-bar arrays
+            Es: Elastic modulus (MPa)
+            eps_su: Strain at which fu is reached
+        """
+        self.fy = np.asarray(fy, dtype=float)
+        self.fu = np.maximum(np.asarray(fu, dtype=float), self.fy)
+        self.Es = float(Es)
+        self.eps_y = self.fy / self.Es
+        self.eps_su = eps_su
+        self.Eh = (self.fu - self.fy) / np.maximum(eps_su - self.eps_y, 1e-12)
+
+    def stress(self, strain):
+        magnitude = np.abs(strain)
+        stress = np.where(magnitude <= self.eps_y, magnitude * self.Es,
+                          np.minimum(self.fy + (magnitude - self.eps_y) * self.Eh, self.fu))
+        return np.sign(strain) * stress
+
+    def tangent(self, strain):
+        magnitude = np.abs(strain)
+        return np.where(magnitude <= self.eps_y, self.Es,
+                        np.where(magnitude < self.eps_su, self.Eh, 0.0))
+
+
+def mesh_polygon(polygon, mesh_size):
+    """
+    Cut a polygon into square grid cells clipped to its outline.
+
+    Args:
+        polygon: shapely Polygon (coordinates in mm)
+        mesh_size: Cell size (mm)
+
+    Returns:
+        Tuple (x, y, area) of fiber centroid and area arrays
+    """
+    import shapely
+
+    if mesh_size <= 0:
+        raise ValueError("Fiber mesh size must be positive")
+    min_x, min_y, max_x, max_y = polygon.bounds
+    xs = np.arange(min_x, max_x, mesh_size)
+    ys = np.arange(min_y, max_y, mesh_size)
+    x0, y0 = (a.ravel() for a in np.meshgrid(xs, ys, indexing='ij'))
+    cells = shapely.box(x0, y0, np.minimum(x0 + mesh_size, max_x), np.minimum(y0 + mesh_size, max_y))
+    shapely.prepare(polygon)
+    inside = shapely.contains(polygon, cells)
+    boundary = ~inside & shapely.intersects(polygon, cells)
+    cells[boundary] = shapely.intersection(cells[boundary], polygon)
+    cells = cells[inside | boundary]
+    area = shapely.area(cells)
+    keep = area > 0
+    centroids = shapely.get_coordinates(shapely.centroid(cells[keep]))
+    return centroids[:, 0], centroids[:, 1], area[keep]
+
+
+# Concrete meshes per section and mesh size, dropped with the section
+_mesh_cache = weakref.WeakKeyDictionary()
+
+
+def fiber_mesh(section_data, mesh_size=None):
+    """
+    Concrete fibers of a section (mm, mm^2), meshed once per section and
+    mesh size.
+
+    Args:
+        section_data: SectionData object
+        mesh_size: Cell size in mm (default: 1/20 of the smaller bounding box side)
+
+    Returns:
+        Tuple (x, y, area) of arrays
+    """
+    from shapely import affinity
+
+    scale = section_data.length_scale
+    if mesh_size is None:
+        min_x, min_y, max_x, max_y = section_data.polygon.bounds
+        mesh_size = min(max_x - min_x, max_y - min_y) * scale / 20
+    meshes = _mesh_cache.setdefault(section_data, {})
+    key = (float(mesh_size), scale)
+    if key not in meshes:
+        polygon = affinity.scale(section_data.polygon, scale, scale, origin=(0, 0))
+        meshes[key] = mesh_polygon(polygon, mesh_size)
+    return meshes[key]
+
+
+class FiberSection:
+    """
+    Fiber model of a section: fixed fiber arrays plus concrete and steel laws.
+    """
+    def __init__(self, section_data, mesh_size=None, concrete=None, steel=None):
+        """
+        Args:
+            section_data: SectionData object
+            mesh_size: Concrete cell size in mm (see fiber_mesh)
+            concrete: Concrete law with stress()/tangent() (default: HognestadConcrete(fc))
+            steel: Steel law for the rebars (default: BilinearSteel with the
+                rebars' fy, fu from the material catalog and Es)
+        """
+        arrays = section_data.arrays
+        self.section_data = section_data
+        self.concrete = HognestadConcrete(arrays.fc) if concrete is None else concrete
+        self.steel = BilinearSteel(arrays.rebar_fy, arrays.rebar_fu, arrays.Es) if steel is None else steel
+        self.origin = np.asarray(section_origin(section_data)) * section_data.length_scale
+        x, y, area = fiber_mesh(section_data, mesh_size)
+        # Rows [1, y - y0, x - x0] map (eps0, kx, ky) to fiber strains and forces to (P, Mx, My)
+        self.concrete_area = area
+        self.concrete_matrix = np.column_stack([np.ones_like(x), y - self.origin[1], x - self.origin[0]])
+        self.rebar_area = arrays.rebar_area
+        self.rebar_matrix = np.column_stack([np.ones(arrays.n_rebars),
+                                             arrays.rebar_y - self.origin[1],
+                                             arrays.rebar_x - self.origin[0]])
+
+    @property
+    def n_fibers(self):
+        return len(self.concrete_area) + len(self.rebar_area)
+
+    def strains(self, state):
+        """
+        Concrete and rebar fiber strains of strain states (eps0, kx, ky).
+
+        Args:
+            state: (3,) or (n, 3) array, curvatures in 1/mm
+
+        Returns:
+            Tuple of (..., n_concrete) and (..., n_rebars) arrays
+        """
+        state = np.asarray(state, dtype=float)
+        return state @ self.concrete_matrix.T, state @ self.rebar_matrix.T
+
+    def resultants(self, state):
+        """
+        (P, Mx, My) of strain states, in N and N*mm (compression positive,
+        moments as in InteractionSurface).
+
+        Args:
+            state: (3,) or (n, 3) array of (eps0, kx, ky)
+
+        Returns:
+            (3,) or (n, 3) array
+        """
+        concrete_strain, rebar_strain = self.strains(state)
+        return ((self.concrete.stress(concrete_strain) * self.concrete_area) @ self.concrete_matrix
+                + (self.steel.stress(rebar_strain) * self.rebar_area) @ self.rebar_matrix)
+
+    def tangent(self, state):
+        """
+        Section tangent stiffness d(P, Mx, My) / d(eps0, kx, ky) of one
+        strain state.
+
+        Returns:
+            Tuple (resultants, (3, 3) stiffness matrix)
+        """
+        concrete_strain, rebar_strain = self.strains(state)
+        concrete_forces = self.concrete.stress(concrete_strain) * self.concrete_area
+        rebar_forces = self.steel.stress(rebar_strain) * self.rebar_area
+        resultants = concrete_forces @ self.concrete_matrix + rebar_forces @ self.rebar_matrix
+        concrete_stiffness = self.concrete.tangent(concrete_strain) * self.concrete_area
+        rebar_stiffness = self.steel.tangent(rebar_strain) * self.rebar_area
+        stiffness = ((self.concrete_matrix.T * concrete_stiffness) @ self.concrete_matrix
+                     + (self.rebar_matrix.T * rebar_stiffness) @ self.rebar_matrix)
+        return resultants, stiffness
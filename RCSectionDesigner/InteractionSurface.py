@@ -0,0 +1,241 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+from RCSectionDesigner.units import Q_, conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+from RCSectionDesigner.compressionBlock import clip_half_plane
+from RCSectionDesigner.instrumentation import metrics, GEOMETRY_CUT, CONCRETE_RESULTANT, REBAR_RESULTANTS, \
+    UNIT_CONVERSION
+
+
+def section_origin(section_data):
+    """
+    Reference point used for rotation and for the moments (bounding box
+    center of the concrete outline, same as origin='center' in rotate_section).
+    """
+    min_x, min_y, max_x, max_y = section_data.polygon.bounds
+    return (min_x + max_x) / 2, (min_y + max_y) / 2
+
+
+def bending_directions(angles):
+    """
+    Unit vectors (in the unrotated section frame) pointing to the extreme
+    compression fiber for each rotation angle.
+
+    Rotating the section by `angle` degrees (counter-clockwise, as in
+    SectionData.rotate_section) and compressing the top (+y) is the same as
+    compressing the direction (sin(angle), cos(angle)) of the original section.
+
+    Args:
+        angles: Array of angles in degrees
+
+    Returns:
+        (n_angles, 2) array of unit vectors
+    """
+    theta = np.radians(np.asarray(angles, dtype=float))
+    return np.column_stack([np.sin(theta), np.cos(theta)])
+
+
+def section_heights(section_data, angles):
+    """
+    Depth of the rotated section (extreme compression to extreme tension
+    fiber of the concrete) for each angle, in section length units.
+    """
+    origin = np.asarray(section_origin(section_data))
+    vertices = np.asarray(section_data.polygon.exterior.coords) - origin
+    proj = bending_directions(angles) @ vertices.T
+    return proj.max(axis=1) - proj.min(axis=1)
+
+
+def default_depths(section_data, angles, n_points=config.ANALYSIS_POINTS):
+    """
+    Neutral-axis depths for each angle: 0 (pure tension, every bar yielding
+    in tension), n_points - 2 depths from 0.05 to 3 times the rotated
+    section height, and inf (pure compression, uniform strain_max), so every
+    angle slice reaches both ends of the axial capacity range.
+
+    Returns:
+        (n_angles, n_points) array of depths measured from the extreme
+        compression fiber (in section length units)
+    """
+    if n_points < 3:
+        raise ValueError("default_depths: n_points must be at least 3")
+    height = section_heights(section_data, angles)
+    ratios = np.concatenate([[0.0], np.linspace(0.05, 3.0, n_points - 2), [np.inf]])
+    return height[:, None] * ratios[None, :]
+
+
+def bar_strains(top, bar_proj, depths, strain_max):
+    """
+    Linear strains at the bars for every angle x depth, including the limits
+    depth 0 (infinite tension below the extreme fiber) and depth inf
+    (uniform strain_max).
+
+    Args:
+        top: (n_angles,) projection of the extreme compression fiber
+        bar_proj: (n_angles, n_bars) projections of the bars
+        depths: (n_angles, n_depths) neutral-axis depths (same length unit)
+
+    Returns:
+        (n_angles, n_depths, n_bars) array of strains
+    """
+    distance = top[:, None, None] - bar_proj[:, None, :]
+    c = depths[:, :, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(c > 0, distance / c, np.where(distance > 0, np.inf, 0.0))
+    return strain_max * (1 - ratio)
+
+
+def block_cuts(top, bottom, beta1, depths):
+    """
+    Offsets of the stress block edge for every angle x depth. A block deeper
+    than the section (or of infinite depth) is cut at its bottom fiber,
+    which leaves the whole section in compression.
+
+    Args:
+        top, bottom: (n_angles,) projections of the extreme fibers
+        depths: (n_angles, n_depths) neutral-axis depths
+
+    Returns:
+        (n_angles, n_depths) array of cut offsets
+    """
+    return np.maximum(top[:, None] - beta1 * depths, bottom[:, None])
+
+
+def compute_pmm(section_data, angles, depths, strain_max=config.STRAIN_COMPRESSION_MAX, workers=None):
+    """
+    Batched P-Mx-My evaluation for all (angle, neutral-axis depth) cases.
+
+    Uses the same model as StrainCompatibility (linear strain with
+    `strain_max` at the extreme compression fiber, elastic-perfectly plastic
+    rebars and an equivalent block of depth beta1 * c), but computes all
+    rebars x all cases in one array pass.
+
+    Args:
+        section_data: SectionData object
+        angles: (n_angles,) rotation angles in degrees
+        depths: (n_depths,) or (n_angles, n_depths) neutral-axis depths from
+            the extreme compression fiber, in section length units (0 and
+            inf give the pure tension and pure compression points)
+        workers: Number of threads evaluating contiguous slices of angles
+            (default: one). The section is only read, each slice projects
+            its own geometry, and every angle row is computed exactly as in
+            the serial call, so the results are identical.
+
+    Returns:
+        Tuple (P, Mx, My) of (n_angles, n_depths) float arrays in the internal
+        unit system: P in N (compression positive); Mx = sum(F * (y - y0)) and
+        My = sum(F * (x - x0)) in N*mm about the section origin (x0, y0).
+    """
+    angles = np.atleast_1d(np.asarray(angles, dtype=float))
+    depths = np.asarray(depths, dtype=float)
+    if depths.ndim == 1:
+        depths = np.broadcast_to(depths, (len(angles), len(depths)))
+
+    workers = min(workers or 1, len(angles))
+    if workers > 1:
+        # NumPy releases the GIL in the array kernels, so slices run concurrently
+        slices = np.array_split(np.arange(len(angles)), workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(lambda rows: compute_pmm(section_data, angles[rows], depths[rows], strain_max),
+                                  slices))
+        return tuple(np.concatenate([part[k] for part in parts]) for k in range(3))
+
+    # Array view of the section: geometry in mm, materials in MPa / mm^2
+    arrays = section_data.arrays
+    scale = section_data.length_scale
+    fc = arrays.fc
+    Es = arrays.Es
+    fy = arrays.rebar_fy
+    area = arrays.rebar_area
+    b1 = beta1_MPa(fc)
+    origin = np.asarray(section_origin(section_data)) * scale
+    d = bending_directions(angles)
+    depths = depths * scale
+
+    vertex_proj, bar_proj = arrays.project(d, origin)  # (n_angles, n_vertices / n_bars)
+    top = vertex_proj.max(axis=1)
+    bars = arrays.rebar_xy - origin
+
+    metrics.count('pmm_cases', depths.size)
+
+    # Rebar strains/forces for every angle x depth x bar
+    with metrics.stage(REBAR_RESULTANTS):
+        strain = bar_strains(top, bar_proj, depths, strain_max)
+        stress = np.clip(strain * Es, -fy, fy)
+        force = stress * area
+        P_s = force.sum(axis=2)
+        Mx_s = force @ bars[:, 1]
+        My_s = force @ bars[:, 0]
+
+    # Concrete compression block
+    cut = block_cuts(top, vertex_proj.min(axis=1), b1, depths)
+    n_a, n_d = depths.shape
+    with metrics.stage(GEOMETRY_CUT):
+        zone_area, Sx, Sy = clip_half_plane(arrays.edges, origin, np.repeat(d, n_d, axis=0), cut.ravel())
+    with metrics.stage(CONCRETE_RESULTANT):
+        Cc = (zone_area * fc).reshape(n_a, n_d)
+        Mx_c = (Sx * fc).reshape(n_a, n_d)
+        My_c = (Sy * fc).reshape(n_a, n_d)
+
+    return P_s + Cc, Mx_s + Mx_c, My_s + My_c
+
+
+class InteractionSurface:
+    """
+    3D P-Mx-My interaction surface of a section, computed in one batched call.
+    """
+    def __init__(self, section_data, angles=None, depths=None,
+                 strain_max=config.STRAIN_COMPRESSION_MAX, cache=None, workers=None):
+        """
+        Args:
+            section_data: SectionData object
+            angles: Rotation angles in degrees (default: 0-360 every 10 degrees)
+            depths: Neutral-axis depths, (n_depths,) or (n_angles, n_depths)
+                (default: default_depths with config.ANALYSIS_POINTS points)
+            cache: Optional SurfaceCache to reuse surfaces of unchanged sections
+            workers: Threads sharing the angle sweep (see compute_pmm)
+        """
+        if angles is None:
+            angles = np.arange(0, 360, 10)
+        self.section_data = section_data
+        self.angles = np.atleast_1d(np.asarray(angles, dtype=float))
+        if depths is None:
+            depths = default_depths(section_data, self.angles)
+        depths = np.asarray(depths, dtype=float)
+        if depths.ndim == 1:
+            depths = np.broadcast_to(depths, (len(self.angles), len(depths)))
+        self.depths = depths
+        self.origin = section_origin(section_data)
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+        if cache is None:
+            P, Mx, My = compute_pmm(section_data, self.angles, self.depths, strain_max, workers)
+        else:
+            P, Mx, My = cache.get_or_compute(section_data, self.angles, self.depths, strain_max, workers)
+        # Plain arrays in the section's force_unit / moment_unit
+        with metrics.stage(UNIT_CONVERSION):
+            force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+            moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+            self.P = P * force_factor
+            self.Mx = Mx * moment_factor
+            self.My = My * moment_factor
+
+    def points(self):
+        """
+        Surface points as an (n, 3) array of (P, Mx, My).
+        """
+        return np.column_stack([self.P.ravel(), self.Mx.ravel(), self.My.ravel()])
+
+    def quantities(self):
+        """
+        Surface results as pint Quantities.
+
+        Returns:
+            Dictionary with 'P', 'Mx' and 'My' Quantity arrays
+        """
+        return {'P': Q_(self.P, self.force_unit.units),
+                'Mx': Q_(self.Mx, self.moment_unit.units),
+                'My': Q_(self.My, self.moment_unit.units)}
@@ -0,0 +1,311 @@
+"""
+Search for the lightest perimeter rebar layout that carries a demand set.
+
+Candidates are (bar size, grade, bar count) combinations from the material
+catalog. Bars are placed along the outline offset inward by the cover plus
+half a bar diameter: one bar at every corner, the rest spread over the sides
+in proportion to their length. Candidates are first pruned by cheap bounds
+(steel ratio limits, pure compression and pure tension capacity, clear bar
+spacing) and the survivors are checked in order of increasing steel area,
+so the search stops at the first batch that contains a passing layout.
+
+All candidates share the outline and fc, so the concrete block contribution
+of every (angle, depth) case is computed once; a candidate only adds its
+bar forces before the D/C check with CapacityChecker.
+"""
+
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.CapacityCheck import CapacityChecker
+from RCSectionDesigner.InteractionSurface import bar_strains, bending_directions, block_cuts, default_depths, \
+    section_origin
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+from RCSectionDesigner.compressionBlock import clip_half_plane
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+def perimeter_layout(polygon, count, offset, corner_angle=30.0):
+    """
+    Bar positions along a polygon outline offset inward.
+
+    Args:
+        polygon: shapely Polygon
+        count: Number of bars
+        offset: Inward offset of the bar centers from the outline
+        corner_angle: Minimum turning angle (degrees) of a vertex that gets a corner bar
+
+    Returns:
+        (count, 2) array of bar centers, or None if the bars do not fit
+        (offset outline empty or split, fewer bars than corners)
+    """
+    from shapely.geometry import Polygon
+    from shapely.geometry.polygon import orient
+
+    inner = polygon.buffer(-offset, join_style='mitre')
+    if inner.is_empty or not isinstance(inner, Polygon):
+        return None
+    ring = np.asarray(orient(inner, sign=1.0).exterior.coords)[:-1, :2]
+    incoming = ring - np.roll(ring, 1, axis=0)
+    outgoing = np.roll(ring, -1, axis=0) - ring
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+    turn = np.degrees(np.abs(np.arctan2(cross, (incoming * outgoing).sum(axis=1))))
+    corners = np.flatnonzero(turn >= corner_angle)
+    if count < len(corners):
+        return None
+    if len(corners) == 0:
+        corners = np.array([0])
+        n_corner_bars = 0  # smooth outline: spread all bars evenly, starting at vertex 0
+    else:
+        n_corner_bars = len(corners)
+
+    # Cumulative arc length around the ring, starting at the first corner
+    ring = np.roll(ring, -corners[0], axis=0)
+    corners = corners - corners[0]
+    closed = np.vstack([ring, ring[:1]])
+    arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(closed, axis=0).T))])
+    bounds = np.append(arc[corners], arc[-1])
+    sides = np.diff(bounds)
+
+    # Distribute the remaining bars over the sides (largest remainder)
+    remaining = count - n_corner_bars
+    share = remaining * sides / sides.sum()
+    per_side = np.floor(share).astype(int)
+    per_side[np.argsort(per_side - share)[:remaining - per_side.sum()]] += 1
+
+    stations = [bounds[:-1]] if n_corner_bars else []
+    for start, length, n in zip(bounds[:-1], sides, per_side):
+        if n:
+            fractions = np.arange(1, n + 1) / (n + 1) if n_corner_bars else np.arange(n) / n
+            stations.append(start + length * fractions)
+    stations = np.sort(np.concatenate(stations)) if stations else np.empty(0)
+    return np.column_stack([np.interp(stations, arc, closed[:, 0]), np.interp(stations, arc, closed[:, 1])])
+
+
+class _CandidateSurface:
+    # The part of InteractionSurface that CapacityChecker uses
+    def __init__(self, P, Mx, My, force_unit, moment_unit):
+        self.P, self.Mx, self.My = P, Mx, My
+        self.force_unit = force_unit
+        self.moment_unit = moment_unit
+
+    def points(self):
+        return np.column_stack([self.P.ravel(), self.Mx.ravel(), self.My.ravel()])
+
+
+class LayoutOptimizer:
+    """
+    Lightest passing perimeter layout for a concrete outline and demand set.
+
+    The outline, fc and units come from a SectionData; its own rebars are
+    ignored.
+    """
+    def __init__(self, section_data, cover=40.0, sizes=None, grades=None, counts=range(4, 41),
+                 rho_min=0.01, rho_max=0.08, min_clear_spacing=40.0,
+                 angles=None, strain_max=config.STRAIN_COMPRESSION_MAX, workers=None, batch_size=16):
+        """
+        Args:
+            section_data: SectionData giving the outline, fc and units
+            cover: Clear cover to the bar surface (length_unit)
+            sizes, grades: Catalog names to try (default: all in the material catalog)
+            counts: Bar counts to try
+            rho_min, rho_max: Allowed steel ratio As / Ag
+            min_clear_spacing: Minimum clear distance between bars (length_unit)
+            angles: Bending angles of the surfaces (default: 0-360 every 10 degrees)
+            strain_max: Concrete strain at the extreme compression fiber
+            workers: Threads checking candidates in parallel (default: one)
+            batch_size: Candidates checked per round before testing for a pass
+        """
+        catalog = section_data.material_catalog
+        self.section_data = section_data
+        self.cover = cover
+        self.sizes = list(catalog.sizes) if sizes is None else list(sizes)
+        self.grades = list(catalog.grades) if grades is None else list(grades)
+        catalog.check(self.grades, self.sizes)
+        if not catalog.compatible(np.array(self.grades)[:, None], np.array(self.sizes)[None, :]).any():
+            raise ValueError(f"Layout optimizer: no grade in {self.grades} is made in any size in {self.sizes}")
+        self.counts = list(counts)
+        self.rho_min, self.rho_max = rho_min, rho_max
+        self.min_clear_spacing = min_clear_spacing
+        self.angles = np.arange(0, 360, 10.0) if angles is None else np.asarray(angles, dtype=float)
+        self.strain_max = strain_max
+        self.workers = workers
+        self.batch_size = batch_size
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+        self._layouts = {}
+        self._prepare_concrete()
+
+    def _prepare_concrete(self):
+        # Concrete block resultants shared by every candidate (N, N*mm)
+        section_data = self.section_data
+        arrays = section_data.arrays
+        scale = section_data.length_scale
+        self._origin = np.asarray(section_origin(section_data)) * scale
+        self._directions = bending_directions(self.angles)
+        self.depths = default_depths(section_data, self.angles)
+        self._depths_mm = self.depths * scale
+        vertex_proj, _ = arrays.project(self._directions, self._origin)
+        self._top = vertex_proj.max(axis=1)
+        n_a, n_d = self._depths_mm.shape
+        cut = block_cuts(self._top, vertex_proj.min(axis=1), beta1_MPa(arrays.fc), self._depths_mm)
+        area, Sx, Sy = clip_half_plane(arrays.edges, self._origin,
+                                       np.repeat(self._directions, n_d, axis=0), cut.ravel())
+        self._concrete = tuple(values.reshape(n_a, n_d) * arrays.fc for values in (area, Sx, Sy))
+        self.gross_area = section_data.polygon.area * scale**2
+
+    def layout(self, size, count):
+        """
+        Bar centers (length_unit) of a size and count, or None if they do not
+        fit or violate the clear spacing. Cached per (size, count).
+        """
+        key = (size, count)
+        if key not in self._layouts:
+            diameter = self.section_data.material_catalog.size(size)['diameter']
+            scale = self.section_data.length_scale
+            bars = perimeter_layout(self.section_data.polygon, count, self.cover + diameter / 2 / scale)
+            if bars is not None and count > 1:
+                gap = np.hypot(*(bars[:, None, :] - bars[None, :, :]).transpose(2, 0, 1))
+                np.fill_diagonal(gap, np.inf)
+                if gap.min() * scale - diameter < self.min_clear_spacing * scale:
+                    bars = None
+            self._layouts[key] = bars
+        return self._layouts[key]
+
+    def candidates(self, Pu):
+        """
+        All (size, grade, count) candidates with the bounds that prune them,
+        limited to grades made in that size (see MaterialCatalog.compatible).
+
+        Args:
+            Pu: Axial demands in force_unit
+
+        Returns:
+            Dictionary of arrays: 'size', 'grade', 'count', 'steel_area' (mm^2),
+            'fy' (MPa), 'P0' / 'T0' (pure compression / tension capacity in
+            force_unit) and 'feasible' (passes the bounds)
+        """
+        catalog = self.section_data.material_catalog
+        size, grade, count = (np.array(values).ravel() for values in
+                              np.meshgrid(np.array(self.sizes, dtype=object), np.array(self.grades, dtype=object),
+                                          np.array(self.counts), indexing='ij'))
+        compatible = catalog.compatible(grade.astype(str), size.astype(str))
+        size, grade, count = size[compatible], grade[compatible], count[compatible].astype(int)
+        fy, _, bar_area = catalog.rebar_arrays(grade.astype(str), size.astype(str))
+        steel_area = bar_area * count
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        P0 = (self.section_data.arrays.fc * self.gross_area + steel_area * fy) * force_factor
+        T0 = -steel_area * fy * force_factor
+        rho = steel_area / self.gross_area
+        Pu = np.atleast_1d(np.asarray(Pu, dtype=float))
+        feasible = ((rho >= self.rho_min) & (rho <= self.rho_max)
+                    & (P0 >= Pu.max()) & (T0 <= Pu.min()))
+        return {'size': size, 'grade': grade, 'count': count, 'steel_area': steel_area,
+                'fy': fy, 'P0': P0, 'T0': T0, 'feasible': feasible}
+
+    def surface(self, bars, bar_area, fy):
+        """
+        Interaction surface of the outline with the given bars, reusing the
+        shared concrete contributions.
+
+        Args:
+            bars: (n, 2) bar centers in length_unit
+            bar_area: Area of each bar (mm^2)
+            fy: Yield strength of each bar (MPa)
+
+        Returns:
+            Object with P, Mx, My (force_unit / moment_unit) and points(),
+            usable with CapacityChecker
+        """
+        arrays = self.section_data.arrays
+        xy = np.asarray(bars, dtype=float) * self.section_data.length_scale - self._origin
+        bar_proj = self._directions @ xy.T  # (n_angles, n_bars)
+        strain = bar_strains(self._top, bar_proj, self._depths_mm, self.strain_max)
+        force = np.clip(strain * arrays.Es, -fy, fy) * bar_area
+        P_c, Mx_c, My_c = self._concrete
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+        return _CandidateSurface((force.sum(axis=2) + P_c) * force_factor,
+                                 (force @ xy[:, 1] + Mx_c) * moment_factor,
+                                 (force @ xy[:, 0] + My_c) * moment_factor,
+                                 self.force_unit, self.moment_unit)
+
+    def _check(self, candidate, Pu, Mux, Muy):
+        size, grade, count = candidate
+        bars = self.layout(size, count)
+        if bars is None:
+            return None
+        fy, _, bar_area = self.section_data.material_catalog.rebar_arrays([grade], [size])
+        surface = self.surface(bars, bar_area[0], fy[0])
+        try:
+            return float(CapacityChecker(surface).ratios(Pu, Mux, Muy).max())
+        except ValueError:  # surface does not enclose zero load
+            return None
+
+    def optimize(self, Pu, Mux, Muy, limit=1.0):
+        """
+        Lightest layout whose D/C ratio is at most `limit` for all demands.
+
+        Args:
+            Pu, Mux, Muy: Demands in force_unit / moment_unit (as in CapacityChecker)
+
+        Returns:
+            Dictionary with 'size', 'grade', 'count', bar 'diameter' (mm),
+            'steel_area' (mm^2),
+            'ratio', bar centers 'x', 'y' (length_unit) and search statistics
+            'candidates', 'pruned' (by the bounds), 'rejected' (layout does
+            not fit) and 'checked'; None as layout values if nothing passes
+        """
+        Pu, Mux, Muy = (np.atleast_1d(np.asarray(values, dtype=float)) for values in (Pu, Mux, Muy))
+        table = self.candidates(Pu)
+        feasible = np.flatnonzero(table['feasible'])
+        # Lightest first; among equal steel areas prefer the lower grade and fewer bars
+        order = feasible[np.lexsort((table['count'][feasible], table['fy'][feasible],
+                                     table['steel_area'][feasible]))]
+        stats = {'candidates': len(table['count']), 'pruned': len(table['count']) - len(order),
+                 'rejected': 0, 'checked': 0}
+        result = {'size': None, 'grade': None, 'count': None, 'diameter': None, 'steel_area': None,
+                  'ratio': None, 'x': None, 'y': None}
+
+        def check(candidate):
+            return self._check(candidate, Pu, Mux, Muy)
+
+        pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers and self.workers > 1 else None
+        try:
+            for start in range(0, len(order), self.batch_size):
+                batch = [(table['size'][i], table['grade'][i], table['count'][i])
+                         for i in order[start:start + self.batch_size]]
+                ratios = list(pool.map(check, batch)) if pool else [check(candidate) for candidate in batch]
+                stats['rejected'] += sum(ratio is None for ratio in ratios)
+                stats['checked'] += sum(ratio is not None for ratio in ratios)
+                for i, ratio in zip(order[start:start + self.batch_size], ratios):
+                    if ratio is not None and ratio <= limit:
+                        bars = self.layout(table['size'][i], table['count'][i])
+                        size = table['size'][i]
+                        result.update(size=size, grade=table['grade'][i], count=int(table['count'][i]),
+                                      diameter=self.section_data.material_catalog.size(size)['diameter'],
+                                      steel_area=float(table['steel_area'][i]),
+                                      ratio=ratio, x=bars[:, 0], y=bars[:, 1])
+                        return {**result, **stats}
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return {**result, **stats}
+
+
+def write_layout(filepath, result):
+    """
+    Write an optimized layout as a rebar coordinate CSV
+    (RebarID, X, Y, Diameter, Size, Grade), readable by SectionData.
+    """
+    if result['size'] is None:
+        raise ValueError("No passing layout to write")
+    diameter = result['diameter']
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['RebarID', 'X', 'Y', 'Diameter', 'Size', 'Grade'])
+        for i, (x, y) in enumerate(zip(result['x'], result['y']), start=1):
+            writer.writerow([f'R{i}', repr(float(x)), repr(float(y)), f'{diameter:g}', result['size'], result['grade']])
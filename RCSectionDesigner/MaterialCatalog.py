@@ -0,0 +1,139 @@
+import csv
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+
+
+# Bar type implied by the name prefix of a size or grade (TIS 20 / TIS 24):
+# round bars RB / SR and deformed bars DB / SD
+SIZE_BAR_TYPES = {'RB': 'round', 'DB': 'deformed'}
+GRADE_BAR_TYPES = {'SR': 'round', 'SD': 'deformed'}
+
+
+def _read_rows(filepath):
+    with open(filepath, newline='') as file:
+        # Skip blank/incomplete lines, same as DataFrame.dropna() on the CSV
+        return [row for row in csv.DictReader(file) if all(value not in (None, '') for value in row.values())]
+
+
+class MaterialCatalog:
+    """
+    Rebar grade and bar size tables indexed by name.
+
+    A catalog is plain lookup data (MPa, mm, mm^2), so one instance can be
+    shared by any number of SectionData objects.
+    """
+    def __init__(self, grades, sizes, source=None):
+        """
+        Args:
+            grades: Dictionary grade -> {'fy': MPa, 'fu': MPa}
+            sizes: Dictionary size -> {'diameter': mm, 'area': mm^2}
+            source: Optional description of where the tables came from
+        """
+        self.grades = {str(name): {'fy': float(prop['fy']), 'fu': float(prop['fu'])}
+                       for name, prop in grades.items()}
+        self.sizes = {str(name): {'diameter': float(prop['diameter']), 'area': float(prop['area'])}
+                      for name, prop in sizes.items()}
+        self.source = source
+
+    @classmethod
+    def from_files(cls, grade_filepath, size_filepath):
+        """
+        Read the grade table (Grade, Yield_Strength_MPa, Tensile_Strength_MPa)
+        and the bar size table (Size, Dia(mm.), Area(mm2.)).
+        """
+        grades = {row['Grade']: {'fy': row['Yield_Strength_MPa'], 'fu': row['Tensile_Strength_MPa']}
+                  for row in _read_rows(grade_filepath)}
+        sizes = {row['Size']: {'diameter': row['Dia(mm.)'], 'area': row['Area(mm2.)']}
+                 for row in _read_rows(size_filepath)}
+        return cls(grades, sizes, source=(grade_filepath, size_filepath))
+
+    @property
+    def fingerprint(self):
+        """
+        Content hash of the tables; changes whenever any grade or size entry changes.
+        """
+        content = repr((sorted(self.grades.items()), sorted(self.sizes.items())))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def check(self, grades=(), sizes=()):
+        """
+        Raise ValueError listing every grade or size that is not in the catalog.
+        """
+        unknown_grades = sorted(set(map(str, grades)) - self.grades.keys())
+        unknown_sizes = sorted(set(map(str, sizes)) - self.sizes.keys())
+        messages = []
+        if unknown_grades:
+            messages.append(f"unknown rebar grade(s) {unknown_grades} (known: {sorted(self.grades)})")
+        if unknown_sizes:
+            messages.append(f"unknown bar size(s) {unknown_sizes} (known: {sorted(self.sizes)})")
+        if messages:
+            raise ValueError("Material catalog: " + "; ".join(messages))
+
+    def compatible(self, grades, sizes):
+        """
+        Whether each grade is made in each bar size: round grades (SR) only
+        as round bars (RB) and deformed grades (SD) only as deformed bars
+        (DB). Names without a known prefix are compatible with anything.
+
+        Args:
+            grades, sizes: Grade and size names (broadcast against each other)
+
+        Returns:
+            Boolean array
+        """
+        grades, sizes = np.broadcast_arrays(np.asarray(grades, dtype=str), np.asarray(sizes, dtype=str))
+        grade_type = np.array([GRADE_BAR_TYPES.get(name[:2].upper(), '') for name in grades.ravel()])
+        size_type = np.array([SIZE_BAR_TYPES.get(name[:2].upper(), '') for name in sizes.ravel()])
+        return ((grade_type == size_type) | (grade_type == '') | (size_type == '')).reshape(grades.shape)
+
+    def grade(self, name):
+        self.check(grades=[name])
+        return self.grades[str(name)]
+
+    def size(self, name):
+        self.check(sizes=[name])
+        return self.sizes[str(name)]
+
+    def rebar_arrays(self, grades, sizes):
+        """
+        Material arrays for a list of rebars, looked up once per distinct name.
+
+        Args:
+            grades: Sequence of grade names, one per rebar
+            sizes: Sequence of bar size names, one per rebar
+
+        Returns:
+            Tuple (fy, fu, area) of arrays in MPa, MPa and mm^2
+        """
+        grades = np.asarray(grades, dtype=str)
+        sizes = np.asarray(sizes, dtype=str)
+        self.check(grades, sizes)
+        grade_names, grade_index = np.unique(grades, return_inverse=True)
+        size_names, size_index = np.unique(sizes, return_inverse=True)
+        fy = np.array([self.grades[name]['fy'] for name in grade_names])[grade_index]
+        fu = np.array([self.grades[name]['fu'] for name in grade_names])[grade_index]
+        area = np.array([self.sizes[name]['area'] for name in size_names])[size_index]
+        return fy.reshape(grades.shape), fu.reshape(grades.shape), area.reshape(sizes.shape)
+
+
+@lru_cache(maxsize=None)
+def _load_catalog(grade_filepath, size_filepath):
+    return MaterialCatalog.from_files(grade_filepath, size_filepath)
+
+
+def load_catalog(grade_filepath=None, size_filepath=None):
+    """
+    Process-wide catalog for a pair of table files (read once per process).
+
+    Args:
+        grade_filepath: Rebar grade CSV (default: config.REBAR_GRADE_FILE)
+        size_filepath: Bar size CSV (default: config.REBAR_SECTION_PROPERTY_FILE)
+    """
+    # config reads its grade table through this module, so import it lazily
+    from RCSectionDesigner import config
+    grade_filepath = os.path.abspath(grade_filepath or config.REBAR_GRADE_FILE)
+    size_filepath = os.path.abspath(size_filepath or config.REBAR_SECTION_PROPERTY_FILE)
+    return _load_catalog(grade_filepath, size_filepath)
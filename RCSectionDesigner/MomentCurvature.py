@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+
+from RCSectionDesigner.InteractionSurface import bending_directions
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+class MomentCurvature:
+    """
+    Moment-curvature analysis of a fiber section at constant axial load.
+
+    The curvature acts about the neutral axis of a bending angle (compression
+    towards bending_directions(angle), as in the interaction surface). At
+    every curvature step the axial strain eps0 is solved for P(eps0) = P by
+    Newton iteration on the analytic tangent dP/deps0, starting from the
+    previous steps' solution extrapolated linearly.
+    """
+    def __init__(self, fiber_section, tol=1e-8, max_iterations=30):
+        """
+        Args:
+            fiber_section: FiberSection object
+            tol: Axial force tolerance relative to the squash load
+            max_iterations: Newton iterations per step before giving up
+        """
+        self.fiber_section = fiber_section
+        self.tol = tol
+        self.max_iterations = max_iterations
+        section_data = fiber_section.section_data
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+        self.length_scale = section_data.length_scale
+        arrays = section_data.arrays
+        # Force scale of the tolerance: peak concrete stress over the gross area plus yielded steel
+        eps_cu = getattr(fiber_section.concrete, 'eps_cu', 0.0035)
+        peak = fiber_section.concrete.stress(np.linspace(0, eps_cu, 101)).max()
+        self.squash_load = peak * fiber_section.concrete_area.sum() + (arrays.rebar_fy * arrays.rebar_area).sum()
+
+    def _solve_axial(self, P_target, curvature_state, eps0):
+        # Newton on eps0 with the curvature terms fixed; halves steps that do not reduce the residual
+        section = self.fiber_section
+        state = curvature_state.copy()
+        state[0] = eps0
+        resultants, stiffness = section.tangent(state)
+        residual = resultants[0] - P_target
+        tolerance = self.tol * self.squash_load
+        for iteration in range(1, self.max_iterations + 1):
+            if abs(residual) <= tolerance:
+                return state, resultants, stiffness, iteration - 1, True
+            slope = stiffness[0, 0]
+            step = -residual / slope if slope > 0 else -np.sign(residual) * 1e-4
+            for _ in range(20):
+                trial = state.copy()
+                trial[0] += step
+                trial_resultants, trial_stiffness = section.tangent(trial)
+                trial_residual = trial_resultants[0] - P_target
+                if abs(trial_residual) < abs(residual):
+                    break
+                step /= 2
+            state, resultants, stiffness, residual = trial, trial_resultants, trial_stiffness, trial_residual
+        return state, resultants, stiffness, self.max_iterations, abs(residual) <= tolerance
+
+    def analyse(self, P=0.0, angle=0.0, curvatures=None, n_steps=200, max_curvature=None):
+        """
+        Moment-curvature curve at a constant axial load.
+
+        The curve ends at the last converged step before the extreme
+        concrete fiber passes the concrete law's eps_cu (or a rebar passes
+        the steel law's eps_su, if it has one).
+
+        Args:
+            P: Axial load in force_unit (compression positive)
+            angle: Bending angle in degrees
+            curvatures: Increasing curvatures in 1/length_unit (default:
+                n_steps values from 0 to max_curvature)
+            max_curvature: Last curvature of the default steps (default:
+                eps_cu / (0.05 * section depth))
+
+        Returns:
+            Dictionary of per-step arrays: 'curvature' (1/length_unit),
+            'eps0' (axial strain at the section origin), 'top_strain',
+            'P' (force_unit), 'Mx', 'My', 'M' (moment about the neutral axis
+            direction, moment_unit), 'EI' (tangent flexural stiffness
+            dM/dcurvature, moment_unit * length_unit), 'iterations',
+            'seconds'; plus 'converged' and the 'termination' reason
+        """
+        section = self.fiber_section
+        arrays = section.section_data.arrays
+        d = bending_directions([angle])[0]
+        projection = (arrays.vertices - section.origin) @ d
+        top, bottom = projection.max(), projection.min()
+        bar_projection = (arrays.rebar_xy - section.origin) @ d
+        eps_cu = getattr(section.concrete, 'eps_cu', np.inf)
+        eps_su = getattr(section.steel, 'eps_su', np.inf)
+        if curvatures is None:
+            if max_curvature is None:
+                max_curvature = eps_cu / (0.05 * (top - bottom)) * self.length_scale
+            curvatures = np.linspace(0, max_curvature, n_steps)
+        curvatures = np.asarray(curvatures, dtype=float)
+
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+        P_target = P / force_factor
+        # strain = eps0 + phi * (d . (r - r0)) -> (eps0, kx, ky) = (eps0, phi * d_y, phi * d_x)
+        direction_state = np.array([0.0, d[1], d[0]])
+
+        rows = []
+        converged = True
+        termination = 'completed'
+        previous = []
+        for phi_user in curvatures:
+            start = time.perf_counter()
+            phi = phi_user / self.length_scale
+            eps0 = 2 * previous[-1] - previous[-2] if len(previous) >= 2 else (previous[-1] if previous else 0.0)
+            state, resultants, stiffness, iterations, ok = self._solve_axial(P_target, phi * direction_state, eps0)
+            seconds = time.perf_counter() - start
+            if not ok:
+                converged = False
+                termination = 'no convergence'
+                break
+            top_strain = state[0] + phi * top
+            bar_strain = np.abs(state[0] + phi * bar_projection)
+            if top_strain > eps_cu:
+                termination = 'concrete crushing'
+                break
+            if len(bar_strain) and bar_strain.max() > eps_su:
+                termination = 'rebar rupture'
+                break
+            previous.append(state[0])
+            # Flexural tangent with the axial force held constant (eps0 condensed out)
+            k_bend = direction_state @ stiffness @ direction_state
+            k_cross = stiffness[0] @ direction_state
+            EI = k_bend - k_cross**2 / stiffness[0, 0] if stiffness[0, 0] > 0 else k_bend
+            rows.append((phi_user, state[0], top_strain, resultants[0] * force_factor,
+                         resultants[1] * moment_factor, resultants[2] * moment_factor,
+                         EI * moment_factor / self.length_scale, iterations, seconds))
+
+        columns = np.array(rows, dtype=float).reshape(-1, 9).T
+        result = dict(zip(['curvature', 'eps0', 'top_strain', 'P', 'Mx', 'My', 'EI', 'iterations', 'seconds'],
+                          columns))
+        result['M'] = d[1] * result['Mx'] + d[0] * result['My']
+        result['iterations'] = result['iterations'].astype(int)
+        result['converged'] = converged
+        result['termination'] = termination
+        return result
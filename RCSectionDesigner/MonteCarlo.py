@@ -0,0 +1,207 @@
+"""
+Monte Carlo capacity of a section with random materials and bar placement.
+
+Samples are never built as SectionData objects: every sample is a set of
+arrays (fc, an fy factor, bar coordinates) around the nominal section, and a
+chunk of samples x axial loads x angles is solved at once by batched
+bisection on the neutral-axis depth, with the same model as compute_pmm
+(elastic-perfectly plastic bars, stress block of depth beta1 * c). Chunks
+draw from their own child of a SeedSequence, so the results depend on the
+seed and chunk size only, not on the number of worker threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import bending_directions, section_origin
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+from RCSectionDesigner.compressionBlock import clip_half_plane
+from RCSectionDesigner.units import conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+def _lognormal(rng, mean, cov, size):
+    # Lognormal variates with the given mean and coefficient of variation
+    sigma = np.sqrt(np.log1p(cov**2))
+    return mean * rng.lognormal(-sigma**2 / 2, sigma, size)
+
+
+def _inward_normals(arrays):
+    # Direction that increases the cover of each bar by one unit on every face it is
+    # covered by: the sum of the inward normals of all edges within its nominal cover
+    # (distance to the nearest edge) plus one bar diameter, so corner bars move
+    # diagonally and intermediate bars square to their face
+    start, end = arrays.edges
+    edge = end - start
+    bars = arrays.rebar_xy
+    t = np.clip(((bars[:, None, :] - start) * edge).sum(axis=2) / (edge**2).sum(axis=1), 0, 1)
+    distance = np.hypot(*(start + t[:, :, None] * edge - bars[:, None, :]).transpose(2, 0, 1))
+    diameter = 2 * np.sqrt(arrays.rebar_area / np.pi)
+    covering = distance <= distance.min(axis=1, keepdims=True) + diameter[:, None]
+    # Edges are oriented with the material on their left
+    normals = np.column_stack([-edge[:, 1], edge[:, 0]]) / np.hypot(edge[:, 0], edge[:, 1])[:, None]
+    return covering.astype(float) @ normals
+
+
+class MonteCarloCapacity:
+    """
+    Distribution of the moment capacity at given axial loads.
+
+    Random variables per sample: fc (lognormal), one fy factor applied to
+    the catalog fy of all bars (lognormal), one cover deviation moving every
+    bar inward from every face it is covered by (normal), and an
+    independent placement error of each bar in x and y (normal).
+    """
+    def __init__(self, section_data, n_samples=10000, seed=None,
+                 fc_bias=1.0, fc_cov=0.15, fy_bias=1.0, fy_cov=0.07,
+                 cover_std=0.0, placement_std=0.0,
+                 strain_max=config.STRAIN_COMPRESSION_MAX, chunk_size=1000, workers=None):
+        """
+        Args:
+            section_data: Nominal SectionData object
+            n_samples: Number of samples
+            seed: Seed of the random generator (None: fresh entropy)
+            fc_bias, fc_cov: Mean / nominal ratio and coefficient of variation of fc
+            fy_bias, fy_cov: Mean / nominal ratio and coefficient of variation of fy
+            cover_std: Standard deviation of the cover (length_unit)
+            placement_std: Standard deviation of each bar's x and y (length_unit)
+            strain_max: Concrete strain at the extreme compression fiber
+            chunk_size: Samples evaluated together (bounds memory)
+            workers: Threads evaluating chunks in parallel (default: one)
+        """
+        self.section_data = section_data
+        self.n_samples = n_samples
+        # Every run re-spawns the chunk seeds from the same entropy
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.fc_bias, self.fc_cov = fc_bias, fc_cov
+        self.fy_bias, self.fy_cov = fy_bias, fy_cov
+        self.cover_std = cover_std
+        self.placement_std = placement_std
+        self.strain_max = strain_max
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+
+    def sample(self, rng, n):
+        """
+        Draw n samples.
+
+        Returns:
+            Dictionary with 'fc', 'beta1' (n,), 'fy' (n, n_bars) in MPa and bar
+            coordinates 'x', 'y' (n, n_bars) in mm
+        """
+        arrays = self.section_data.arrays
+        scale = self.section_data.length_scale
+        fc = _lognormal(rng, self.fc_bias * arrays.fc, self.fc_cov, n)
+        fy = _lognormal(rng, self.fy_bias, self.fy_cov, n)[:, None] * arrays.rebar_fy
+        cover = rng.normal(0.0, self.cover_std * scale, n) if self.cover_std else np.zeros(n)
+        normals = _inward_normals(arrays)
+        # Larger cover moves the bars inward
+        x = arrays.rebar_x + cover[:, None] * normals[:, 0]
+        y = arrays.rebar_y + cover[:, None] * normals[:, 1]
+        if self.placement_std:
+            x = x + rng.normal(0.0, self.placement_std * scale, x.shape)
+            y = y + rng.normal(0.0, self.placement_std * scale, y.shape)
+        return {'fc': fc, 'beta1': beta1_MPa(fc), 'fy': fy, 'x': x, 'y': y}
+
+    def _resultants(self, samples, case_sample, directions, top, depth):
+        # (P, Mx, My) in N / N*mm of flattened cases (sample index, direction, depth in mm)
+        arrays = self.section_data.arrays
+        origin = self._origin
+        fc = samples['fc'][case_sample]
+        bar_x = samples['x'][case_sample] - origin[0]
+        bar_y = samples['y'][case_sample] - origin[1]
+        fy = samples['fy'][case_sample]
+        bar_proj = directions[:, 0:1] * bar_x + directions[:, 1:2] * bar_y
+        strain = self.strain_max * (1 - (top[:, None] - bar_proj) / depth[:, None])
+        force = np.clip(strain * arrays.Es, -fy, fy) * arrays.rebar_area
+        b1 = samples['beta1'][case_sample]
+        area, Sx, Sy = clip_half_plane(arrays.edges, origin, directions, top - b1 * depth)
+        return (force.sum(axis=1) + area * fc,
+                (force * bar_y).sum(axis=1) + Sx * fc,
+                (force * bar_x).sum(axis=1) + Sy * fc)
+
+    def _run_chunk(self, seed, n, loads, angles, iterations):
+        rng = np.random.default_rng(seed)
+        samples = self.sample(rng, n)
+        arrays = self.section_data.arrays
+        d = bending_directions(angles)
+        vertex_proj, _ = arrays.project(d, self._origin)
+        top_a = vertex_proj.max(axis=1)
+        height = top_a - vertex_proj.min(axis=1)
+        # Cases ordered (sample, load, angle)
+        n_l, n_a = len(loads), len(angles)
+        case_sample = np.repeat(np.arange(n), n_l * n_a)
+        case_load = np.tile(np.repeat(np.arange(n_l), n_a), n)
+        case_angle = np.tile(np.arange(n_a), n * n_l)
+        directions, top = d[case_angle], top_a[case_angle]
+        target = loads[case_load]
+
+        # Bisection on log(depth); P grows monotonically with the depth
+        lo = np.log(1e-3 * height[case_angle])
+        hi = np.log(1e2 * height[case_angle])
+        P_lo = self._resultants(samples, case_sample, directions, top, np.exp(lo))[0]
+        P_hi = self._resultants(samples, case_sample, directions, top, np.exp(hi))[0]
+        feasible = (P_lo <= target) & (target <= P_hi)
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            P_mid = self._resultants(samples, case_sample, directions, top, np.exp(mid))[0]
+            below = P_mid < target
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid)
+        depth = np.exp((lo + hi) / 2)
+        P, Mx, My = self._resultants(samples, case_sample, directions, top, depth)
+        M = directions[:, 1] * Mx + directions[:, 0] * My
+        M[~feasible] = np.nan
+        P0 = samples['fc'] * self._gross_area + samples['fy'] @ arrays.rebar_area
+        return M.reshape(n, n_l, n_a), depth.reshape(n, n_l, n_a), P0
+
+    def run(self, loads, angles=(0.0,), percentiles=(5, 50, 95), iterations=40):
+        """
+        Sample the section and solve the moment capacity at every load and angle.
+
+        Args:
+            loads: Axial loads in force_unit (compression positive)
+            angles: Bending angles in degrees
+            percentiles: Percentiles reported in the summary
+            iterations: Bisection steps (each halves the log-depth interval)
+
+        Returns:
+            Dictionary with the samples' 'M' capacities (n_samples, n_loads,
+            n_angles) in moment_unit (NaN where the load exceeds the
+            sample's axial capacity), 'depth' (length_unit), pure axial
+            capacity 'P0' (force_unit), the fraction of samples whose axial
+            capacity is 'exceeded' by each load, and 'mean', 'std' and
+            'percentiles' (n_percentiles, n_loads, n_angles) of M, where
+            those samples count as zero moment capacity
+        """
+        section_data = self.section_data
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+        loads = np.atleast_1d(np.asarray(loads, dtype=float)) / force_factor
+        angles = np.atleast_1d(np.asarray(angles, dtype=float))
+        self._origin = np.asarray(section_origin(section_data)) * section_data.length_scale
+        self._gross_area = section_data.polygon.area * section_data.length_scale**2
+
+        sizes = [min(self.chunk_size, self.n_samples - start) for start in range(0, self.n_samples, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.entropy).spawn(len(sizes))
+        jobs = [(seed, n, loads, angles, iterations) for seed, n in zip(seeds, sizes)]
+        if self.workers and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                parts = list(pool.map(lambda job: self._run_chunk(*job), jobs))
+        else:
+            parts = [self._run_chunk(*job) for job in jobs]
+
+        M = np.concatenate([part[0] for part in parts]) * moment_factor
+        depth = np.concatenate([part[1] for part in parts]) / section_data.length_scale
+        P0 = np.concatenate([part[2] for part in parts]) * force_factor
+        capacity = np.nan_to_num(M, nan=0.0)
+        return {'loads': loads * force_factor, 'angles': angles,
+                'M': M, 'depth': depth, 'P0': P0,
+                'exceeded': np.isnan(M).mean(axis=0),
+                'mean': capacity.mean(axis=0), 'std': capacity.std(axis=0),
+                'percentiles': np.percentile(capacity, percentiles, axis=0),
+                'percentile_levels': np.asarray(percentiles)}
+
@@ -0,0 +1,251 @@
+"""
+Stream interaction-surface points and capacity check results to disk.
+
+Rows of many sections go to one long-form table (first column SectionID),
+either append-only CSV or columnar Parquet (needs pyarrow). Rows are
+buffered per section and written in chunks of about chunk_rows, so memory
+stays bounded by one chunk however many sections are written. Next to the
+table, <filepath>.sections.csv gets one line per section with its row range,
+for CSV also its byte range, and its metadata (JSON), so a reader can seek
+to single sections (read_results) or memory-map the Parquet file.
+"""
+
+import csv
+import json
+import os
+
+import numpy as np
+
+SECTION_FIELDS = ['SectionID', 'row_start', 'rows', 'byte_start', 'byte_end', 'metadata']
+
+
+def _format(filepath, format):
+    if format is None:
+        format = 'parquet' if os.path.splitext(filepath)[1].lower() in ('.parquet', '.pq') else 'csv'
+    if format not in ('csv', 'parquet'):
+        raise ValueError(f"Result writer: unknown format {format!r} (csv or parquet)")
+    return format
+
+
+def sections_filepath(filepath):
+    return filepath + '.sections.csv'
+
+
+class ResultWriter:
+    """
+    Chunked writer of a long-form result table.
+
+    Every write() adds the rows of one section; all writes must have the
+    same columns, and every section ID may be written once. Use as a context manager, or call close() to write the
+    last chunk.
+    """
+    def __init__(self, filepath, format=None, chunk_rows=65536):
+        """
+        Args:
+            filepath: Result file; a relative path (also a bare file name) is
+                taken from the working directory, like open(), and missing
+                directories are created
+            format: 'csv' or 'parquet' (default: from the file extension)
+            chunk_rows: Rows buffered before a chunk is written
+        """
+        filepath = os.path.abspath(filepath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self.filepath = filepath
+        self.format = _format(filepath, format)
+        self.chunk_rows = chunk_rows
+        self.columns = None
+        self.rows = 0
+        self.sections = 0
+        self._buffer = []
+        self._buffered_rows = 0
+        self._section_ids = set()
+        self._parquet = None
+        if self.format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+                import pyarrow.parquet  # noqa: F401
+            except ImportError as error:
+                raise ImportError(f"Writing Parquet results needs pyarrow: {error}") from error
+        # Start new files; both are only appended to from here on
+        self._file = open(filepath, 'wb') if self.format == 'csv' else None
+        self._index = open(sections_filepath(filepath), 'w', newline='')
+        self._index_writer = csv.DictWriter(self._index, fieldnames=SECTION_FIELDS)
+        self._index_writer.writeheader()
+
+    def write(self, section_id, columns, **metadata):
+        """
+        Buffer the rows of one section.
+
+        Args:
+            section_id: Section name
+            columns: Dictionary column -> 1D array, all of the same length
+            **metadata: Section metadata (JSON serializable)
+        """
+        if self._index is None:
+            raise ValueError("Result writer: already closed")
+        section_id = str(section_id)
+        if section_id in self._section_ids:
+            raise ValueError(f"Result writer: section {section_id!r} was already written to {self.filepath}")
+        columns = {name: np.ravel(np.asarray(values)) for name, values in columns.items()}
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Result writer: columns of section {section_id!r} differ in length")
+        if self.columns is None:
+            self.columns = list(columns)
+        elif list(columns) != self.columns:
+            raise ValueError(f"Result writer: columns {list(columns)} of section {section_id!r} "
+                             f"differ from {self.columns}")
+        n = lengths.pop() if lengths else 0
+        self._section_ids.add(section_id)
+        self._buffer.append((section_id, columns, n, metadata))
+        self._buffered_rows += n
+        if self._buffered_rows >= self.chunk_rows:
+            self.flush()
+
+    def _frame(self, section_id, columns, n):
+        import pandas as pd
+        return pd.DataFrame({'SectionID': np.full(n, section_id, dtype=object), **columns})
+
+    def flush(self):
+        """
+        Write the buffered sections as one chunk (Parquet row group).
+        """
+        if not self._buffer:
+            return
+        if self.format == 'csv':
+            for section_id, columns, n, metadata in self._buffer:
+                first = self._file.tell() == 0
+                data = self._frame(section_id, columns, n).to_csv(index=False, header=first).encode()
+                if first:
+                    # Byte ranges cover data lines only, the header line stays first in the file
+                    header_end = data.index(b'\n') + 1
+                    self._file.write(data[:header_end])
+                    data = data[header_end:]
+                start = self._file.tell()
+                self._file.write(data)
+                self._index_row(section_id, n, metadata, start, self._file.tell())
+            self._file.flush()
+        else:
+            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            frame = pd.concat([self._frame(section_id, columns, n) for section_id, columns, n, _ in self._buffer],
+                              ignore_index=True)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.filepath, table.schema)
+            self._parquet.write_table(table)
+            for section_id, _, n, metadata in self._buffer:
+                self._index_row(section_id, n, metadata, '', '')
+        self._index.flush()
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def _index_row(self, section_id, n, metadata, byte_start, byte_end):
+        self._index_writer.writerow({'SectionID': section_id, 'row_start': self.rows, 'rows': n,
+                                     'byte_start': byte_start, 'byte_end': byte_end,
+                                     'metadata': json.dumps(metadata, default=str)})
+        self.rows += n
+        self.sections += 1
+
+    def close(self):
+        if self._index is None:
+            return
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+        self._index.close()
+        self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_surface(self, section_id, surface, **metadata):
+        """
+        Write the points of an InteractionSurface (columns Angle, Depth, P, Mx, My).
+        """
+        section = surface.section_data
+        self.write(section_id, surface_columns(surface.angles, surface.depths, surface.P, surface.Mx, surface.My),
+                   force_unit=str(surface.force_unit.units), moment_unit=str(surface.moment_unit.units),
+                   length_unit=str(section.length_unit.units), fc=float(section.concrete_material_properties.magnitude),
+                   n_rebars=len(section.sectionRebarGrade), **metadata)
+
+    def write_check(self, section_id, names, Pu, Mux, Muy, result, **metadata):
+        """
+        Write capacity check results (columns Combination, Pu, Mux, Muy, Ratio, Passed).
+        """
+        self.write(section_id, {'Combination': np.asarray(names, dtype=object), 'Pu': Pu, 'Mux': Mux,
+                                'Muy': Muy, 'Ratio': result['ratio'], 'Passed': result['passed']},
+                   max_ratio=float(np.max(result['ratio'])) if len(result['ratio']) else None,
+                   failed=int(np.sum(~np.asarray(result['passed'], dtype=bool))), **metadata)
+
+
+def surface_columns(angles, depths, P, Mx, My):
+    """
+    Flat Angle, Depth, P, Mx, My columns of surface arrays (n_angles, n_depths).
+    """
+    n_d = np.shape(P)[-1]
+    return {'Angle': np.repeat(angles, n_d), 'Depth': np.broadcast_to(depths, np.shape(P)),
+            'P': P, 'Mx': Mx, 'My': My}
+
+
+def read_sections(filepath):
+    """
+    Per-section index of a result file.
+
+    Returns:
+        DataFrame with SectionID, row_start, rows, byte_start, byte_end and
+        the decoded metadata dictionaries
+    """
+    import pandas as pd
+
+    index = pd.read_csv(sections_filepath(filepath), dtype={'SectionID': str})
+    index['metadata'] = [json.loads(text) for text in index['metadata']]
+    return index
+
+
+def read_results(filepath, section_ids=None, columns=None):
+    """
+    Read all rows of a result file, or only those of some sections.
+
+    CSV files are read by seeking to each section's byte range; Parquet
+    files are memory-mapped and only the row groups holding the sections
+    are decoded.
+
+    Args:
+        filepath: Result file written by ResultWriter
+        section_ids: Sections to read (default: all)
+        columns: Columns to read (default: all)
+
+    Returns:
+        DataFrame
+    """
+    import io
+    import pandas as pd
+
+    if _format(filepath, None) == 'parquet':
+        import pyarrow.parquet as pq
+
+        filters = None if section_ids is None else [('SectionID', 'in', [str(name) for name in section_ids])]
+        return pq.read_table(filepath, columns=columns, filters=filters, memory_map=True).to_pandas()
+    if section_ids is None:
+        return pd.read_csv(filepath, usecols=columns, dtype={'SectionID': str},
+                           float_precision='round_trip')
+    index = read_sections(filepath).set_index('SectionID')
+    missing = set(map(str, section_ids)) - set(index.index)
+    if missing:
+        raise ValueError(f"Result file {filepath}: unknown section(s) {sorted(missing)}")
+    with open(filepath, 'rb') as file:
+        header = file.readline()
+        parts = [header]
+        for name in section_ids:
+            file.seek(int(index.loc[str(name), 'byte_start']))
+            parts.append(file.read(int(index.loc[str(name), 'byte_end'] - index.loc[str(name), 'byte_start'])))
+    return pd.read_csv(io.BytesIO(b''.join(parts)), usecols=columns, dtype={'SectionID': str},
+                       float_precision='round_trip')
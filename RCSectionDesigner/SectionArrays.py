@@ -0,0 +1,108 @@
+import numpy as np
+
+from RCSectionDesigner.compressionBlock import polygon_edges
+
+
+def rotation_directions(angle_degrees):
+    """
+    Rotated x/y axes of a counter-clockwise rotation, as seen from the
+    unrotated frame: x' = ex . p and y' = d . p (relative to the origin).
+
+    Returns:
+        Tuple (ex, d) of (2,) unit vectors
+    """
+    theta = np.radians(angle_degrees)
+    return np.array([np.cos(theta), -np.sin(theta)]), np.array([np.sin(theta), np.cos(theta)])
+
+
+class SectionArrays:
+    """
+    Contiguous array view of a section in the internal unit system
+    (mm, mm^2, MPa), used by the analysis hot paths instead of shapely
+    geometries and per-rebar dictionaries.
+    """
+    __slots__ = ('rebar_x', 'rebar_y', 'rebar_area', 'rebar_fy', 'rebar_fu',
+                 'Es', 'fc', 'vertices', 'edge_start', 'edge_end')
+
+    def __init__(self, rebar_x, rebar_y, rebar_area, rebar_fy, rebar_fu, Es, fc,
+                 vertices, edge_start, edge_end):
+        """
+        Args:
+            rebar_x, rebar_y: Rebar coordinates (mm)
+            rebar_area: Rebar areas (mm^2)
+            rebar_fy, rebar_fu: Rebar yield and tensile strengths (MPa)
+            Es: Young's modulus of steel (MPa)
+            fc: Concrete compressive strength (MPa)
+            vertices: (n, 2) exterior vertices of the concrete outline (mm)
+            edge_start, edge_end: (n_edges, 2) oriented edges of all rings (mm)
+        """
+        self.rebar_x = np.ascontiguousarray(rebar_x, dtype=float)
+        self.rebar_y = np.ascontiguousarray(rebar_y, dtype=float)
+        self.rebar_area = np.ascontiguousarray(rebar_area, dtype=float)
+        self.rebar_fy = np.ascontiguousarray(rebar_fy, dtype=float)
+        self.rebar_fu = np.ascontiguousarray(rebar_fu, dtype=float)
+        self.Es = float(Es)
+        self.fc = float(fc)
+        self.vertices = np.ascontiguousarray(vertices, dtype=float)
+        self.edge_start = np.ascontiguousarray(edge_start, dtype=float)
+        self.edge_end = np.ascontiguousarray(edge_end, dtype=float)
+
+    @classmethod
+    def from_section(cls, section_data):
+        """
+        Build the array view of a SectionData (coordinates scaled to mm).
+        """
+        scale = section_data.length_scale
+        bars = np.array([(p.x, p.y) for p in section_data.rebarCoor.geoms], dtype=float).reshape(-1, 2) * scale
+        edge_start, edge_end = polygon_edges(section_data.polygon)
+        return cls(bars[:, 0], bars[:, 1],
+                   section_data.rebar_area_mm2,
+                   section_data.rebar_fy_MPa,
+                   section_data.rebar_fu_MPa,
+                   section_data.Es_MPa,
+                   section_data.fc_MPa,
+                   np.asarray(section_data.polygon.exterior.coords)[:-1, :2] * scale,
+                   edge_start * scale,
+                   edge_end * scale)
+
+    @property
+    def n_rebars(self):
+        return len(self.rebar_x)
+
+    @property
+    def rebar_xy(self):
+        return np.column_stack([self.rebar_x, self.rebar_y])
+
+    @property
+    def edges(self):
+        return self.edge_start, self.edge_end
+
+    def project(self, directions, origin):
+        """
+        Coordinates along each direction, relative to the origin.
+
+        Args:
+            directions: (n, 2) unit vectors
+            origin: (2,) reference point (mm)
+
+        Returns:
+            Tuple (vertex_proj, bar_proj) of (n, n_vertices) and (n, n_rebars) arrays
+        """
+        d = np.atleast_2d(directions)
+        vertex_proj = d @ (self.vertices - origin).T
+        bar_proj = d[:, 0:1] * (self.rebar_x - origin[0]) + d[:, 1:2] * (self.rebar_y - origin[1])
+        return vertex_proj, bar_proj
+
+    def rotate(self, angle_degrees, origin):
+        """
+        Rotated vertex and rebar coordinates (counter-clockwise, in mm).
+
+        Returns:
+            Tuple (vertices, rebar_xy) of (n, 2) arrays
+        """
+        ex, d = rotation_directions(angle_degrees)
+        rotation = np.column_stack([ex, d])
+        origin = np.asarray(origin, dtype=float)
+        vertices = (self.vertices - origin) @ rotation + origin
+        rebar_xy = (self.rebar_xy - origin) @ rotation + origin
+        return vertices, rebar_xy
@@ -1,14 +1,13 @@
-import pandas as pd
+import copy
 import sys
 import numpy as np
 from . import config
-from .units import ureg, Q_
+from .SectionArrays import SectionArrays
+from .MaterialCatalog import load_catalog
+from .units import ureg, Q_, conversion_factor, INTERNAL_LENGTH_UNIT, INTERNAL_STRESS_UNIT
 from shapely.geometry import Polygon, MultiPoint, MultiPolygon, LineString
 from shapely import affinity
-from shapely.plotting import patch_from_polygon
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
 
 
 # Functions for importing data (outside class)
@@ -22,6 +21,7 @@ def import_coordinates(filepath):
     Returns:
         DataFrame with coordinates
     """
+    import pandas as pd
     if(filepath is None):
         print("No filepath provided, please provide a valid path")
     df = pd.read_csv(filepath)
@@ -60,43 +60,99 @@ class SectionData:
                  section_filepath = config.SECTION_COORDINATE_FILE, 
                  grade_mapping_filepath = config.REBAR_GRADE_FILE,
                  length_unit="mm", 
-                 force_unit="kN"):
+                 force_unit="kN",
+                 moment_unit="kN*m",
+                 material_catalog=None):
         """
         Initialize SectionData with rebar and section dataframes.
         
         Args:
             rebar_df: DataFrame with rebar coordinates (columns: RebarID, X, Y, Diameter, Grade)
             section_df: DataFrame with section coordinates (columns: point, x, y)
+            material_catalog: MaterialCatalog for rebar grades/sizes (default: the
+                shared catalog loaded from grade_mapping_filepath)
         """
-        self.length_unit = ureg(length_unit)
-        self.force_unit = ureg(force_unit)
+        import pandas as pd
+        self.set_units(length_unit, force_unit, moment_unit)
         rebar_df = pd.read_csv(rebar_filepath)
         section_df = pd.read_csv(section_filepath)
         rebar_df = rebar_df.dropna()
         section_df = section_df.dropna()
+        if material_catalog is None:
+            material_catalog = load_catalog(grade_mapping_filepath)
+        self._initialize(con_matprop, rebar_df, section_df[['X', 'Y']].to_numpy(), material_catalog)
+
+    @classmethod
+    def from_arrays(cls, con_matprop, outline, rebar_xy, sizes, grades, diameters=None,
+                    length_unit="mm", force_unit="kN", moment_unit="kN*m", material_catalog=None):
+        """
+        Build a section from coordinate arrays instead of CSV files.
+
+        Args:
+            con_matprop: Concrete strength (MPa)
+            outline: (n, 2) outline vertices in length_unit
+            rebar_xy: (m, 2) rebar coordinates in length_unit
+            sizes, grades: Bar size and grade names, one per rebar
+            diameters: Bar diameters (default: from the material catalog)
+            material_catalog: MaterialCatalog (default: the shared catalog)
+
+        Returns:
+            SectionData object
+        """
+        import pandas as pd
+        if material_catalog is None:
+            material_catalog = load_catalog()
+        rebar_xy = np.asarray(rebar_xy, dtype=float).reshape(-1, 2)
+        if diameters is None:
+            diameters = [material_catalog.size(size)['diameter'] for size in sizes]
+        rebar_df = pd.DataFrame({'X': rebar_xy[:, 0], 'Y': rebar_xy[:, 1], 'Diameter': diameters,
+                                 'Size': list(sizes), 'Grade': list(grades)})
+        section = cls.__new__(cls)
+        section.set_units(length_unit, force_unit, moment_unit)
+        section._initialize(con_matprop, rebar_df, np.asarray(outline, dtype=float), material_catalog)
+        return section
+
+    def _initialize(self, con_matprop, rebar_df, outline, material_catalog):
         self.sectionRebarGrade = rebar_df['Grade']
         self.sectionRebarDiameter = rebar_df['Diameter']
         self.sectionRebarSize = rebar_df['Size']
         self.rebarCoor = MultiPoint(rebar_df[['X', 'Y']].to_numpy())
-        self.ro_rebarCoor = MultiPoint(rebar_df[['X', 'Y']].to_numpy())
-        self.polygon = Polygon(section_df[['X', 'Y']].to_numpy())
-        self.ro_polygon = Polygon(section_df[['X', 'Y']].to_numpy())
+        self.polygon = Polygon(outline)
         # con_matprop is already in MPa, so we need to convert it properly
         self.concrete_material_properties = Q_(con_matprop, 'MPa')
-        self.rebars_material_properties = self.SetRebarMaterialProperties(self.sectionRebarGrade)
+        self.material_catalog = material_catalog
+        self.SetRebarMaterialProperties(self.sectionRebarGrade)
         self.Es = Q_(200000, 'MPa')  # Young's modulus for steel
+        self.set_internal_values()
+        self.rotate_section(angle_degrees=0)
 
 
-    def set_units(self, length_unit="mm", force_unit="kN"):
+    def set_units(self, length_unit="mm", force_unit="kN", moment_unit="kN*m"):
         """
         Set the units for length and force.
         
         Args:
             length_unit: Length unit (default: "mm")
             force_unit: Force unit (default: "kN")
+            moment_unit: Unit of reported moments (default: "kN*m")
         """
         self.length_unit = ureg(length_unit)
         self.force_unit = ureg(force_unit)
+        self.moment_unit = ureg(moment_unit)
+        # Coordinates are given in length_unit, the numeric core works in mm
+        self.length_scale = conversion_factor(self.length_unit, INTERNAL_LENGTH_UNIT)
+        if hasattr(self, 'arrays'):
+            self.set_internal_values()
+            self.rotate_section(self.rotation_angle, self.rotation_origin)
+
+    def set_internal_values(self):
+        """
+        Normalize material properties to plain floats in the internal unit
+        system (MPa, mm^2) used by the analysis hot paths.
+        """
+        self.fc_MPa = self.concrete_material_properties.to(INTERNAL_STRESS_UNIT).magnitude
+        self.Es_MPa = self.Es.to(INTERNAL_STRESS_UNIT).magnitude
+        self.arrays = SectionArrays.from_section(self)
 
     def display_info(self):
         """
@@ -120,47 +176,96 @@ class SectionData:
         print(f"\nConcrete Material Properties:", self.concrete_material_properties)
 
     def SetRebarMaterialProperties(self, sectionRebarGrade):
-        rebarGrade_df = pd.read_csv(config.REBAR_GRADE_FILE).dropna()
-        rebarSize_df = pd.read_csv(config.REBAR_SECTION_PROPERTY_FILE).dropna()
-        rebar_matprop = {}
-
-        for i, grade in sectionRebarGrade.items():
-            fy = rebarGrade_df.loc[rebarGrade_df['Grade'] == grade, 'Yield_Strength_MPa'].values
-            fy = Q_(fy[0], 'MPa')
-            fu = rebarGrade_df.loc[rebarGrade_df['Grade'] == grade, 'Tensile_Strength_MPa'].values
-            fu = Q_(fu[0], 'MPa')
-            rebar_matprop['R' + str(i)] = {'fy': fy, 'fu': fu}
-
-        for i, size in self.sectionRebarSize.items():
-            area_mm2 = rebarSize_df.loc[rebarSize_df['Size'] == size, 'Area(mm2.)'].values
-            area_mm2 = Q_(area_mm2[0], 'mm^2')
-            rebar_matprop['R' + str(i)]['Area'] = area_mm2
-
-        return rebar_matprop
-
-        # for index, row in rebarGrade_df.iterrows():
-        #     print(row)
-        #     print("-------------------")
-        #     print(sectionRebarGrade)
-        #     print("-------------------")
-            
+        """
+        Look up fy, fu (MPa) and area (mm^2) of every rebar in the material
+        catalog. Raises ValueError if a grade or size is not in the catalog.
+        """
+        fy, fu, area = self.material_catalog.rebar_arrays(sectionRebarGrade.to_numpy(),
+                                                          self.sectionRebarSize.to_numpy())
+        self.rebar_fy_MPa = fy
+        self.rebar_fu_MPa = fu
+        self.rebar_area_mm2 = area
+        self._rebars_material_properties = None
+
+    @property
+    def rebars_material_properties(self):
+        """
+        Per-rebar material properties as pint Quantities, keyed 'R' + index
+        (built on first access, the analysis uses the float arrays).
+        """
+        if self._rebars_material_properties is None:
+            self._rebars_material_properties = {
+                'R' + str(i): {'fy': Q_(fy, 'MPa'), 'fu': Q_(fu, 'MPa'), 'Area': Q_(area, 'mm^2')}
+                for i, fy, fu, area in zip(self.sectionRebarGrade.index, self.rebar_fy_MPa,
+                                           self.rebar_fu_MPa, self.rebar_area_mm2)}
+        return self._rebars_material_properties
 
     def rotate_section(self, angle_degrees = 0, origin='center'):
         """
         Rotate the section polygon and rebar coordinates by a given angle.
+
+        Only the coordinate arrays are rotated (ro_vertices, ro_rebar_xy);
+        the shapely geometries ro_polygon and ro_rebarCoor are built on first use.
         
         Args:
             angle_degrees: Angle to rotate in degrees
             origin: Point around which to rotate (default: 'center')
         """
-        self.ro_polygon = affinity.rotate(self.polygon, angle_degrees, origin=origin)
-        self.ro_rebarCoor = affinity.rotate(self.rebarCoor, angle_degrees, origin=origin)
+        # Rebars rotate about the same point as the concrete outline,
+        # otherwise 'center'/'centroid' would resolve to the rebar group's own center
+        if isinstance(origin, str):
+            if origin == 'center':
+                min_x, min_y, max_x, max_y = self.polygon.bounds
+                origin = ((min_x + max_x) / 2, (min_y + max_y) / 2)
+            elif origin == 'centroid':
+                origin = (self.polygon.centroid.x, self.polygon.centroid.y)
+            else:
+                raise ValueError(f"Unknown rotation origin '{origin}', use 'center', 'centroid' or a point")
+        elif hasattr(origin, 'x'):
+            origin = (origin.x, origin.y)
+        self.rotation_angle = angle_degrees
+        self.rotation_origin = (float(origin[0]), float(origin[1]))
+        vertices, rebar_xy = self.arrays.rotate(angle_degrees, np.asarray(self.rotation_origin) * self.length_scale)
+        self.ro_vertices = vertices / self.length_scale
+        self.ro_rebar_xy = rebar_xy / self.length_scale
+        self._ro_polygon = None
+        self._ro_rebarCoor = None
 
+    def rotated(self, angle_degrees=0, origin='center'):
+        """
+        Copy of the section rotated by a given angle, leaving this section's
+        rotation untouched. Geometry and material arrays are shared (they
+        are never modified in place), so each thread of an angle sweep can
+        work on its own rotated copy.
+
+        Returns:
+            SectionData object
+        """
+        section = copy.copy(self)
+        section.rotate_section(angle_degrees, origin)
+        return section
+
+    @property
+    def ro_polygon(self):
+        if self._ro_polygon is None:
+            self._ro_polygon = affinity.rotate(self.polygon, self.rotation_angle, origin=self.rotation_origin)
+        return self._ro_polygon
+
+    @property
+    def ro_rebarCoor(self):
+        if self._ro_rebarCoor is None:
+            self._ro_rebarCoor = MultiPoint(self.ro_rebar_xy)
+        return self._ro_rebarCoor
 
     def plot(self, is_rotated = False):
         """
         Plot the reinforced concrete section using the plotRCSection module.
         """
+        # Plotting dependencies are only loaded when a plot is requested
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Circle
+        from shapely.plotting import patch_from_polygon
+
         fig, ax = plt.subplots(figsize=(10, 8))
         if is_rotated:
             patch_concrete = patch_from_polygon(self.ro_polygon, facecolor='grey', edgecolor='black')
@@ -0,0 +1,227 @@
+import numpy as np
+from shapely.geometry import MultiPoint
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import bar_strains, bending_directions, block_cuts, default_depths, \
+    section_origin
+from RCSectionDesigner.SectionArrays import SectionArrays
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+from RCSectionDesigner.compressionBlock import clip_half_plane
+from RCSectionDesigner.units import Q_, conversion_factor, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+
+
+class SectionModel:
+    """
+    Editable section with an interaction surface that is updated
+    incrementally.
+
+    The surface points (same model as compute_pmm) are kept split into
+    per-rebar force columns and the concrete block geometry (area and first
+    moments per angle and depth, which depend only on beta1). Edits are
+    recorded as pending changes and applied on the next access to the
+    results: a changed bar only recomputes its own column, a new fc rescales
+    the concrete terms and only re-clips the block when beta1 changes.
+
+    The wrapped SectionData is edited in place, so StrainCompatibility and
+    plots of it follow the model; its arrays are replaced by private copies
+    on the first edit, so rotated() copies made before keep their values.
+
+    The model has points(), force_unit and moment_unit like
+    InteractionSurface, so it can be passed to CapacityChecker.
+    """
+    def __init__(self, section_data, angles=None, depths=None, strain_max=config.STRAIN_COMPRESSION_MAX):
+        """
+        Args:
+            section_data: SectionData object (edited in place by the model)
+            angles: Rotation angles in degrees (default: 0-360 every 10 degrees)
+            depths: Neutral-axis depths, (n_depths,) or (n_angles, n_depths)
+                (default: default_depths with config.ANALYSIS_POINTS points)
+            strain_max: Concrete strain at the extreme compression fiber
+        """
+        if angles is None:
+            angles = np.arange(0, 360, 10)
+        self.section_data = section_data
+        self.angles = np.atleast_1d(np.asarray(angles, dtype=float))
+        if depths is None:
+            depths = default_depths(section_data, self.angles)
+        depths = np.asarray(depths, dtype=float)
+        if depths.ndim == 1:
+            depths = np.broadcast_to(depths, (len(self.angles), len(depths)))
+        self.depths = depths
+        self.strain_max = strain_max
+        self.force_unit = section_data.force_unit
+        self.moment_unit = section_data.moment_unit
+        self.changes = []  # history of applied edits
+        self._pending_bars = set()
+        self._pending_fc = False
+        self._block_cache = {}  # beta1 -> (area, Sx, Sy) per angle x depth
+        self._owns_arrays = False
+        self.refresh()
+
+    def refresh(self):
+        """
+        Recompute every contribution from scratch (e.g. after editing the
+        SectionData outline directly).
+        """
+        arrays = self.section_data.arrays
+        scale = self.section_data.length_scale
+        self._origin = np.asarray(section_origin(self.section_data)) * scale
+        self._directions = bending_directions(self.angles)
+        self._depths_mm = self.depths * scale
+        vertex_proj, _ = arrays.project(self._directions, self._origin)
+        self._top = vertex_proj.max(axis=1)
+        self._bottom = vertex_proj.min(axis=1)
+        self._block_cache = {}
+        self._bar_forces = self._rebar_forces(np.arange(arrays.n_rebars))  # (n_angles, n_depths, n_bars)
+        self._bar_positions = arrays.rebar_xy  # positions the stored forces belong to
+        bars = self._bar_positions - self._origin
+        self._P_s = self._bar_forces.sum(axis=2)
+        self._Mx_s = self._bar_forces @ bars[:, 1]
+        self._My_s = self._bar_forces @ bars[:, 0]
+        self._pending_bars.clear()
+        self._pending_fc = True
+        self._update()
+
+    def _rebar_forces(self, index):
+        # Forces of the selected bars for every angle x depth (N)
+        arrays = self.section_data.arrays
+        bar_proj = (self._directions[:, 0:1] * (arrays.rebar_x[index] - self._origin[0])
+                    + self._directions[:, 1:2] * (arrays.rebar_y[index] - self._origin[1]))
+        strain = bar_strains(self._top, bar_proj, self._depths_mm, self.strain_max)
+        stress = np.clip(strain * arrays.Es, -arrays.rebar_fy[index], arrays.rebar_fy[index])
+        return stress * arrays.rebar_area[index]
+
+    def concrete_block(self, beta1):
+        """
+        Area and first moments (Sx, Sy) of the compression block for every
+        angle x depth at a given beta1 (mm^2, mm^3), cached per beta1.
+        """
+        if beta1 not in self._block_cache:
+            n_a, n_d = self._depths_mm.shape
+            cut = block_cuts(self._top, self._bottom, beta1, self._depths_mm)
+            area, Sx, Sy = clip_half_plane(self.section_data.arrays.edges, self._origin,
+                                           np.repeat(self._directions, n_d, axis=0), cut.ravel())
+            self._block_cache[beta1] = (area.reshape(n_a, n_d), Sx.reshape(n_a, n_d), Sy.reshape(n_a, n_d))
+        return self._block_cache[beta1]
+
+    def _own_arrays(self):
+        # The section's arrays may be shared with rotated() copies, so the
+        # first edit swaps in private copies instead of writing into them
+        if self._owns_arrays:
+            return
+        section = self.section_data
+        arrays = section.arrays
+        section.rebar_fy_MPa = np.array(section.rebar_fy_MPa, dtype=float)
+        section.rebar_fu_MPa = np.array(section.rebar_fu_MPa, dtype=float)
+        section.rebar_area_mm2 = np.array(section.rebar_area_mm2, dtype=float)
+        section.arrays = SectionArrays(arrays.rebar_x.copy(), arrays.rebar_y.copy(), arrays.rebar_area.copy(),
+                                       arrays.rebar_fy.copy(), arrays.rebar_fu.copy(), arrays.Es, arrays.fc,
+                                       arrays.vertices, arrays.edge_start, arrays.edge_end)
+        self._owns_arrays = True
+
+    def set_rebar(self, index, size=None, grade=None, x=None, y=None):
+        """
+        Change the size, grade and/or position of one rebar.
+
+        Args:
+            index: Position of the rebar in the section's rebar list
+            size, grade: New catalog names (ValueError if unknown)
+            x, y: New coordinates in the section's length unit
+        """
+        section = self.section_data
+        if not 0 <= index < section.arrays.n_rebars:
+            raise ValueError(f"Rebar index {index} out of range (section has {section.arrays.n_rebars} rebars)")
+        self._own_arrays()
+        arrays = section.arrays
+        if size is not None or grade is not None:
+            size = section.sectionRebarSize.iloc[index] if size is None else size
+            grade = section.sectionRebarGrade.iloc[index] if grade is None else grade
+            fy, fu, area = section.material_catalog.rebar_arrays([grade], [size])
+            section.sectionRebarSize = section.sectionRebarSize.copy()
+            section.sectionRebarSize.iloc[index] = size
+            section.sectionRebarGrade = section.sectionRebarGrade.copy()
+            section.sectionRebarGrade.iloc[index] = grade
+            section.sectionRebarDiameter = section.sectionRebarDiameter.copy()
+            section.sectionRebarDiameter.iloc[index] = section.material_catalog.size(size)['diameter']
+            for values, new in ((section.rebar_fy_MPa, fy), (section.rebar_fu_MPa, fu),
+                                (section.rebar_area_mm2, area), (arrays.rebar_fy, fy),
+                                (arrays.rebar_fu, fu), (arrays.rebar_area, area)):
+                values[index] = new[0]
+            section._rebars_material_properties = None
+        if x is not None or y is not None:
+            scale = section.length_scale
+            if x is not None:
+                arrays.rebar_x[index] = x * scale
+            if y is not None:
+                arrays.rebar_y[index] = y * scale
+            section.rebarCoor = MultiPoint(arrays.rebar_xy / scale)
+            section.rotate_section(section.rotation_angle, section.rotation_origin)
+        self._pending_bars.add(index)
+        self.changes.append(('rebar', index, {'size': size, 'grade': grade, 'x': x, 'y': y}))
+
+    def set_fc(self, fc):
+        """
+        Change the concrete strength (MPa).
+        """
+        section = self.section_data
+        self._own_arrays()
+        section.concrete_material_properties = Q_(fc, 'MPa')
+        section.fc_MPa = section.concrete_material_properties.to('MPa').magnitude
+        section.arrays.fc = section.fc_MPa
+        self._pending_fc = True
+        self.changes.append(('fc', None, {'fc': fc}))
+
+    @property
+    def pending(self):
+        """
+        True if there are edits not yet applied to the results.
+        """
+        return bool(self._pending_bars) or self._pending_fc
+
+    def _update(self):
+        arrays = self.section_data.arrays
+        if self._pending_bars:
+            index = np.array(sorted(self._pending_bars))
+            old = self._bar_forces[:, :, index]
+            new = self._rebar_forces(index)
+            old_bars = self._bar_positions[index] - self._origin
+            new_bars = arrays.rebar_xy[index] - self._origin
+            self._P_s += new.sum(axis=2) - old.sum(axis=2)
+            self._Mx_s += new @ new_bars[:, 1] - old @ old_bars[:, 1]
+            self._My_s += new @ new_bars[:, 0] - old @ old_bars[:, 0]
+            self._bar_forces[:, :, index] = new
+            self._bar_positions[index] = arrays.rebar_xy[index]
+            self._pending_bars.clear()
+        if self._pending_fc:
+            area, Sx, Sy = self.concrete_block(beta1_MPa(arrays.fc))
+            self._P_c, self._Mx_c, self._My_c = area * arrays.fc, Sx * arrays.fc, Sy * arrays.fc
+            self._pending_fc = False
+        force_factor = conversion_factor(INTERNAL_FORCE_UNIT, self.force_unit)
+        moment_factor = conversion_factor(INTERNAL_MOMENT_UNIT, self.moment_unit)
+        self._P = (self._P_s + self._P_c) * force_factor
+        self._Mx = (self._Mx_s + self._Mx_c) * moment_factor
+        self._My = (self._My_s + self._My_c) * moment_factor
+
+    @property
+    def P(self):
+        if self.pending:
+            self._update()
+        return self._P
+
+    @property
+    def Mx(self):
+        if self.pending:
+            self._update()
+        return self._Mx
+
+    @property
+    def My(self):
+        if self.pending:
+            self._update()
+        return self._My
+
+    def points(self):
+        """
+        Surface points as an (n, 3) array of (P, Mx, My).
+        """
+        return np.column_stack([self.P.ravel(), self.Mx.ravel(), self.My.ravel()])
@@ -0,0 +1,175 @@
+"""
+Registry of the section types of a building model.
+
+Columns of real projects reuse a few types (same outline, bar layout,
+grades and fc) at many locations. The registry reduces every SectionData to
+a canonical form (coordinates in mm relative to the bounding box center,
+rounded to a tolerance, rings counter-clockwise starting at their lowest
+vertex, rebars sorted) and hashes it into a signature. Each distinct
+signature is analysed once and every location refers to the shared surface,
+which is valid because the moments are taken about the bounding box center.
+"""
+
+import csv
+import hashlib
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import InteractionSurface, section_origin
+
+
+def _canonical_ring(coords, tolerance):
+    # Integer grid coordinates, counter-clockwise, starting at the lowest (x, y) vertex
+    ring = np.round(np.asarray(coords, dtype=float) / tolerance).astype(np.int64)
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    keep = np.any(ring != np.roll(ring, 1, axis=0), axis=1)  # repeated vertices
+    ring = ring[keep] if keep.any() else ring[:1]
+    x, y = ring[:, 0].astype(float), ring[:, 1].astype(float)
+    if np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y) < 0:
+        ring = ring[::-1]
+    start = np.lexsort((ring[:, 1], ring[:, 0]))[0]
+    return np.roll(ring, -start, axis=0)
+
+
+def canonical_signature(section_data, tolerance=1e-3):
+    """
+    Signature of a section that is equal for sections differing only by a
+    translation, the starting vertex or direction of the outline, the order
+    of the rebars, the length unit of the coordinates, or coordinate noise
+    below the tolerance.
+
+    Args:
+        section_data: SectionData object
+        tolerance: Coordinate rounding in mm
+
+    Returns:
+        Hex digest string
+    """
+    arrays = section_data.arrays
+    scale = section_data.length_scale
+    origin = np.asarray(section_origin(section_data)) * scale
+    polygon = section_data.polygon
+    rings = [_canonical_ring(np.asarray(polygon.exterior.coords)[:, :2] * scale - origin, tolerance)]
+    holes = [_canonical_ring(np.asarray(ring.coords)[:, :2] * scale - origin, tolerance)
+             for ring in polygon.interiors]
+    rings += sorted(holes, key=lambda ring: ring.tobytes())
+
+    bars = np.column_stack([np.round((arrays.rebar_xy - origin) / tolerance),
+                            np.round(arrays.rebar_area, 6),
+                            np.round(arrays.rebar_fy, 6),
+                            np.round(arrays.rebar_fu, 6)]) + 0.0  # no negative zeros
+    bars = bars[np.lexsort(bars.T[::-1])]
+
+    digest = hashlib.sha256()
+    # Coordinates are in mm already; the output units stay in, because the
+    # shared surface holds its results in the representative's units
+    digest.update(repr((round(arrays.fc, 6), round(arrays.Es, 6), float(tolerance),
+                        str(section_data.force_unit.units), str(section_data.moment_unit.units))).encode())
+    for values in rings + [bars]:
+        values = np.ascontiguousarray(values)
+        digest.update(repr((values.dtype.str, values.shape)).encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class SectionRegistry:
+    """
+    Locations of a building model grouped by section type, with one
+    interaction surface computed per type.
+    """
+    def __init__(self, angles=None, depths=None, strain_max=config.STRAIN_COMPRESSION_MAX,
+                 tolerance=1e-3, cache=None, workers=None):
+        """
+        Args:
+            angles, depths, strain_max: Analysis settings passed to InteractionSurface
+                (explicit depths are in the length unit of each type's first
+                registered section)
+            tolerance: Coordinate rounding in mm used for the signatures
+            cache: Optional SurfaceCache shared by all types
+            workers: Threads per surface (see compute_pmm)
+        """
+        self.angles = angles
+        self.depths = depths
+        self.strain_max = strain_max
+        self.tolerance = tolerance
+        self.cache = cache
+        self.workers = workers
+        self.locations = {}  # location -> signature
+        self.types = {}      # signature -> representative SectionData
+        self.surfaces = {}   # signature -> InteractionSurface
+        self.analyses = 0
+
+    def add(self, location, section_data):
+        """
+        Register the section used at a location.
+
+        Returns:
+            Signature of the section type
+        """
+        signature = canonical_signature(section_data, self.tolerance)
+        self.types.setdefault(signature, section_data)
+        self.locations[location] = signature
+        return signature
+
+    def signature(self, location):
+        return self.locations[location]
+
+    def surface(self, location):
+        """
+        Interaction surface of a location, computed once per section type.
+        """
+        signature = self.locations[location]
+        if signature not in self.surfaces:
+            self.surfaces[signature] = InteractionSurface(self.types[signature], self.angles, self.depths,
+                                                          self.strain_max, cache=self.cache,
+                                                          workers=self.workers)
+            self.analyses += 1
+        return self.surfaces[signature]
+
+    def analyse(self):
+        """
+        Compute the surfaces of all registered types.
+
+        Returns:
+            Dictionary location -> shared InteractionSurface
+        """
+        return {location: self.surface(location) for location in self.locations}
+
+    def groups(self):
+        """
+        Locations of every section type, in registration order.
+
+        Returns:
+            Dictionary signature -> list of locations
+        """
+        groups = {signature: [] for signature in self.types}
+        for location, signature in self.locations.items():
+            groups[signature].append(location)
+        return {signature: locations for signature, locations in groups.items() if locations}
+
+    def report(self):
+        """
+        Summary of the deduplication.
+
+        Returns:
+            Dictionary with the number of 'locations', 'distinct' section
+            types, surface 'analyses' actually run and the 'reduction' factor
+        """
+        distinct = len(self.groups())
+        return {'locations': len(self.locations),
+                'distinct': distinct,
+                'analyses': self.analyses,
+                'reduction': len(self.locations) / distinct if distinct else 1.0}
+
+    def write_report(self, filepath):
+        """
+        Write the type of every location to a CSV file.
+        """
+        type_index = {signature: i for i, signature in enumerate(self.groups())}
+        with open(filepath, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Location', 'Type', 'Signature'])
+            for location, signature in self.locations.items():
+                writer.writerow([location, type_index[signature], signature])
@@ -1,10 +1,12 @@
 from shapely.geometry import Polygon, LineString, MultiPolygon
 from shapely.affinity import translate
-from shapely.plotting import patch_from_polygon
-import matplotlib.pyplot as plt
 import numpy as np
 
-from RCSectionDesigner.units import Q_
+from RCSectionDesigner.units import to_quantity, INTERNAL_FORCE_UNIT, INTERNAL_MOMENT_UNIT
+from RCSectionDesigner.compressionBlock import clip_half_plane
+from RCSectionDesigner.SectionArrays import rotation_directions
+from RCSectionDesigner.instrumentation import metrics, report, reporting, GEOMETRY_CUT, CONCRETE_RESULTANT, \
+    REBAR_RESULTANTS, UNIT_CONVERSION
 
 def sectionCut(section_data, cut_y):
     x = section_data.ro_polygon.exterior.xy[0]
@@ -33,129 +35,136 @@ def beta1(fc):
         # fc is a pint Quantity, extract magnitude in MPa
         fc_MPa_value = fc.to('MPa').magnitude
     else:
-        print("Invalid input: fc does not have units. Please ensure fc is a pint Quantity with MPa unit.")
+        report("Invalid input: fc does not have units. Please ensure fc is a pint Quantity with MPa unit.")
         return None
     
-    print(f'fc = {fc_MPa_value} MPa')
-    
-    # Calculate beta1 according to ACI 318
-    if fc_MPa_value <= 28:
-        return 0.85
-    elif fc_MPa_value <= 55:
-        return max(0.85 - 0.05 * (fc_MPa_value - 28) / 7, 0.65)
-    else:
-        return 0.65
+    report(f'fc = {fc_MPa_value} MPa')
+    return beta1_MPa(fc_MPa_value)
+
+def beta1_MPa(fc_MPa_value):
+    # Calculate beta1 according to ACI 318 (fc as a plain float in MPa, or an array of them)
+    fc = np.asarray(fc_MPa_value, dtype=float)
+    beta1 = np.where(fc <= 55, np.clip(0.85 - 0.05 * (fc - 28) / 7, 0.65, 0.85), 0.65)
+    return beta1 if beta1.ndim else float(beta1)
 
 class StrainCompatibility:
     def __init__ (self, section_data, neutral_axis_y = 0):
         self.section_data = section_data
-        self.beta1 = beta1(section_data.concrete_material_properties)
+        self.beta1 = beta1_MPa(section_data.fc_MPa)
         self.neutral_axis_y = neutral_axis_y
-        self.topconfiber = np.max(section_data.ro_polygon.exterior.xy[1])
-        self.bottomconfiber = np.min(section_data.ro_polygon.exterior.xy[1])
-        self.toprebarfiber = np.max([coord.y for coord in section_data.ro_rebarCoor.geoms])
-        self.bottomrebarfiber = np.min([coord.y for coord in section_data.ro_rebarCoor.geoms])
+        self.rebar_y = section_data.ro_rebar_xy[:, 1]
+        self.topconfiber = np.max(section_data.ro_vertices[:, 1])
+        self.bottomconfiber = np.min(section_data.ro_vertices[:, 1])
+        self.toprebarfiber = np.max(self.rebar_y)
+        self.bottomrebarfiber = np.min(self.rebar_y)
         self.cut_y = self.topconfiber - (self.topconfiber - self.neutral_axis_y) * self.beta1
-        self.compression_polygon = sectionCut(section_data, self.cut_y)
+        metrics.count('strain_compatibility')
+        with metrics.stage(GEOMETRY_CUT):
+            self.compression_area, self.compression_centroid = self.cal_compression_zone(section_data)
+        self._compression_polygon = None
         # self.strainline = cal_strainline(cut_y, section_data.concrete_compressive_strain, section_data.length_unit)
         self.concrete_compressive_strain = 0.003  # Typical value for concrete
-        self.compression_force = self.cal_conrete_compresive_force(section_data)
+        # Internal float results (N), wrapped into the user's force unit below
+        with metrics.stage(CONCRETE_RESULTANT):
+            self.compression_force_N = self.cal_conrete_compresive_force(section_data)
         self.compression_rebar = self.get_compression_rebar(section_data)  # Placeholder for compression rebar data
         self.tension_rebar = self.get_tension_rebar(section_data)  # Placeholder for tension rebar data
-        self.rebar_force = self.cal_rebar_force(section_data)
+        with metrics.stage(REBAR_RESULTANTS):
+            self.rebar_force_N = self.cal_rebar_force(section_data)
+        with metrics.stage(UNIT_CONVERSION):
+            self.compression_force = to_quantity(self.compression_force_N, INTERNAL_FORCE_UNIT, section_data.force_unit)
+            self.rebar_force = to_quantity(self.rebar_force_N, INTERNAL_FORCE_UNIT, section_data.force_unit)
+        report("rebar force: \n", self.rebar_force)
         self.length_unit = section_data.length_unit
         # print("Compression Polygon:", self.compression_polygon)
         # print("compression_rebar",self.compression_rebar)
 
+    @property
+    def compression_polygon(self):
+        # Only needed for plotting, the resultants come from cal_compression_zone
+        if self._compression_polygon is None:
+            self._compression_polygon = sectionCut(self.section_data, self.cut_y)
+        return self._compression_polygon
+
+    def cal_compression_zone(self, section_data):
+        # Clip the unrotated outline along the rotated y axis (no geometry rebuild)
+        scale = section_data.length_scale
+        origin = np.asarray(section_data.rotation_origin)
+        ex, d = rotation_directions(section_data.rotation_angle)
+        area, Sx, Sy = clip_half_plane(section_data.arrays.edges, origin * scale, d,
+                                       [(self.cut_y - origin[1]) * scale])
+        if area[0] <= 0:
+            return 0.0, (0.0, self.cut_y)
+        # Centroid in the rotated frame, back in length_unit
+        centroid_x = origin[0] + (ex[0] * Sy[0] + ex[1] * Sx[0]) / area[0] / scale
+        centroid_y = origin[1] + (d[0] * Sy[0] + d[1] * Sx[0]) / area[0] / scale
+        return area[0] / scale**2, (centroid_x, centroid_y)
+
     def cal_conrete_compresive_force(self, section_data):
-        area_unit = section_data.length_unit**2
-        area = Q_(self.compression_polygon.area, area_unit)
-        fc = section_data.concrete_material_properties
-        Pn = area * fc
-        Pn = Pn.to('kN')  # Convert force to kN
-        return Pn
+        # Force in N from area (scaled to mm^2) and fc in MPa
+        area_mm2 = self.compression_area * section_data.length_scale**2
+        return area_mm2 * section_data.fc_MPa
 
     def cal_rebar_force(self, section_data):
-        rebar_force = []
         slope = self.concrete_compressive_strain / (self.topconfiber - self.neutral_axis_y)
-        Es = section_data.Es # Young's modulus for steel
-
-        for idx, coord in enumerate(section_data.ro_rebarCoor.geoms):
-            # Calculate strain
-            rebar_strain = self.concrete_compressive_strain - (slope * (self.topconfiber - coord.y))
-            
-            # Get material properties
-            rebar_key = 'R' + str(idx)
-            fy = section_data.rebars_material_properties[rebar_key]['fy']
-            rebar_area = section_data.rebars_material_properties[rebar_key]['Area']
-            
-            # Calculate stress (with yield check)
-            if abs(rebar_strain * Es) <= fy:
-                stress = rebar_strain * Es  # Elastic range
-            else:
-                stress = fy if rebar_strain > 0 else -fy  # Yielded
-            
-            # Calculate area and force: F = stress × area
-            force = stress * rebar_area
-            force = force.to('kN')  # Convert force to kN
-            
-            rebar_force.append(force)
-        print ("rebar force: \n", rebar_force)
-        return rebar_force
+        rebar_strain = self.concrete_compressive_strain - slope * (self.topconfiber - self.rebar_y)
+
+        # Elastic-perfectly plastic stress (MPa), F = stress × area (N)
+        fy = section_data.rebar_fy_MPa
+        stress = np.clip(rebar_strain * section_data.Es_MPa, -fy, fy)
+        return stress * section_data.rebar_area_mm2
 
     def PM_Point(self):
         # Calculate total axial force (compression positive)
-        print("Rebar Forces:", self.rebar_force)
-        print("Concrete Compression Force:", self.compression_force)
-        P_n = 0
-        for force in self.rebar_force:
-            P_n += force
-        P_n += self.compression_force
-        print("Total Axial Force P_n:", P_n)
+        report("Rebar Forces:", self.rebar_force)
+        report("Concrete Compression Force:", self.compression_force)
+        force_unit = self.section_data.force_unit
+        moment_unit = self.section_data.moment_unit
+        length_scale = self.section_data.length_scale
+        P_n_N = self.rebar_force_N.sum() + self.compression_force_N
         
-        # Calculate moment contribution from concrete compression
-        centroid = self.compression_polygon.centroid
-        concrete_moment_arm = Q_(self.topconfiber - centroid.y, self.length_unit)
-        M_concrete = self.compression_force * concrete_moment_arm
-        print("Concrete Moment M_concrete:", M_concrete)
+        # Calculate moment contribution from concrete compression (N*mm)
+        centroid_y = self.compression_centroid[1]
+        M_concrete = self.compression_force_N * (self.topconfiber - centroid_y) * length_scale
         
         # Calculate moment contribution from all rebars
-        M_rebar = 0
-        for index, force in enumerate(self.rebar_force):
-            coord = self.section_data.ro_rebarCoor.geoms[index]
-            rebar_moment_arm = Q_(self.topconfiber - coord.y, self.length_unit)
-            M_rebar += force * rebar_moment_arm
-
-        M_n = M_concrete + M_rebar
-        M_n = M_n.to('kN*m')  # Convert moment to kN*m
-        print("Total Moment M_n:", M_n)
+        M_rebar = self.rebar_force_N @ (self.topconfiber - self.rebar_y) * length_scale
+
+        with metrics.stage(UNIT_CONVERSION):
+            P_n = to_quantity(P_n_N, INTERNAL_FORCE_UNIT, force_unit)
+            M_n = to_quantity(M_concrete + M_rebar, INTERNAL_MOMENT_UNIT, moment_unit)
+        report("Total Axial Force P_n:", P_n)
+        if reporting():
+            report("Concrete Moment M_concrete:", to_quantity(M_concrete, INTERNAL_MOMENT_UNIT, moment_unit))
+        report("Total Moment M_n:", M_n)
         return {'P_n': P_n, 'M_n': M_n}
 
     def plot_PMM(self):
+        import matplotlib.pyplot as plt
         PMM = self.PM_Point()
         fig, ax = plt.subplots()
         ax.plot(PMM['M_n'].magnitude, PMM['P_n'].magnitude, 'bo')
-        ax.set_xlabel(f'Moment (kN·m)')
-        ax.set_ylabel(f'Axial Force (kN)')
+        ax.set_xlabel(f'Moment ({PMM["M_n"].units:~P})')
+        ax.set_ylabel(f'Axial Force ({PMM["P_n"].units:~P})')
         ax.set_title('P-M Interaction Point')
         plt.grid()
         plt.show()
 
     def get_compression_rebar(self, section_data):
         compression_rebar = {}
-        for idx, coord in enumerate(section_data.ro_rebarCoor.geoms):
-            if coord.y > self.cut_y:
-                compression_rebar[idx] = (coord.x, coord.y)
+        for idx in np.flatnonzero(self.rebar_y > self.cut_y):
+            compression_rebar[int(idx)] = tuple(section_data.ro_rebar_xy[idx].tolist())
         return compression_rebar
     
     def get_tension_rebar(self, section_data):
         tension_rebar = {}
-        for idx, coord in enumerate(section_data.ro_rebarCoor.geoms):
-            if coord.y < self.cut_y:
-                tension_rebar[idx] = (coord.x, coord.y)
+        for idx in np.flatnonzero(self.rebar_y < self.cut_y):
+            tension_rebar[int(idx)] = tuple(section_data.ro_rebar_xy[idx].tolist())
         return tension_rebar
 
     def plot(self):
+        import matplotlib.pyplot as plt
+        from shapely.plotting import patch_from_polygon
         fig, ax = plt.subplots(figsize=(10, 8))
         patch_concrete = patch_from_polygon(self.compression_polygon, facecolor='gray', edgecolor='black')
         compression_rebar_x = [coord[0] for coord in self.compression_rebar.values()]
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from RCSectionDesigner import config
+from RCSectionDesigner.InteractionSurface import compute_pmm
+
+# Bump when compute_pmm changes in a way that affects stored results
+CACHE_VERSION = 1
+
+
+def section_signature(section_data, angles, depths, strain_max=config.STRAIN_COMPRESSION_MAX):
+    """
+    Content hash of everything an interaction surface depends on: geometry,
+    rebar layout and materials (in internal units), fc, the material catalog
+    and the analysis settings.
+
+    Returns:
+        Hex digest string
+    """
+    arrays = section_data.arrays
+    digest = hashlib.sha256()
+    digest.update(repr((CACHE_VERSION, config.ANALYSIS_POINTS, float(strain_max),
+                        arrays.Es, arrays.fc,
+                        section_data.material_catalog.fingerprint)).encode())
+    for values in (arrays.vertices, arrays.edge_start, arrays.edge_end,
+                   arrays.rebar_x, arrays.rebar_y, arrays.rebar_area,
+                   arrays.rebar_fy, arrays.rebar_fu,
+                   np.asarray(angles, dtype=float), np.asarray(depths, dtype=float)
+                   * section_data.length_scale):
+        values = np.ascontiguousarray(values, dtype=float)
+        digest.update(repr(values.shape).encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class SurfaceCache:
+    """
+    Persistent cache of computed interaction surfaces.
+
+    Each surface is an uncompressed .npz file named by its section signature,
+    holding P, Mx and My in the internal units (N, N*mm). Reads refresh the
+    file's modification time, and the least recently used files are removed
+    once the directory grows past max_bytes.
+    """
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Args:
+            cache_dir: Cache directory (default: config.SURFACE_CACHE_DIR)
+            max_bytes: Size limit of the cache (default: config.SURFACE_CACHE_MAX_BYTES)
+        """
+        self.cache_dir = cache_dir or config.SURFACE_CACHE_DIR
+        self.max_bytes = config.SURFACE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.npz')
+
+    def get(self, key):
+        """
+        Stored (P, Mx, My) arrays for a signature, or None if not cached.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                result = data['P'], data['Mx'], data['My']
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return result
+
+    def put(self, key, P, Mx, My):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file, P=P, Mx=Mx, My=My)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            # evict() only sees .npz files, a leftover temporary file would never be removed
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used surfaces until the cache fits in max_bytes.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.npz'):
+                    os.remove(entry.path)
+
+    def get_or_compute(self, section_data, angles, depths, strain_max=config.STRAIN_COMPRESSION_MAX, workers=None):
+        """
+        compute_pmm with the result looked up in / stored to the cache.
+
+        Returns:
+            Tuple (P, Mx, My) in internal units, as returned by compute_pmm
+        """
+        key = section_signature(section_data, angles, depths, strain_max)
+        result = self.get(key)
+        if result is None:
+            result = compute_pmm(section_data, angles, depths, strain_max, workers)
+            self.put(key, *result)
+        return result
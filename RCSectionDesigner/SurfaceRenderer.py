@@ -0,0 +1,232 @@
+"""
+Headless rendering of interaction surfaces and section views to files.
+
+A SurfaceRenderer owns two matplotlib Figures on the non-interactive Agg
+canvas (no pyplot, no windows) and redraws them for every section, so a
+report of hundreds of sections creates two figures in total. Per section it
+saves the triangulated P-Mx-My surface and the section view with the
+compression zone at the governing point of a chosen angle as PNG and/or SVG.
+render_batch spreads sections over worker processes, each with its own
+renderer; jobs are plain arrays, and only a few are in flight at a time.
+A job that fails is recorded with its error and the batch goes on.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from RCSectionDesigner.BatchRunner import safe_filename
+from RCSectionDesigner.InteractionSurface import bending_directions, section_origin
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+
+
+def surface_triangles(n_angles, n_depths):
+    """
+    Triangles of the (angle, depth) grid of a surface, closed around the angles.
+
+    Returns:
+        (2 * n_angles * (n_depths - 1), 3) array of flat point indices
+    """
+    i, j = np.meshgrid(np.arange(n_angles), np.arange(n_depths - 1), indexing='ij')
+    a = i * n_depths + j
+    b = (i + 1) % n_angles * n_depths + j
+    lower = np.stack([a, b, b + 1], axis=-1).reshape(-1, 3)
+    upper = np.stack([a, b + 1, a + 1], axis=-1).reshape(-1, 3)
+    return np.concatenate([lower, upper])
+
+
+def render_job(section_id, surface):
+    """
+    Plain-array description of a section and its surface for SurfaceRenderer.render
+    (picklable, for worker processes).
+    """
+    section = surface.section_data
+    return {'section_id': str(section_id),
+            'angles': surface.angles, 'depths': np.asarray(surface.depths),
+            'P': surface.P, 'Mx': surface.Mx, 'My': surface.My,
+            'force_unit': f'{surface.force_unit.units:~P}', 'moment_unit': f'{surface.moment_unit.units:~P}',
+            'length_unit': f'{section.length_unit.units:~P}',
+            'outline': np.asarray(section.polygon.exterior.coords),
+            'rebar_xy': np.array([(point.x, point.y) for point in section.rebarCoor.geoms]).reshape(-1, 2),
+            'rebar_diameter': np.asarray(section.sectionRebarDiameter, dtype=float) / section.length_scale,
+            'origin': np.asarray(section_origin(section)),
+            'beta1': beta1_MPa(section.arrays.fc)}
+
+
+class SurfaceRenderer:
+    """
+    Reusable Agg figures for the surface and section view of one section at a time.
+    """
+    def __init__(self, angle=0.0, formats=('png',), dpi=100, surface_size=(7, 6), section_size=(6, 6)):
+        """
+        Args:
+            angle: Bending angle (degrees) of the section view
+            formats: File formats to save ('png', 'svg', ...)
+            dpi: Raster resolution
+            surface_size, section_size: Figure sizes in inches
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.angle = angle
+        self.formats = tuple(formats)
+        self.dpi = dpi
+        self.surface_figure = Figure(figsize=surface_size)
+        self.section_figure = Figure(figsize=section_size)
+        FigureCanvasAgg(self.surface_figure)
+        FigureCanvasAgg(self.section_figure)
+        self.surface_axes = self.surface_figure.add_subplot(projection='3d')
+        self.section_axes = self.section_figure.add_subplot()
+
+    def _governing_point(self, job):
+        # Angle row nearest to self.angle and its depth of maximum moment about the neutral axis
+        angles = np.asarray(job['angles'])
+        row = int(np.argmin(np.abs((angles - self.angle + 180) % 360 - 180)))
+        d = bending_directions(angles[row])[0]
+        M = d[1] * job['Mx'][row] + d[0] * job['My'][row]
+        column = int(np.argmax(M))
+        depths = np.broadcast_to(job['depths'], np.shape(job['P']))
+        return row, column, depths[row, column]
+
+    def draw_surface(self, job, row, column):
+        ax = self.surface_axes
+        ax.clear()
+        n_a, n_d = np.shape(job['P'])
+        Mx, My, P = (np.ravel(job[key]) for key in ('Mx', 'My', 'P'))
+        ax.plot_trisurf(Mx, My, P, triangles=surface_triangles(n_a, n_d),
+                        cmap='viridis', linewidth=0.1, edgecolor='none', alpha=0.9)
+        ax.scatter(job['Mx'][row, column], job['My'][row, column], job['P'][row, column],
+                   color='red', s=30, depthshade=False)
+        ax.set_xlabel(f"Mx ({job['moment_unit']})")
+        ax.set_ylabel(f"My ({job['moment_unit']})")
+        ax.set_zlabel(f"P ({job['force_unit']})")
+        ax.set_title(f"{job['section_id']}: P-Mx-My interaction surface")
+
+    def draw_section(self, job, row, depth):
+        import shapely
+        from matplotlib.patches import Circle
+        from shapely.plotting import patch_from_polygon
+
+        ax = self.section_axes
+        ax.clear()
+        outline = shapely.Polygon(job['outline'])
+        d = bending_directions(job['angles'][row])[0]
+        proj = (job['outline'] - job['origin']) @ d
+        top = proj.max()
+        size = 10 * (proj.max() - proj.min())
+        # Concrete beyond the block edge (top - beta1 * c) towards the compressed face
+        edge = top - job['beta1'] * depth
+        normal = np.array([-d[1], d[0]])
+        center = job['origin'] + d * (edge + size)
+        block = shapely.Polygon([center + d * size + normal * size, center - d * size + normal * size,
+                                 center - d * size - normal * size, center + d * size - normal * size])
+        ax.add_patch(patch_from_polygon(outline, facecolor='lightgray', edgecolor='black'))
+        zone = outline.intersection(block)
+        if not zone.is_empty:
+            ax.add_patch(patch_from_polygon(zone, facecolor='gray', edgecolor='black', alpha=0.8))
+        # Neutral axis
+        axis = job['origin'] + d * (top - depth)
+        ax.axline(axis, axis + normal, color='black', linestyle='--', linewidth=1)
+        compression = (job['rebar_xy'] - job['origin']) @ d > top - depth
+        for (x, y), diameter, compressed in zip(job['rebar_xy'], job['rebar_diameter'], compression):
+            ax.add_patch(Circle((x, y), diameter / 2, color='red' if compressed else 'blue'))
+        min_x, min_y = job['outline'].min(axis=0)
+        max_x, max_y = job['outline'].max(axis=0)
+        padding = max(max_x - min_x, max_y - min_y) * 0.1
+        ax.set_xlim(min_x - padding, max_x + padding)
+        ax.set_ylim(min_y - padding, max_y + padding)
+        ax.set_aspect('equal', 'box')
+        ax.grid(True, alpha=0.3)
+        ax.set_xlabel(f"X ({job['length_unit']})")
+        ax.set_ylabel(f"Y ({job['length_unit']})")
+        ax.set_title(f"{job['section_id']}: angle {job['angles'][row]:g}, c = {depth:.4g} {job['length_unit']}")
+
+    def render(self, job, directory):
+        """
+        Draw and save the surface and section view of one render_job, as
+        <section_id>_surface.<format> and <section_id>_section.<format>
+        (section_id made safe with safe_filename).
+
+        Returns:
+            List of written file paths
+        """
+        row, column, depth = self._governing_point(job)
+        self.draw_surface(job, row, column)
+        self.draw_section(job, row, depth)
+        paths = []
+        for name, figure in (('surface', self.surface_figure), ('section', self.section_figure)):
+            for fmt in self.formats:
+                path = os.path.join(directory, f"{safe_filename(job['section_id'])}_{name}.{fmt}")
+                figure.savefig(path, dpi=self.dpi)
+                paths.append(path)
+        return paths
+
+
+# Renderer of a worker process, created by its first job
+_worker_renderer = None
+
+
+def _record(paths=(), error=None):
+    return {'status': 'error' if error else 'ok', 'paths': list(paths),
+            'error': f"{type(error).__name__}: {error}" if error else ''}
+
+
+def _render_in_worker(job, directory, options):
+    global _worker_renderer
+    try:
+        if _worker_renderer is None:
+            _worker_renderer = SurfaceRenderer(**options)
+        return _record(_worker_renderer.render(job, directory))
+    except Exception as error:
+        return _record(error=error)
+
+
+def render_batch(jobs, directory, workers=None, max_pending=None, **options):
+    """
+    Render many sections to files.
+
+    Args:
+        jobs: Iterable of render_job dictionaries (consumed lazily)
+        directory: Output directory (created if missing)
+        workers: Worker processes (default: render in this process)
+        max_pending: Jobs submitted but not finished (default: 2 * workers),
+            bounds the memory held by a large or lazy job iterable
+        **options: SurfaceRenderer arguments (angle, formats, dpi, sizes)
+
+    Returns:
+        Dictionary section_id -> record with 'status' ('ok' or 'error'),
+        the written 'paths' and the 'error' message of a failed job
+    """
+    os.makedirs(directory, exist_ok=True)
+    results = {}
+    if not workers or workers <= 1:
+        renderer = SurfaceRenderer(**options)
+        for job in jobs:
+            try:
+                results[job['section_id']] = _record(renderer.render(job, directory))
+            except Exception as error:
+                results[job['section_id']] = _record(error=error)
+        return results
+
+    def collect(done):
+        # A worker that died takes its job with it; the others are unaffected
+        for future in done:
+            section_id = pending.pop(future)
+            try:
+                results[section_id] = future.result()
+            except Exception as error:
+                results[section_id] = _record(error=error)
+
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for job in jobs:
+            try:
+                pending[pool.submit(_render_in_worker, job, directory, options)] = job['section_id']
+            except Exception as error:
+                results[job['section_id']] = _record(error=error)
+            if len(pending) >= max_pending:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        collect(list(pending))
+    return results
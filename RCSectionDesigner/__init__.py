@@ -4,17 +4,59 @@ RC-InteractionD package initialization.
 
 __version__ = "0.1.0"
 
+from .MaterialCatalog import *
 from .SectionData import *
 from .inputNOutputUnitSetting import *
 from .plotRCSection import *
 from .StrainCompatibility import *
+from .InteractionSurface import *
+from .SurfaceCache import *
+from .CapacityCheck import *
+from .CapacitySolver import *
+from .AdaptiveSampler import *
+from .SectionRegistry import *
+from .SectionModel import *
+from .FiberSection import *
+from .MomentCurvature import *
+from .MonteCarlo import *
+from .LayoutOptimizer import *
+from .BulkLoader import *
+from .ResultWriter import *
+from .SurfaceRenderer import *
+from .BiaxialApproximation import *
+from .instrumentation import metrics, collect, quiet
 from .config import *
 
+
+def __getattr__(name):
+    # config reads REBAR_GRADE lazily, so `from .config import *` cannot pick it up
+    if name == 'REBAR_GRADE':
+        from . import config
+        return config.REBAR_GRADE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = ['SectionData', 
            'material', 
+           'MaterialCatalog', 'load_catalog', 
            'StrainCompatibility', 
+           'InteractionSurface', 
+           'SurfaceCache', 
+           'CapacityChecker', 'check_section', 
+           'CapacitySolver', 
+           'AdaptiveSampler', 
+           'SectionRegistry', 'canonical_signature', 
+           'SectionModel', 
+           'FiberSection', 'HognestadConcrete', 'ManderConcrete', 'BilinearSteel', 
+           'MomentCurvature', 
+           'MonteCarloCapacity', 
+           'LayoutOptimizer', 'perimeter_layout', 'write_layout', 
+           'SectionLoader', 'load_sections', 
+           'ResultWriter', 'read_results', 'read_sections', 
+           'SurfaceRenderer', 'render_batch', 'render_job', 
+           'BiaxialApproximation', 
            'plotRCSection', 
            'ureg', 'Q_', 
            'build_rotated_section',
            'get_coordinates_rotated',
+           'metrics', 'collect', 'quiet', 
            'config']
\ No newline at end of file
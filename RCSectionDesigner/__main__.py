@@ -0,0 +1,128 @@
+"""
+Command line entry point: python -m RCSectionDesigner <command> ...
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from RCSectionDesigner import config
+
+
+def _section_arguments(parser):
+    parser.add_argument('--fc', type=float, required=True, help="Concrete strength f'c (MPa)")
+    parser.add_argument('--rebar', default=config.REBAR_COORDINATE_FILE, help='Rebar coordinate CSV')
+    parser.add_argument('--section', default=config.SECTION_COORDINATE_FILE, help='Section coordinate CSV')
+    parser.add_argument('--angle-step', type=float, default=10.0, help='Angle step of the surface (degrees)')
+
+
+def run_check(args):
+    from RCSectionDesigner.SectionData import SectionData
+    from RCSectionDesigner.InteractionSurface import InteractionSurface
+    from RCSectionDesigner.CapacityCheck import CapacityChecker, read_load_combinations, write_check_results
+
+    section = SectionData(args.fc, rebar_filepath=args.rebar, section_filepath=args.section)
+    names, Pu, Mux, Muy = read_load_combinations(args.loads)
+    if args.approximate:
+        from RCSectionDesigner.BiaxialApproximation import BiaxialApproximation
+        approximation = BiaxialApproximation(section, method=args.approximate, both_signs=not args.symmetric)
+        result = approximation.check(Pu, Mux, Muy)
+    else:
+        surface = InteractionSurface(section, angles=np.arange(0, 360, args.angle_step))
+        result = CapacityChecker(surface).check(Pu, Mux, Muy)
+
+    output = args.output
+    if output is None:
+        config.ensure_output_dirs()
+        output = os.path.join(config.OUTPUT_DIR, 'capacity_check.csv')
+    write_check_results(output, names, Pu, Mux, Muy, result)
+    governing = result['governing']
+    if governing is not None:
+        print(f"{len(names)} combinations, {int((~result['passed']).sum())} failed, "
+              f"max ratio {result['ratio'][governing]:.3f} ({names[governing]})")
+    print(f"Results written to {output}")
+    return 0 if result['passed'].all() else 1
+
+
+def run_batch_command(args):
+    from RCSectionDesigner.BatchRunner import discover_sections, run_batch
+
+    jobs = discover_sections(args.sections, fc=args.fc)
+    records = run_batch(jobs, output_dir=args.output, max_workers=args.workers,
+                        max_memory_mb=args.max_memory, angle_step=args.angle_step,
+                        results_file=args.results)
+    failed = [record for record in records if record['status'] != 'ok']
+    print(f"{len(records)} sections analysed, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+def run_render(args):
+    from RCSectionDesigner.BulkLoader import SectionLoader
+    from RCSectionDesigner.InteractionSurface import InteractionSurface
+    from RCSectionDesigner.SurfaceRenderer import render_batch, render_job
+    from RCSectionDesigner.instrumentation import quiet
+
+    loader = SectionLoader(args.sections, fc=args.fc, strict=False)
+    for name, messages in loader.errors.items():
+        print(f"{name}: skipped ({'; '.join(messages)})")
+    angles = np.arange(0, 360, args.angle_step)
+
+    def jobs():
+        # Quiet only while building: the generator is suspended at yield
+        for name, section in loader:
+            with quiet():
+                job = render_job(name, InteractionSurface(section, angles))
+            yield job
+
+    output = args.output or os.path.join(config.OUTPUT_DIR, 'plots')
+    results = render_batch(jobs(), output, workers=args.workers, angle=args.angle, formats=args.formats)
+    failed = {name: record for name, record in results.items() if record['status'] == 'error'}
+    for name, record in failed.items():
+        print(f"{name}: failed ({record['error']})")
+    print(f"{len(results) - len(failed)} sections rendered to {output}")
+    return 1 if loader.errors or failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m RCSectionDesigner')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help='Check load combinations against the interaction surface')
+    _section_arguments(check)
+    check.add_argument('--loads', required=True, help='Load combination CSV (Combination, Pu, Mux, Muy)')
+    check.add_argument('--output', help='Result CSV (default: OUTPUT_DIR/capacity_check.csv)')
+    check.add_argument('--approximate', choices=['reciprocal', 'contour'],
+                       help='Screen with the Bresler approximation from the uniaxial curves only')
+    check.add_argument('--symmetric', action='store_true',
+                       help='With --approximate: only the 0/90 degree curves, rating |Mux|, |Muy| '
+                            '(sections with equal capacity for both moment signs)')
+    check.set_defaults(func=run_check)
+
+    batch = commands.add_parser('batch', help='Analyse many sections in parallel')
+    batch.add_argument('sections', help='Directory of section folders, manifest CSV, or bulk section table')
+    batch.add_argument('--fc', type=float, help="Concrete strength f'c (MPa) for sections without one")
+    batch.add_argument('--output', help='Result directory (default: RESULTS_DIR/batch)')
+    batch.add_argument('--workers', type=int, help='Maximum number of worker processes')
+    batch.add_argument('--max-memory', type=float, help='Memory limit per worker (MB)')
+    batch.add_argument('--angle-step', type=float, default=10.0, help='Angle step of the surface (degrees)')
+    batch.add_argument('--results', help='Also stream all surfaces into one CSV/Parquet file in the result directory')
+    batch.set_defaults(func=run_batch_command)
+
+    render = commands.add_parser('render', help='Save surface and section plots of a bulk section table')
+    render.add_argument('sections', help='Bulk section table (CSV or Parquet)')
+    render.add_argument('--fc', type=float, help="Concrete strength f'c (MPa) for sections without one")
+    render.add_argument('--output', help='Plot directory (default: OUTPUT_DIR/plots)')
+    render.add_argument('--workers', type=int, help='Rendering processes (default: one, in this process)')
+    render.add_argument('--angle', type=float, default=0.0, help='Bending angle of the section views (degrees)')
+    render.add_argument('--angle-step', type=float, default=10.0, help='Angle step of the surface (degrees)')
+    render.add_argument('--formats', nargs='+', default=['png'], help='File formats, e.g. png svg')
+    render.set_defaults(func=run_render)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,21 +22,25 @@ REBAR_GRADE_FILE = os.path.join(MATERIAL_DATA_DIR, 'rebarGrade.csv')
 REBAR_SECTION_PROPERTY_FILE = os.path.join(MATERIAL_DATA_DIR, 'rebarSectionProperty.csv')
 
 def setRebarGradedata():
+    # Yield strength per grade, taken from the shared material catalog
+    from RCSectionDesigner.MaterialCatalog import load_catalog
     rebar_grade_data = {}
     try:
-        with open(REBAR_GRADE_FILE, 'r') as file:
-            lines = file.readlines()
-            for line in lines[1:]:  # Skip header
-                parts = line.strip().split(',')
-                grade = parts[0]
-                fy = float(parts[1])  # Yield strength in MPa 
-                rebar_grade_data[grade] = Q_(fy, 'MPa')
+        catalog = load_catalog(REBAR_GRADE_FILE, REBAR_SECTION_PROPERTY_FILE)
+        for grade, prop in catalog.grades.items():
+            rebar_grade_data[grade] = Q_(prop['fy'], 'MPa')
     except FileNotFoundError:
         print(f"Warning: Rebar grade file '{REBAR_GRADE_FILE}' not found. Using default grades.")
         print (rebar_grade_data)
     return rebar_grade_data
 
-REBAR_GRADE = setRebarGradedata()
+def __getattr__(name):
+    # REBAR_GRADE needs the grade table, read it on first access instead of at import
+    if name == 'REBAR_GRADE':
+        global REBAR_GRADE
+        REBAR_GRADE = setRebarGradedata()
+        return REBAR_GRADE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 REBAR_ELASTIC_MODULUS = Q_(200, 'GPa')  # Default elastic modulus for steel rebars
 
@@ -53,13 +57,28 @@ STRAIN_TENSION_YIELD = 0.002  # Steel yield strain for SD400
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
 RESULTS_DIR = os.path.join(BASE_DIR, 'results')
 
-# Create output directories if they don't exist
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(RESULTS_DIR, exist_ok=True)
+# Interaction surface cache (see SurfaceCache.py)
+SURFACE_CACHE_DIR = os.path.join(RESULTS_DIR, 'surface_cache')
+SURFACE_CACHE_MAX_BYTES = 256 * 1024**2  # Least recently used surfaces are evicted above this size
+
+def ensure_output_dirs():
+    """
+    Create the output directories if they don't exist (called by the code
+    that writes results, not at import).
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
 
 # Debug mode
 DEBUG = False
 
+# Console output of the analysis classes (beta1, StrainCompatibility, PM_Point);
+# switch off for sweeps, see instrumentation.quiet()
+VERBOSE = True
+
+# Collect per-stage timers and counters from the start (see instrumentation.collect())
+INSTRUMENTATION = False
+
 if __name__ == "__main__":
     # Print all paths for verification
     print("RC-InteractionD Configuration")
@@ -0,0 +1,158 @@
+"""
+Silenceable reports and per-stage metrics of the analysis hot paths.
+
+The analysis classes report intermediate values through report(): they are
+printed while config.VERBOSE is set and passed to the 'RCSectionDesigner'
+logger at DEBUG level; with both off nothing is formatted. Stage timers and
+counters are collected in the shared `metrics` object while it is enabled
+(config.INSTRUMENTATION at import, or the collect() context manager);
+disabled, a stage costs one attribute check.
+
+    with collect() as stats:
+        InteractionSurface(section)
+    stats.to_json('profile.json')
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from RCSectionDesigner import config
+
+logger = logging.getLogger('RCSectionDesigner')
+
+# Stages timed by the analysis code
+GEOMETRY_CUT = 'geometry_cut'
+CONCRETE_RESULTANT = 'concrete_resultant'
+REBAR_RESULTANTS = 'rebar_resultants'
+UNIT_CONVERSION = 'unit_conversion'
+
+
+def report(message, *values):
+    """
+    Print `message` and `values` like print() while config.VERBOSE is set,
+    and log them at DEBUG level.
+    """
+    if config.VERBOSE:
+        print(message, *values)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(' '.join(map(str, (message, *values))))
+
+
+def reporting():
+    """
+    True if report() output goes anywhere (to skip building costly messages).
+    """
+    return config.VERBOSE or logger.isEnabledFor(logging.DEBUG)
+
+
+@contextmanager
+def quiet():
+    """
+    Suppress the console reports inside the block.
+    """
+    previous = config.VERBOSE
+    config.VERBOSE = False
+    try:
+        yield
+    finally:
+        config.VERBOSE = previous
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_NO_TIMER = nullcontext()
+
+
+class Metrics:
+    """
+    Accumulated stage timings (seconds, calls) and event counters.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+
+    def stage(self, name):
+        """
+        Context manager timing one execution of a stage (no-op when disabled).
+        """
+        return _Timer(self, name) if self.enabled else _NO_TIMER
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            total = self.timers.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        """
+        Returns:
+            Dictionary with 'timers' (name -> {'seconds', 'calls'}) and 'counters'
+        """
+        with self._lock:
+            return {'timers': {name: {'seconds': seconds, 'calls': calls}
+                               for name, (seconds, calls) in self.timers.items()},
+                    'counters': dict(self.counters)}
+
+    def to_json(self, filepath=None):
+        """
+        Metrics as a JSON string, also written to filepath if given.
+        """
+        text = json.dumps(self.snapshot(), indent=1)
+        if filepath is not None:
+            with open(filepath, 'w') as file:
+                file.write(text)
+        return text
+
+
+metrics = Metrics(enabled=config.INSTRUMENTATION)
+
+
+@contextmanager
+def collect(reset=True, verbose=False):
+    """
+    Collect metrics inside the block.
+
+    Args:
+        reset: Start from zero instead of adding to earlier metrics
+        verbose: Keep the console reports (default: suppressed)
+
+    Yields:
+        The shared Metrics object
+    """
+    previous = metrics.enabled, config.VERBOSE
+    if reset:
+        metrics.reset()
+    metrics.enabled = True
+    config.VERBOSE = verbose and previous[1]
+    try:
+        yield metrics
+    finally:
+        metrics.enabled, config.VERBOSE = previous
@@ -1,9 +1,5 @@
-from matplotlib.patches import Circle, Polygon
 import numpy as np
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-
 
 def plot_rc_section(sectionData):
     """
@@ -12,6 +8,8 @@ def plot_rc_section(sectionData):
     Args:
         sectionData: SectionData object containing section_polygon and rebar_coor_data
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Circle, Polygon
     fig, ax = plt.subplots(figsize=(10, 8))
     
     # Extract coordinates from sectionData
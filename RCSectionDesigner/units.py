@@ -2,8 +2,49 @@
 Unit management using Pint library.
 """
 
+from functools import lru_cache
+
 from pint import UnitRegistry
 
+def _create_registry():
+    # Parsing the default definitions dominates import time; pint can cache the
+    # parsed registry on disk and reuse it in later processes.
+    try:
+        return UnitRegistry(cache_folder=":auto:")
+    except OSError:
+        return UnitRegistry()
+
 # Create a single UnitRegistry instance for the entire package
-ureg = UnitRegistry()
+ureg = _create_registry()
 Q_ = ureg.Quantity
+
+# Internal unit system of the numeric core (consistent: N/mm^2 = MPa).
+# Inputs are converted to plain floats in these units once, results are
+# converted back to the user's units only when they are returned.
+INTERNAL_LENGTH_UNIT = 'mm'
+INTERNAL_FORCE_UNIT = 'N'
+INTERNAL_AREA_UNIT = 'mm^2'
+INTERNAL_STRESS_UNIT = 'MPa'
+INTERNAL_MOMENT_UNIT = 'N*mm'
+
+
+@lru_cache(maxsize=None)
+def _conversion_factor(from_unit, to_unit):
+    return Q_(1, from_unit).to(to_unit).magnitude
+
+
+def conversion_factor(from_unit, to_unit):
+    """
+    Multiplier converting a magnitude in `from_unit` to `to_unit`.
+
+    Args:
+        from_unit, to_unit: Unit strings, pint Units or pint Quantities (e.g. ureg('mm'))
+    """
+    return _conversion_factor(str(from_unit), str(to_unit))
+
+
+def to_quantity(value, internal_unit, unit):
+    """
+    Wrap an internal float/ndarray result as a pint Quantity in `unit`.
+    """
+    return Q_(value * conversion_factor(internal_unit, unit), ureg(str(unit)).units)
@@ -0,0 +1,176 @@
+"""
+Golden results and baseline timings from the original implementation.
+
+    python benchmarks/baseline_reference.py                  # golden.json and baseline.json
+    python benchmarks/baseline_reference.py --golden-only    # golden.json only
+
+The package is checked out at BASELINE_COMMIT (the tree before the batched
+engine) into a temporary directory and imported from there, so golden.json
+holds what the per-point StrainCompatibility code computes and baseline.json
+how long it takes; run_benchmarks.py then checks the current code against
+both. The baseline has no surface engine: its 'InteractionSurface' stage is
+the per-angle rotate_section + StrainCompatibility loop over the same
+depths, and the surface golden points are that loop's P and its moments
+about the rotation center, resolved into Mx and My of the unrotated section.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from synthetic import (SIZES, GOLDEN_ANGLES, GOLDEN_AXIS_Y, GOLDEN_SURFACE_ANGLES,  # noqa: E402
+                       GOLDEN_DEPTH_RATIOS, write_section)
+
+BASELINE_COMMIT = '395e90f'
+SURFACE_ANGLES = np.arange(0, 360, 10.0)
+ANALYSIS_POINTS = 50
+
+
+def checkout_baseline(directory, commit=BASELINE_COMMIT):
+    """
+    Extract the baseline tree into a directory.
+    """
+    archive = subprocess.run(['git', '-C', os.path.dirname(HERE), 'archive', '--format=tar', commit],
+                             check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+def surface_point(section, angle, depth):
+    # Baseline P (kN) and Mx, My (kN*m) about the section center at one angle and depth
+    from RCSectionDesigner.StrainCompatibility import StrainCompatibility
+
+    section.rotate_section(angle)
+    top = np.max(section.ro_polygon.exterior.xy[1])
+    strain = StrainCompatibility(section, top - depth)
+    P = strain.PM_Point()['P_n'].to('kN').magnitude
+    min_x, min_y, max_x, max_y = section.polygon.bounds
+    x0, y0 = (min_x + max_x) / 2, (min_y + max_y) / 2
+    forces = [force.to('kN').magnitude for force in strain.rebar_force]
+    points = [(point.x, point.y) for point in section.ro_rebarCoor.geoms]
+    concrete = strain.compression_force.to('kN').magnitude
+    if concrete:
+        centroid = strain.compression_polygon.centroid
+        forces.append(concrete)
+        points.append((centroid.x, centroid.y))
+    forces, points = np.asarray(forces), np.asarray(points) - (x0, y0)
+    # Moments in the rotated frame, then along the unrotated axes
+    M_rotated_x, M_rotated_y = forces @ points[:, 0] / 1e3, forces @ points[:, 1] / 1e3
+    theta = np.radians(angle)
+    d, e = (np.sin(theta), np.cos(theta)), (np.cos(theta), -np.sin(theta))
+    return P, d[1] * M_rotated_y + e[1] * M_rotated_x, d[0] * M_rotated_y + e[0] * M_rotated_x
+
+
+def section_heights(section, angles):
+    heights = []
+    for angle in angles:
+        section.rotate_section(angle)
+        y = section.ro_polygon.exterior.xy[1]
+        heights.append(np.max(y) - np.min(y))
+    return np.asarray(heights)
+
+
+def golden_results(rebar_filepath, section_filepath):
+    """
+    Baseline results of one synthetic section, in the format of
+    run_benchmarks.golden_results.
+    """
+    from RCSectionDesigner.SectionData import SectionData
+    from RCSectionDesigner.StrainCompatibility import StrainCompatibility
+
+    section = SectionData(30, rebar_filepath=rebar_filepath, section_filepath=section_filepath)
+    points = []
+    for angle in GOLDEN_ANGLES:
+        section.rotate_section(angle)
+        for axis_y in GOLDEN_AXIS_Y:
+            result = StrainCompatibility(section, axis_y).PM_Point()
+            points.append([angle, axis_y, result['P_n'].magnitude, result['M_n'].magnitude])
+    angles = GOLDEN_SURFACE_ANGLES
+    depths = section_heights(section, angles)[:, None] * GOLDEN_DEPTH_RATIOS
+    surface = np.array([[surface_point(section, angle, depth) for depth in row]
+                        for angle, row in zip(angles, depths)])
+    return {'strain_compatibility': points,
+            'surface': {key: surface[:, :, k].tolist() for k, key in enumerate(('P', 'Mx', 'My'))}}
+
+
+def baseline_timings(rebar_filepath, section_filepath, repeat):
+    """
+    Time the stages of run_benchmarks.benchmark_section on the baseline code.
+    """
+    from run_benchmarks import ANGLE, measure
+    from RCSectionDesigner.SectionData import SectionData
+    from RCSectionDesigner.StrainCompatibility import StrainCompatibility, sectionCut
+
+    def construct():
+        return SectionData(30, rebar_filepath=rebar_filepath, section_filepath=section_filepath)
+
+    section = construct()
+    depths = section_heights(section, SURFACE_ANGLES)[:, None] * np.linspace(0.05, 3.0, ANALYSIS_POINTS)
+
+    def surface():
+        return [surface_point(section, angle, depth) for angle, row in zip(SURFACE_ANGLES, depths) for depth in row]
+
+    section.rotate_section(ANGLE)
+    top = np.max(section.ro_polygon.exterior.xy[1])
+    strain = StrainCompatibility(section, 0.0)
+    return {
+        'SectionData': measure(construct, repeat),
+        'rotate_section': measure(lambda: section.rotate_section(ANGLE), repeat),
+        'sectionCut': measure(lambda: sectionCut(section, top - 150.0), repeat),
+        'StrainCompatibility': measure(lambda: StrainCompatibility(section, 0.0), repeat),
+        'cal_rebar_force': measure(lambda: strain.cal_rebar_force(section), repeat),
+        'PM_Point': measure(strain.PM_Point, repeat),
+        # Thousands of points per call, one round is enough
+        'InteractionSurface': measure(surface, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Golden results and timings of the baseline implementation')
+    parser.add_argument('--commit', default=BASELINE_COMMIT, help='Baseline commit')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds per stage')
+    parser.add_argument('--golden-only', action='store_true', help='Do not measure timings')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline_dir = os.path.join(directory, 'baseline')
+        checkout_baseline(baseline_dir, args.commit)
+        sys.path.insert(0, baseline_dir)
+        golden, timings = {}, {}
+        for n_vertices, n_bars in SIZES:
+            name = f'v{n_vertices}_b{n_bars}'
+            files = write_section(directory, n_vertices, n_bars)
+            # The baseline prints every intermediate result
+            with contextlib.redirect_stdout(io.StringIO()):
+                golden[name] = golden_results(*files)
+                if not args.golden_only:
+                    timings[name] = baseline_timings(*files, args.repeat)
+            print(f'{name}: done', file=sys.stderr)
+
+    from run_benchmarks import BASELINE_FILE, GOLDEN_FILE
+
+    with open(GOLDEN_FILE, 'w') as file:
+        json.dump(golden, file)
+    print(f'Golden results written to {GOLDEN_FILE}')
+    if timings:
+        with open(BASELINE_FILE, 'w') as file:
+            json.dump({'commit': args.commit, 'machine': platform.platform(), 'python': platform.python_version(),
+                       'numpy': np.__version__, 'timings': timings}, file, indent=1)
+        print(f'Baseline written to {BASELINE_FILE}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
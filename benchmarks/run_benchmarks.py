@@ -0,0 +1,194 @@
+"""
+Benchmarks of the section analysis hot paths, with golden result checks.
+
+    python benchmarks/run_benchmarks.py                   # time all sizes, check golden results
+    python benchmarks/run_benchmarks.py --quick           # smaller sections only
+
+Every run compares the results of the synthetic sections with golden.json
+(relative tolerance --rtol) and the timings with baseline.json; a result
+mismatch, or a slowdown beyond --slowdown when --strict is given, makes the
+run exit with status 1. Both files hold the results and timings of the
+original implementation (baseline_reference.py), never of the code under
+test. Baseline timings are machine specific, re-measure them with
+baseline_reference.py on the machine used for comparisons.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from synthetic import (SIZES, GOLDEN_ANGLES, GOLDEN_AXIS_Y, GOLDEN_SURFACE_ANGLES,  # noqa: E402
+                       GOLDEN_DEPTH_RATIOS, write_section)
+
+BASELINE_FILE = os.path.join(HERE, 'baseline.json')
+GOLDEN_FILE = os.path.join(HERE, 'golden.json')
+
+ANGLE = 37.0
+SURFACE_ANGLES = np.arange(0, 360, 10.0)
+
+
+def measure(function, repeat=5, min_time=0.05):
+    """
+    Best time per call (seconds) over `repeat` rounds, each round calling
+    the function often enough to run for at least min_time.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def benchmark_section(rebar_filepath, section_filepath, repeat):
+    """
+    Time every stage for one synthetic section.
+
+    Returns:
+        Dictionary stage -> seconds per call
+    """
+    from RCSectionDesigner.SectionData import SectionData
+    from RCSectionDesigner.StrainCompatibility import StrainCompatibility, sectionCut
+    from RCSectionDesigner.InteractionSurface import InteractionSurface
+
+    def construct():
+        return SectionData(30, rebar_filepath=rebar_filepath, section_filepath=section_filepath)
+
+    section = construct()
+    section.rotate_section(ANGLE)
+    top = section.ro_vertices[:, 1].max()
+    strain = StrainCompatibility(section, 0.0)
+    timings = {
+        'SectionData': measure(construct, repeat),
+        'rotate_section': measure(lambda: section.rotate_section(ANGLE), repeat),
+        'sectionCut': measure(lambda: sectionCut(section, top - 150.0), repeat),
+        'StrainCompatibility': measure(lambda: StrainCompatibility(section, 0.0), repeat),
+        'cal_rebar_force': measure(lambda: strain.cal_rebar_force(section), repeat),
+        'PM_Point': measure(strain.PM_Point, repeat),
+        'InteractionSurface': measure(lambda: InteractionSurface(section, SURFACE_ANGLES), repeat),
+    }
+    return timings
+
+
+def golden_results(rebar_filepath, section_filepath):
+    """
+    Reference results of one synthetic section (plain floats in kN / kN*m).
+    """
+    from RCSectionDesigner.SectionData import SectionData
+    from RCSectionDesigner.StrainCompatibility import StrainCompatibility
+    from RCSectionDesigner.InteractionSurface import InteractionSurface, section_heights
+
+    section = SectionData(30, rebar_filepath=rebar_filepath, section_filepath=section_filepath)
+    points = []
+    for angle in GOLDEN_ANGLES:
+        section.rotate_section(angle)
+        for axis_y in GOLDEN_AXIS_Y:
+            result = StrainCompatibility(section, axis_y).PM_Point()
+            points.append([angle, axis_y, result['P_n'].magnitude, result['M_n'].magnitude])
+    angles = GOLDEN_SURFACE_ANGLES
+    depths = section_heights(section, angles)[:, None] * GOLDEN_DEPTH_RATIOS
+    surface = InteractionSurface(section, angles, depths)
+    return {'strain_compatibility': points,
+            'surface': {'P': surface.P.tolist(), 'Mx': surface.Mx.tolist(), 'My': surface.My.tolist()}}
+
+
+def compare_golden(name, result, golden, rtol):
+    # Mismatch messages, tolerances relative to the largest magnitude of each quantity
+    messages = []
+    expected = np.asarray(golden['strain_compatibility'])
+    actual = np.asarray(result['strain_compatibility'])
+    for column, label in ((2, 'P_n'), (3, 'M_n')):
+        scale = max(np.abs(expected[:, column]).max(), 1.0)
+        error = np.abs(actual[:, column] - expected[:, column]).max() / scale
+        if error > rtol:
+            messages.append(f"{name}: StrainCompatibility {label} differs by {error:.2e} (relative)")
+    for key in ('P', 'Mx', 'My'):
+        expected = np.asarray(golden['surface'][key])
+        actual = np.asarray(result['surface'][key])
+        scale = max(np.abs(expected).max(), 1.0)
+        error = np.abs(actual - expected).max() / scale if actual.shape == expected.shape else np.inf
+        if error > rtol:
+            messages.append(f"{name}: surface {key} differs by {error:.2e} (relative)")
+    return messages
+
+
+def main(argv=None):
+    from RCSectionDesigner.instrumentation import quiet
+
+    parser = argparse.ArgumentParser(description='Benchmark the section analysis hot paths')
+    parser.add_argument('--quick', action='store_true', help='Only the three smallest sections')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds per stage')
+    parser.add_argument('--rtol', type=float, default=1e-9, help='Relative tolerance of the golden results')
+    parser.add_argument('--slowdown', type=float, default=1.5, help='Reported slowdown factor against the baseline')
+    parser.add_argument('--strict', action='store_true', help='Fail on slowdowns, not only on wrong results')
+    parser.add_argument('--output', help='Also write the timings to this JSON file')
+    args = parser.parse_args(argv)
+
+    sizes = SIZES[:3] if args.quick else SIZES
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as file:
+            baseline = json.load(file).get('timings', {})
+    golden = {}
+    if os.path.exists(GOLDEN_FILE):
+        with open(GOLDEN_FILE) as file:
+            golden = json.load(file)
+
+    timings, results, failures, slowdowns = {}, {}, [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_vertices, n_bars in sizes:
+            name = f'v{n_vertices}_b{n_bars}'
+            files = write_section(directory, n_vertices, n_bars)
+            # Time the analysis without its console reports
+            with quiet():
+                timings[name] = benchmark_section(*files, args.repeat)
+                results[name] = golden_results(*files)
+            for stage, seconds in timings[name].items():
+                reference = baseline.get(name, {}).get(stage)
+                note = ''
+                if reference:
+                    ratio = seconds / reference
+                    note = f'  x{ratio:.3g} vs baseline'
+                    if ratio > args.slowdown:
+                        note += '  SLOWER'
+                        slowdowns.append(f'{name} {stage}: {ratio:.2f}x baseline')
+                print(f'{name:>12}  {stage:<20} {seconds * 1e3:10.3f} ms{note}')
+            if name in golden:
+                failures += compare_golden(name, results[name], golden[name], args.rtol)
+            else:
+                print(f'{name:>12}  no golden results stored')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'timings': timings}, file, indent=1)
+
+    for message in failures + slowdowns:
+        print(message)
+    if failures or (args.strict and slowdowns):
+        return 1
+    if golden:
+        print('Golden results match')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Synthetic sections for the benchmarks.
+
+Outlines are a 400 x 600 rectangle (4 vertices) or an ellipse with the same
+bounding box and n vertices; bars sit evenly on a ring 60 mm inside the
+outline. Everything is deterministic, so golden results stay comparable.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+# (vertices, bars) of the benchmark sections, smallest first
+SIZES = [(4, 4), (16, 16), (64, 64), (200, 150), (500, 300)]
+
+# Golden result grid, shared by run_benchmarks.py and baseline_reference.py:
+# StrainCompatibility points at (angle, neutral axis y) and surface points at
+# depths = DEPTH_RATIOS * rotated section height for every surface angle
+GOLDEN_ANGLES = (0.0, 37.0, 90.0)
+GOLDEN_AXIS_Y = (-200.0, 0.0, 150.0)
+GOLDEN_SURFACE_ANGLES = np.arange(0, 360, 30.0)
+GOLDEN_DEPTH_RATIOS = np.linspace(0.05, 3.0, 10)
+
+
+def outline(n_vertices, width=400.0, height=600.0):
+    if n_vertices == 4:
+        x, y = width / 2, height / 2
+        return np.array([[-x, -y], [x, -y], [x, y], [-x, y]])
+    theta = np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    return np.column_stack([width / 2 * np.cos(theta), height / 2 * np.sin(theta)])
+
+
+def bar_ring(n_bars, width=400.0, height=600.0, inset=60.0):
+    theta = np.linspace(0, 2 * np.pi, n_bars, endpoint=False) + np.pi / 4
+    a, b = width / 2 - inset, height / 2 - inset
+    if n_bars == 4:
+        # Corner bars of the rectangle
+        return np.array([[-a, -b], [a, -b], [a, b], [-a, b]])
+    return np.column_stack([a * np.cos(theta), b * np.sin(theta)])
+
+
+def write_section(directory, n_vertices, n_bars):
+    """
+    Write the coordinate CSVs of a synthetic section.
+
+    Returns:
+        Tuple (rebar_filepath, section_filepath)
+    """
+    name = f'v{n_vertices}_b{n_bars}'
+    rebar_filepath = os.path.join(directory, f'{name}_rebar.csv')
+    section_filepath = os.path.join(directory, f'{name}_section.csv')
+    with open(section_filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['PointID', 'X', 'Y'])
+        for i, (x, y) in enumerate(outline(n_vertices), start=1):
+            writer.writerow([f'P{i}', repr(float(x)), repr(float(y))])
+    with open(rebar_filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['RebarID', 'X', 'Y', 'Diameter', 'Size', 'Grade'])
+        for i, (x, y) in enumerate(bar_ring(n_bars), start=1):
+            size, diameter = ('DB20', 20) if i % 3 else ('DB25', 25)
+            writer.writerow([f'R{i}', repr(float(x)), repr(float(y)), diameter, size, 'SD40' if i % 2 else 'SD50'])
+    return rebar_filepath, section_filepath
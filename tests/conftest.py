@@ -0,0 +1,12 @@
+import pytest
+
+from RCSectionDesigner import config
+from RCSectionDesigner.SectionData import SectionData
+
+
+@pytest.fixture
+def sample_section():
+    # coordinateData/: 400 x 600 rectangle, 3 x DB12 + 1 x RB9, so the
+    # capacity differs for positive and negative moments
+    return SectionData(30, rebar_filepath=config.REBAR_COORDINATE_FILE,
+                       section_filepath=config.SECTION_COORDINATE_FILE)
@@ -0,0 +1,18 @@
+import numpy as np
+
+from RCSectionDesigner.AdaptiveSampler import AdaptiveSampler, _chord_error
+
+
+def test_chord_error_within_tolerance_at_every_sampled_angle(sample_section):
+    for tol in [1e-2, 1e-3, 1e-4]:
+        sampler = AdaptiveSampler(sample_section, tol=tol)
+        result = sampler.surface()
+        assert len(result['curves']) == len(result['angles'])
+        for curve in result['curves']:
+            points = np.column_stack([curve['P'], curve['Mx'], curve['My']])
+            # Scale of the returned points, at least the one the sampler used
+            scale = np.array([np.abs(points[:, 0]).max(), *[np.hypot(points[:, 1], points[:, 2]).max()] * 2])
+            mid_depth = (curve['depth'][:-1] + curve['depth'][1:]) / 2
+            mid = sampler._evaluate([curve['angle']], mid_depth)[0]
+            error = _chord_error(points[:-1] / scale, points[1:] / scale, mid / scale)
+            assert error.max() <= tol
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from RCSectionDesigner import config
+from RCSectionDesigner.BatchRunner import _limit_memory, _remove_partial_output, run_batch, safe_filename
+
+
+class _KillWorker:
+    # Unpickling this in a worker process ends the process abruptly
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def _job(name):
+    return {'name': name, 'rebar_filepath': config.REBAR_COORDINATE_FILE,
+            'section_filepath': config.SECTION_COORDINATE_FILE, 'fc': 30}
+
+
+def test_dead_worker_only_fails_its_own_section(tmp_path):
+    jobs = [_job('C1'), _job('C2'), {**_job('crash'), 'kill': _KillWorker()}, _job('C4'), _job('bad/name')]
+    records = run_batch(jobs, output_dir=str(tmp_path), max_workers=2, angle_step=90.0, n_points=5,
+                        progress=None)
+    assert [record['status'] for record in records] == ['ok', 'ok', 'error', 'ok', 'ok']
+    assert os.path.dirname(records[4]['output']) == str(tmp_path)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_safe_filename_keeps_distinct_names_apart():
+    assert safe_filename('C1') == 'C1'
+    assert '/' not in safe_filename('a/b')
+    assert safe_filename('a/b') != safe_filename('a_b')
+
+
+def test_memory_cap_that_cannot_be_set_warns(monkeypatch):
+    import resource
+
+    def refuse(*args):
+        raise ValueError("not allowed to raise maximum limit")
+
+    monkeypatch.setattr(resource, 'setrlimit', refuse)
+    with pytest.warns(RuntimeWarning, match='512 MB'):
+        _limit_memory(512)
+
+
+def test_partial_output_cleanup_only_touches_its_section(tmp_path):
+    for filename in ['C1.k3j_x9ab.tmp', 'C1.5.k3j_x9ab.tmp', 'C1.npz', 'C10.aaaa.tmp']:
+        (tmp_path / filename).write_bytes(b'')
+    _remove_partial_output(str(tmp_path), 'C1')
+    assert sorted(os.listdir(tmp_path)) == ['C1.5.k3j_x9ab.tmp', 'C1.npz', 'C10.aaaa.tmp']
+
+
+def test_duplicate_section_names_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='C1'):
+        run_batch([_job('C1'), _job('C2'), _job('C1')], output_dir=str(tmp_path), progress=None)
+    assert os.listdir(tmp_path) == []
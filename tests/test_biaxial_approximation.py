@@ -0,0 +1,23 @@
+import numpy as np
+
+from RCSectionDesigner.BiaxialApproximation import BiaxialApproximation
+from RCSectionDesigner.CapacityCheck import CapacityChecker
+from RCSectionDesigner.InteractionSurface import InteractionSurface
+
+
+def test_negative_uniaxial_moments_use_their_own_curves(sample_section):
+    section = sample_section
+    approximation = BiaxialApproximation(section)
+    exact = CapacityChecker(InteractionSurface(section))
+    Pu, Mux, Muy = np.array([100.0, 300.0, 1000.0]), np.array([-60.0, -150.0, 0.0]), np.array([0.0, 0.0, -150.0])
+    np.testing.assert_allclose(approximation.ratios(Pu, Mux, Muy), exact.ratios(Pu, Mux, Muy), rtol=0.05)
+
+
+def test_ratio_is_continuous_across_the_reciprocal_load_limit(sample_section):
+    approximation = BiaxialApproximation(sample_section)
+    for Mux, Muy in ((100.0, 50.0), (250.0, 80.0), (300.0, 0.0)):
+        Pu = approximation.P_low + np.linspace(-400, 400, 8001)
+        ratio = approximation.ratios(Pu, np.full_like(Pu, Mux), np.full_like(Pu, Muy))
+        assert np.abs(np.diff(ratio)).max() < 5e-3
+    below, above = approximation.ratios([719.0, 721.0], [100.0, 100.0], [50.0, 50.0])
+    assert abs(below - above) < 1e-3
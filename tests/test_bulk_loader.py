@@ -0,0 +1,29 @@
+from RCSectionDesigner.BulkLoader import SectionLoader
+
+TABLE = """SectionID,Kind,X,Y,fc,Size,Grade
+OK,Outline,-0.2,-0.3,30,,
+OK,Outline,0.2,-0.3,,,
+OK,Outline,0.2,0.3,,,
+OK,Outline,-0.2,0.3,,,
+OK,Rebar,-0.15,-0.25,,DB12,SD40
+OK,Rebar,0.15,-0.25,,DB12,SD40
+OK,Rebar,0.15,0.25,,DB12,SD40
+OK,Rebar,-0.15,0.25,,DB12,SD40
+TIGHT,Outline,-0.2,-0.3,30,,
+TIGHT,Outline,0.2,-0.3,,,
+TIGHT,Outline,0.2,0.3,,,
+TIGHT,Outline,-0.2,0.3,,,
+TIGHT,Rebar,-0.196,-0.25,,DB12,SD40
+TIGHT,Rebar,0.15,-0.25,,DB12,SD40
+"""
+
+
+def test_bar_fit_in_metres(tmp_path):
+    # DB12 (12 mm) bars 50 mm inside the outline fit, a bar 4 mm inside does not
+    path = tmp_path / 'sections.csv'
+    path.write_text(TABLE)
+    loader = SectionLoader(str(path), length_unit='m', strict=False)
+    assert loader.valid_ids == ['OK']
+    assert loader.errors == {'TIGHT': ['rebar outside the concrete']}
+    section = loader.section('OK')
+    assert section.length_scale == 1000
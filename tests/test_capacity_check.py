@@ -0,0 +1,18 @@
+import numpy as np
+
+from RCSectionDesigner.CapacityCheck import CapacityChecker
+from RCSectionDesigner.InteractionSurface import InteractionSurface
+
+
+def test_neighbour_walk_matches_brute_force_facet_scan(sample_section):
+    checker = CapacityChecker(InteractionSurface(sample_section))
+    points = checker.surface.points()
+    rng = np.random.default_rng(3)
+    # Demands inside, on and beyond the surface in every direction
+    demands = points[rng.integers(len(points), size=500)] * rng.uniform(0.1, 2.0, (500, 1))
+    demands = np.vstack([demands, rng.normal(size=(500, 3)) * np.abs(points).max(axis=0)])
+
+    ratio = checker.ratios(*demands.T)
+    brute = np.maximum((demands / checker.scale) @ checker.facet_coefficients.T, 0.0).max(axis=1)
+    # The walk stops once a step improves the ratio by less than 1e-12
+    np.testing.assert_allclose(ratio, brute, rtol=1e-10)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from RCSectionDesigner.CapacitySolver import CapacitySolver
+from RCSectionDesigner.InteractionSurface import bending_directions, compute_pmm, section_heights
+
+
+def test_solve_matches_dense_depth_sweep(sample_section):
+    solver = CapacitySolver(sample_section)
+    for angle in [0.0, 37.0, 90.0, 215.0]:
+        depths = section_heights(sample_section, [angle])[0] * np.linspace(0, 3, 30001)
+        P, Mx, My = compute_pmm(sample_section, [angle], depths)
+        d = bending_directions([angle])[0]
+        M = (d[0] * My[0] + d[1] * Mx[0]) * solver.moment_factor
+        for Pu in [-100.0, 0.0, 500.0, 2000.0, 5000.0]:
+            result = solver.solve(Pu, angle)
+            np.testing.assert_allclose(result['M'], np.interp(Pu, P[0] * solver.force_factor, M), rtol=1e-6)
+            assert result['evaluations'] <= 20
+
+
+def test_warm_start_keeps_evaluations_bounded(sample_section):
+    result = CapacitySolver(sample_section).solve_angles(1000.0, np.arange(0, 360, 10.0))
+    assert result['evaluations'].max() <= 15
+    np.testing.assert_allclose(result['P'], 1000.0, rtol=1e-6)
@@ -0,0 +1,46 @@
+import numpy as np
+from shapely.geometry import Polygon
+
+from RCSectionDesigner.compressionBlock import clip_half_plane, polygon_edges
+
+
+def random_polygon(rng, n=12, hole=False):
+    # Star-shaped outline, optionally with a scaled-down copy as a hole
+    theta = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radius = rng.uniform(200, 500, n)
+    outline = np.column_stack([radius * np.cos(theta), radius * np.sin(theta)])
+    holes = [0.3 * outline] if hole else []
+    center = rng.uniform(-100, 100, 2)
+    return Polygon(outline + center, [ring + center for ring in holes])
+
+
+def half_plane(origin, direction, cut, extent=1e4):
+    # Large rectangle covering direction . (point - origin) >= cut
+    e = np.array([direction[1], -direction[0]])
+    base = origin + cut * direction
+    return Polygon([base - extent * e, base + extent * e,
+                    base + extent * e + extent * direction, base - extent * e + extent * direction])
+
+
+def test_clip_half_plane_matches_shapely_intersection():
+    rng = np.random.default_rng(7)
+    for k in range(20):
+        polygon = random_polygon(rng, hole=k % 2 == 1)
+        origin = rng.uniform(-50, 50, 2)
+        theta = rng.uniform(0, 2 * np.pi)
+        direction = np.array([np.cos(theta), np.sin(theta)])
+        proj = (np.asarray(polygon.exterior.coords) - origin) @ direction
+        cuts = rng.uniform(proj.min() - 50, proj.max() + 50, 8)
+
+        area, Sx, Sy = clip_half_plane(polygon_edges(polygon), origin, direction, cuts)
+        for i, cut in enumerate(cuts):
+            clipped = polygon.intersection(half_plane(origin, direction, cut))
+            tol = 1e-9 * polygon.area
+            np.testing.assert_allclose(area[i], clipped.area, rtol=1e-9, atol=tol)
+            if clipped.area > 0:
+                np.testing.assert_allclose(Sx[i], clipped.area * (clipped.centroid.y - origin[1]),
+                                           rtol=1e-9, atol=tol * 500)
+                np.testing.assert_allclose(Sy[i], clipped.area * (clipped.centroid.x - origin[0]),
+                                           rtol=1e-9, atol=tol * 500)
+            else:
+                assert Sx[i] == 0 and Sy[i] == 0
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from RCSectionDesigner.FiberSection import BilinearSteel, HognestadConcrete, ManderConcrete
+
+
+def central_difference(law, strain, h=1e-8):
+    return (law.stress(strain + h) - law.stress(strain - h)) / (2 * h)
+
+
+@pytest.mark.parametrize('law, kinks', [
+    (HognestadConcrete(30), [0.0, 0.002, 0.0038]),
+    (ManderConcrete(30), [0.0, 0.005]),
+    (ManderConcrete(30, fcc=39), [0.0, 0.005]),
+    (BilinearSteel(400, 560), [-0.1, -0.002, 0.002, 0.1]),
+])
+def test_tangent_matches_finite_differences(law, kinks):
+    strain = np.linspace(-0.12, 0.12, 4801)
+    # Skip strains next to a kink, where the one-sided slopes differ
+    strain = strain[np.abs(strain[:, None] - np.array(kinks)).min(axis=1) > 1e-6]
+    np.testing.assert_allclose(law.tangent(strain), central_difference(law, strain),
+                               rtol=1e-5, atol=1e-6 * np.abs(law.tangent(strain)).max())
@@ -0,0 +1,31 @@
+from RCSectionDesigner import config
+from RCSectionDesigner.StrainCompatibility import StrainCompatibility
+from RCSectionDesigner.instrumentation import CONCRETE_RESULTANT, GEOMETRY_CUT, REBAR_RESULTANTS, \
+    UNIT_CONVERSION, collect, metrics, quiet
+
+
+def test_quiet_suppresses_reports(sample_section, capsys, monkeypatch):
+    monkeypatch.setattr(config, 'VERBOSE', True)
+    StrainCompatibility(sample_section, 0).PM_Point()
+    assert 'Total Moment M_n' in capsys.readouterr().out
+
+    with quiet():
+        StrainCompatibility(sample_section, 0).PM_Point()
+    assert capsys.readouterr().out == ''
+    assert config.VERBOSE
+
+
+def test_collect_records_stage_metrics(sample_section, capsys, monkeypatch):
+    monkeypatch.setattr(config, 'VERBOSE', True)
+    enabled = metrics.enabled
+    with collect() as stats:
+        for axis_y in [-200, 0, 150]:
+            StrainCompatibility(sample_section, axis_y).PM_Point()
+    snapshot = stats.snapshot()
+    assert snapshot['counters'] == {'strain_compatibility': 3}
+    for stage in [GEOMETRY_CUT, CONCRETE_RESULTANT, REBAR_RESULTANTS]:
+        assert snapshot['timers'][stage]['calls'] == 3
+        assert snapshot['timers'][stage]['seconds'] >= 0
+    assert snapshot['timers'][UNIT_CONVERSION]['calls'] == 6
+    assert capsys.readouterr().out == ''
+    assert metrics.enabled == enabled and config.VERBOSE
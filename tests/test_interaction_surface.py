@@ -0,0 +1,45 @@
+import numpy as np
+
+from RCSectionDesigner.InteractionSurface import InteractionSurface, bending_directions, compute_pmm, default_depths, \
+    section_heights, section_origin
+from RCSectionDesigner.StrainCompatibility import StrainCompatibility
+
+
+def test_every_angle_reaches_pure_tension_and_compression(sample_section):
+    surface = InteractionSurface(sample_section)
+    arrays = sample_section.arrays
+    steel = arrays.rebar_fy @ arrays.rebar_area / 1e3
+    squash = arrays.fc * sample_section.polygon.area / 1e3 + steel
+    np.testing.assert_allclose(surface.P.min(), -steel, rtol=1e-12)
+    np.testing.assert_allclose(surface.P[:, 0], -steel, rtol=1e-12)
+    np.testing.assert_allclose(surface.P[:, -1], squash, rtol=1e-12)
+    assert np.isfinite(surface.Mx).all() and np.isfinite(surface.My).all()
+
+
+def test_compute_pmm_matches_strain_compatibility(sample_section):
+    angles = np.array([0.0, 37.0, 90.0, 215.0])
+    ratios = np.array([0.05, 0.3, 0.75, 1.0, 1.6, 3.0])
+    depths = section_heights(sample_section, angles)[:, None] * ratios
+    P, Mx, My = compute_pmm(sample_section, angles, depths)
+
+    origin = np.asarray(section_origin(sample_section))
+    for i, angle in enumerate(angles):
+        rotated = sample_section.rotated(angle)
+        top = rotated.ro_vertices[:, 1].max()
+        d = bending_directions(angle)[0]
+        for j, depth in enumerate(depths[i]):
+            point = StrainCompatibility(rotated, top - depth).PM_Point()
+            # StrainCompatibility takes moments about the top fiber
+            M_top = P[i, j] * (top - origin[1]) - (d[0] * My[i, j] + d[1] * Mx[i, j])
+            np.testing.assert_allclose(point['P_n'].to('N').magnitude, P[i, j], rtol=1e-9)
+            np.testing.assert_allclose(point['M_n'].to('N*mm').magnitude, M_top, rtol=1e-9)
+
+
+def test_threaded_compute_pmm_is_bit_identical(sample_section):
+    angles = np.arange(0, 360, 7.5)
+    depths = default_depths(sample_section, angles)
+    serial = compute_pmm(sample_section, angles, depths, workers=1)
+    for workers in [2, 3, 8]:
+        threaded = compute_pmm(sample_section, angles, depths, workers=workers)
+        for a, b in zip(serial, threaded):
+            np.testing.assert_array_equal(a, b)
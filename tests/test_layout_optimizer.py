@@ -0,0 +1,40 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from RCSectionDesigner.LayoutOptimizer import LayoutOptimizer
+
+
+def test_optimize_matches_exhaustive_search(sample_section):
+    Pu, Mux, Muy = np.array([2500.0, 300.0]), np.array([450.0, 250.0]), np.array([60.0, -120.0])
+    optimizer = LayoutOptimizer(sample_section, sizes=['RB12', 'DB12', 'DB16', 'DB20'],
+                                grades=['SR24', 'SD30', 'SD40'], counts=range(4, 17),
+                                angles=np.arange(0, 360, 30.0))
+    result = optimizer.optimize(Pu, Mux, Muy)
+
+    catalog = sample_section.material_catalog
+    passing = []
+    for size, grade, count in itertools.product(optimizer.sizes, optimizer.grades, optimizer.counts):
+        if not catalog.compatible(grade, size):
+            continue
+        fy, _, bar_area = catalog.rebar_arrays([grade], [size])
+        rho = bar_area[0] * count / optimizer.gross_area
+        ratio = optimizer._check((size, grade, count), Pu, Mux, Muy)
+        if optimizer.rho_min <= rho <= optimizer.rho_max and ratio is not None and ratio <= 1:
+            passing.append((bar_area[0] * count, fy[0], count, size, grade))
+    steel_area, _, count, size, grade = min(passing)
+    assert (result['size'], result['grade'], result['count']) == (size, grade, count)
+    assert result['steel_area'] == pytest.approx(steel_area)
+
+
+def test_candidates_pair_grades_with_their_bar_type(sample_section):
+    optimizer = LayoutOptimizer(sample_section, counts=[8])
+    table = optimizer.candidates([0.0])
+    pairs = set(zip(table['size'], table['grade']))
+    assert all(grade == 'SR24' for size, grade in pairs if size.startswith('RB'))
+    assert all(grade != 'SR24' for size, grade in pairs if size.startswith('DB'))
+    assert len(pairs) == 8 * 1 + 10 * 3
+
+    with pytest.raises(ValueError):
+        LayoutOptimizer(sample_section, sizes=['DB16'], grades=['SR24'])
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from RCSectionDesigner.CapacitySolver import CapacitySolver
+from RCSectionDesigner.FiberSection import BilinearSteel, FiberSection, HognestadConcrete
+from RCSectionDesigner.InteractionSurface import section_heights
+from RCSectionDesigner.MomentCurvature import MomentCurvature
+
+
+@pytest.mark.parametrize('P', [0.0, 500.0, 1500.0])
+def test_end_moment_approaches_pmm_capacity(sample_section, P):
+    # Parabola with peak fc / 0.85 crushing at 0.003 and elastic-perfectly
+    # plastic rebars that do not rupture first: the fiber counterpart of the
+    # equivalent stress block
+    arrays = sample_section.arrays
+    fibers = FiberSection(sample_section, mesh_size=10, concrete=HognestadConcrete(arrays.fc / 0.85, eps_cu=0.003),
+                          steel=BilinearSteel(arrays.rebar_fy, arrays.rebar_fy, arrays.Es, eps_su=1.0))
+    solver = CapacitySolver(sample_section)
+    for angle in [0.0, 37.0, 90.0]:
+        height = section_heights(sample_section, [angle])[0]
+        result = MomentCurvature(fibers).analyse(P, angle, n_steps=800, max_curvature=0.003 / (0.005 * height))
+        assert result['termination'] == 'concrete crushing'
+        np.testing.assert_allclose(result['M'][-1], solver.solve(P, angle)['M'], rtol=0.03)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from RCSectionDesigner.MonteCarlo import _inward_normals
+from RCSectionDesigner.SectionData import SectionData
+from RCSectionDesigner.StrainCompatibility import beta1_MPa
+
+
+def test_cover_moves_corner_bars_off_both_faces(tmp_path):
+    section_file, rebar_file = tmp_path / 'section.csv', tmp_path / 'rebar.csv'
+    section_file.write_text("PointID,X,Y\nP1,-200,-300\nP2,200,-300\nP3,200,300\nP4,-200,300\n")
+    rebar_file.write_text("RebarID,X,Y,Diameter,Size,Grade\nR1,-150,-250,20,DB20,SD40\n"
+                          "R2,150,-250,20,DB20,SD40\nR3,0,-250,20,DB20,SD40\nR4,150,0,20,DB20,SD40\n")
+    section = SectionData(30, rebar_filepath=str(rebar_file), section_filepath=str(section_file))
+    normals = _inward_normals(section.arrays)
+    np.testing.assert_allclose(normals, [(1, 1), (-1, 1), (0, 1), (-1, 0)])
+
+
+def test_beta1_accepts_arrays():
+    fc = np.array([20.0, 28.0, 35.0, 50.0, 55.0, 70.0])
+    expected = [0.85, 0.85, 0.80, 0.85 - 0.05 * 22 / 7, 0.85 - 0.05 * 27 / 7, 0.65]
+    np.testing.assert_allclose(beta1_MPa(fc), expected, rtol=1e-15)
+    assert [beta1_MPa(value) for value in fc] == beta1_MPa(fc).tolist()
+    assert isinstance(beta1_MPa(30.0), float)
@@ -0,0 +1,10 @@
+import pytest
+
+import RCSectionDesigner
+from RCSectionDesigner import config
+
+
+def test_rebar_grade_is_forwarded_to_config():
+    assert RCSectionDesigner.REBAR_GRADE is config.REBAR_GRADE
+    with pytest.raises(AttributeError):
+        RCSectionDesigner.NOT_A_SETTING
@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+import pytest
+
+from RCSectionDesigner.ResultWriter import ResultWriter, read_results
+
+
+def test_relative_paths_stay_relative_to_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with ResultWriter('bare.csv') as writer:
+        writer.write('A', {'P': np.arange(3.0)})
+    assert writer.filepath == str(tmp_path / 'bare.csv')
+    with ResultWriter(os.path.join('rel_out', 'all.csv'), chunk_rows=4) as writer:
+        for name in ('A', 'B', 'C'):
+            writer.write(name, {'P': np.arange(3.0), 'M': np.arange(3.0) / 7})
+    assert writer.filepath == str(tmp_path / 'rel_out' / 'all.csv')
+    part = read_results(writer.filepath, ['C', 'A'])
+    assert list(part['SectionID']) == ['C'] * 3 + ['A'] * 3
+    np.testing.assert_array_equal(part['M'], np.tile(np.arange(3.0) / 7, 2))
+
+
+def test_duplicate_section_ids_are_rejected(tmp_path):
+    with ResultWriter(str(tmp_path / 'all.csv')) as writer:
+        writer.write('A', {'P': np.arange(3.0)})
+        writer.write(7, {'P': np.arange(2.0)})
+        with pytest.raises(ValueError, match="'A'"):
+            writer.write('A', {'P': np.arange(3.0)})
+        with pytest.raises(ValueError, match="'7'"):
+            writer.write('7', {'P': np.arange(3.0)})
+    assert list(read_results(writer.filepath, ['7', 'A'])['P']) == [0.0, 1.0, 0.0, 1.0, 2.0]
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from shapely import affinity
+
+
+@pytest.mark.parametrize('origin', ['center', 'centroid', (35.0, -120.0)])
+def test_rotated_matches_shapely_rotate(sample_section, origin):
+    for angle in [0.0, 30.0, 90.0, 137.5, 270.0]:
+        rotated = sample_section.rotated(angle, origin)
+        polygon = affinity.rotate(sample_section.polygon, angle, origin=origin)
+        # The bar group in coordinateData/ is centered on the outline, so the
+        # old per-geometry 'center'/'centroid' rotation uses the same point
+        rebars = affinity.rotate(sample_section.rebarCoor, angle, origin=origin)
+
+        np.testing.assert_allclose(rotated.ro_vertices, np.asarray(polygon.exterior.coords)[:-1],
+                                   rtol=1e-12, atol=1e-9)
+        np.testing.assert_allclose(rotated.ro_rebar_xy, [(p.x, p.y) for p in rebars.geoms],
+                                   rtol=1e-12, atol=1e-9)
+    assert sample_section.rotation_angle == 0
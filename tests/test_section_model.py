@@ -0,0 +1,23 @@
+import numpy as np
+
+from RCSectionDesigner.SectionModel import SectionModel
+
+
+def test_edits_leave_rotated_copies_unchanged(sample_section):
+    section = sample_section
+    rotated = section.rotated(30)
+    area, x, y = rotated.arrays.rebar_area.copy(), rotated.arrays.rebar_x.copy(), rotated.arrays.rebar_y.copy()
+    fy, fc = rotated.rebar_fy_MPa.copy(), rotated.arrays.fc
+
+    model = SectionModel(section)
+    model.set_rebar(0, size='DB25', x=100)
+    model.set_fc(40)
+    model.P  # apply the edits
+
+    np.testing.assert_array_equal(rotated.arrays.rebar_area, area)
+    np.testing.assert_array_equal(rotated.arrays.rebar_x, x)
+    np.testing.assert_array_equal(rotated.arrays.rebar_y, y)
+    np.testing.assert_array_equal(rotated.rebar_fy_MPa, fy)
+    assert rotated.arrays.fc == fc
+    assert section.arrays.rebar_x[0] == 100
+    assert section.arrays.fc == 40
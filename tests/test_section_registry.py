@@ -0,0 +1,17 @@
+import numpy as np
+
+from RCSectionDesigner.SectionData import SectionData
+from RCSectionDesigner.SectionRegistry import canonical_signature
+
+
+def rectangle_section(scale=1.0, **units):
+    outline = np.array([(-200, -300), (200, -300), (200, 300), (-200, 300)]) * scale
+    bars = np.array([(-150, -250), (150, -250), (150, 250), (-150, 250)]) * scale
+    return SectionData.from_arrays(30, outline, bars, ['DB20'] * 4, ['SD40'] * 4, **units)
+
+
+def test_signature_ignores_length_unit_but_keeps_output_units():
+    reference = canonical_signature(rectangle_section())
+    assert canonical_signature(rectangle_section(0.001, length_unit='m')) == reference
+    assert canonical_signature(rectangle_section(0.1, length_unit='cm')) == reference
+    assert canonical_signature(rectangle_section(force_unit='N', moment_unit='N*m')) != reference
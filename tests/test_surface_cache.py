@@ -0,0 +1,20 @@
+import os
+
+import numpy as np
+import pytest
+
+from RCSectionDesigner.SurfaceCache import SurfaceCache
+
+
+def test_failed_put_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = SurfaceCache(str(tmp_path))
+    cache.put('kept', np.zeros(3), np.ones(3), np.ones(3))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, 'savez', fail)
+    with pytest.raises(OSError):
+        cache.put('lost', np.zeros(3), np.ones(3), np.ones(3))
+    assert os.listdir(tmp_path) == ['kept.npz']
+    np.testing.assert_array_equal(cache.get('kept')[1], np.ones(3))
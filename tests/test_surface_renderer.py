@@ -0,0 +1,18 @@
+import os
+
+import numpy as np
+
+from RCSectionDesigner.BatchRunner import safe_filename
+from RCSectionDesigner.InteractionSurface import InteractionSurface
+from RCSectionDesigner.SurfaceRenderer import render_batch, render_job
+
+
+def test_unsafe_ids_and_failing_jobs(tmp_path, sample_section):
+    job = render_job('bad/name', InteractionSurface(sample_section, np.arange(0, 360, 45)))
+    broken = dict(job, section_id='broken', P=None)
+    results = render_batch([job, broken], str(tmp_path))
+    assert results['bad/name']['status'] == 'ok'
+    assert [os.path.basename(path) for path in results['bad/name']['paths']] == \
+        [f"{safe_filename('bad/name')}_surface.png", f"{safe_filename('bad/name')}_section.png"]
+    assert all(os.path.isfile(path) for path in results['bad/name']['paths'])
+    assert results['broken']['status'] == 'error' and results['broken']['error']